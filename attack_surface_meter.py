@@ -5,6 +5,7 @@ import math
 import pdb
 from PIL import Image
 from attacksurfacemeter.call_graph import CallGraph
+from attacksurfacemeter.call_graph_cache import CallGraphCache
 from attacksurfacemeter.granularity import Granularity
 from attacksurfacemeter.loaders.cflow_loader import CflowLoader
 from attacksurfacemeter.loaders.gprof_loader import GprofLoader
@@ -28,12 +29,36 @@ FORMATTERS = {
 def main():
     args = parse_args()
 
+    cache = None
+    if args.graphcache:
+        cache = CallGraphCache(
+            args.graphcache, max_size=args.graphcachesize * (1 << 20)
+        )
+
+    # Call graphs at coarser granularities are contracted from call graphs
+    #   loaded at function granularity
+    granularity = args.granularity
+    if granularity not in (Granularity.FUNC, Granularity.FILE):
+        granularity = Granularity.FUNC
+
     call_graph = None
-    if args.javacg:
+    if args.snapshot and os.path.exists(args.snapshot):
+        # The snapshot replaces the call graphs specified with -c, -g, or -j,
+        #   which are not read
+        call_graph = CallGraph.from_snapshot(args.snapshot)
+        if call_graph.granularity not in (
+                args.granularity, Granularity.FUNC):
+            sys.exit(
+                'error: the snapshot {0} is at {1} granularity and cannot be '
+                'processed at {2} granularity.'.format(
+                    args.snapshot, call_graph.granularity, args.granularity
+                )
+            )
+    elif args.javacg:
         loader = JavaCGLoader(
             args.javacg, args.apppackages
         )
-        call_graph = CallGraph.from_loader(loader)
+        call_graph = CallGraph.from_loader(loader, cache=cache)
     else:
         cflow_loader = None
         gprof_loader = None
@@ -41,7 +66,10 @@ def main():
             if not os.path.exists(args.cflow):
                 raise Exception('{} not found.'.format(args.cflow))
             else:
-                cflow_loader = CflowLoader(args.cflow, reverse=args.reverse)
+                cflow_loader = CflowLoader(
+                    args.cflow, reverse=args.reverse, processes=args.processes,
+                    shards=args.shards
+                )
 
         if args.gprof:
             if not os.path.exists(args.gprof):
@@ -54,7 +82,7 @@ def main():
                         if os.path.isfile(os.path.join(args.gprof, filename))
                     ]
                     gprof_loader = MultigprofLoader(
-                        sources, processes=args.processes
+                        sources, processes=args.processes, cache=args.cache
                     )
                 else:
                     gprof_loader = GprofLoader(
@@ -64,15 +92,15 @@ def main():
         if cflow_loader and gprof_loader:
             call_graph = CallGraph.from_merge(
                 CallGraph.from_loader(
-                    cflow_loader, granularity=args.granularity
+                    cflow_loader, granularity=granularity, cache=cache
                 ),
                 CallGraph.from_loader(
-                    gprof_loader, granularity=args.granularity
+                    gprof_loader, granularity=granularity, cache=cache
                 )
             )
         elif cflow_loader:
             call_graph = CallGraph.from_loader(
-                    cflow_loader, granularity=args.granularity
+                    cflow_loader, granularity=granularity, cache=cache
                 )
             """nodes = []
             for curnode in call_graph.call_graph.nodes():
@@ -119,9 +147,22 @@ def main():
 
         elif gprof_loader:
             call_graph = CallGraph.from_loader(
-                    gprof_loader, granularity=args.granularity
+                    gprof_loader, granularity=granularity, cache=cache
                 )
 
+    # The call graph is saved before it is contracted so that the snapshot
+    #   may be processed at any coarser granularity
+    if (args.snapshot and not os.path.exists(args.snapshot) and
+            call_graph is not None):
+        call_graph.save(args.snapshot)
+
+    if (call_graph is not None and call_graph.granularity == Granularity.FUNC
+            and args.granularity != Granularity.FUNC):
+        try:
+            call_graph = call_graph.contract(args.granularity)
+        except ValueError as error:
+            sys.exit('error: {0}'.format(error))
+
     if args.output:
         (name, extension) = os.path.splitext(args.output)
         output_format = extension.replace('.', '')
@@ -130,13 +171,13 @@ def main():
         formatter = FORMATTERS[output_format](call_graph)
         with open(args.output, 'w') as file_:
             if args.verbose:
-                file_.write(formatter.write_output())
+                file_.writelines(formatter.stream_output())
             else:
                 file_.write(formatter.write_summary())
     else:
         formatter = FORMATTERS['txt'](call_graph)
         if args.verbose:
-            sys.stdout.write(formatter.write_output())
+            sys.stdout.writelines(formatter.stream_output())
         else:
             sys.stdout.write(formatter.write_summary())
 
@@ -220,9 +261,14 @@ def parse_args():
     )
     parser.add_argument(
         '-gr', dest='granularity', default=Granularity.FUNC,
-        choices=[Granularity.FUNC, Granularity.FILE],
+        choices=[
+            Granularity.FUNC, Granularity.FILE, Granularity.DIRECTORY,
+            Granularity.CLASS, Granularity.PACKAGE
+        ],
         help=(
             'The granularity at which the call graphs must be processed at.'
+            ' Call graphs at directory, class, and package granularity are'
+            ' contracted from call graphs loaded at function granularity.'
         )
     )
     parser.add_argument(
@@ -248,8 +294,25 @@ def parse_args():
     parser.add_argument(
         '-p', dest='processes', type=int, default=2,
         help=(
-            'Number of processes to spawn when loaded multiple gprof call '
-            'graph files. Default is 2.'
+            'Number of processes to spawn when loading multiple gprof call '
+            'graph files or a large cflow call graph file, or when generating '
+            'a cflow call graph in shards. Default is 2.'
+        )
+    )
+    parser.add_argument(
+        '--shards', type=int, default=1,
+        help=(
+            'Number of groups of source files for which cflow generates call '
+            'graphs in parallel when a directory is specified with -c. '
+            'Default is 1.'
+        )
+    )
+    parser.add_argument(
+        '--cache',
+        help=(
+            'Absolute path of a directory in which to cache the gprof call '
+            'graph files loaded from a directory so that only new or changed '
+            'files are parsed when the directory is loaded again.'
         )
     )
     parser.add_argument(
@@ -269,6 +332,35 @@ def parse_args():
             'defined.'
         )
     )
+    parser.add_argument(
+        '--graphcache',
+        help=(
+            'Absolute path of a directory in which to cache the call graphs '
+            'loaded so that a call graph is loaded from the cache when the '
+            'same sources are loaded again with the same options.'
+        )
+    )
+    parser.add_argument(
+        '--graphcachesize', type=int, default=1024,
+        help=(
+            'Maximum size, in MB, of the cache specified with --graphcache. '
+            'The least recently used call graphs are evicted from the cache '
+            'when it is full. Default is 1024.'
+        )
+    )
+    parser.add_argument(
+        '--snapshot',
+        help=(
+            'Absolute path of a binary snapshot of the call graph. If the '
+            'snapshot exists, the call graph is loaded from it instead of '
+            'from the call graphs specified with -c, -g, or -j, which are not '
+            'read, so the snapshot must be deleted when they change. A '
+            'snapshot at function granularity is contracted to the '
+            'granularity specified with -gr; a snapshot at any other '
+            'granularity must match it. Otherwise, the call graph loaded is '
+            'saved to it before it is contracted.'
+        )
+    )
     parser.add_argument(
         '--output',
         help=(
@@ -291,7 +383,23 @@ def parse_args():
         help='Display errors encountered when parsing call graph (if any).'
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    # Classes and packages exist only in Java call graphs and directories
+    #   only in C call graphs
+    if (args.granularity in (Granularity.CLASS, Granularity.PACKAGE) and
+            (args.cflow or args.gprof)):
+        parser.error(
+            'argument -gr: {0} granularity is not supported for cflow and '
+            'gprof call graphs.'.format(args.granularity)
+        )
+    if args.granularity == Granularity.DIRECTORY and args.javacg:
+        parser.error(
+            'argument -gr: {0} granularity is not supported for javacg call '
+            'graphs.'.format(args.granularity)
+        )
+
+    return args
 
 
 if __name__ == '__main__':
@@ -1,23 +1,41 @@
 import os
+import sys
 
 from attacksurfacemeter.environments import Environments
 from attacksurfacemeter.granularity import Granularity
-from attacksurfacemeter.loaders.cflow_line_parser import CflowLineParser
+from attacksurfacemeter.loaders import cflow_line_parser
 from attacksurfacemeter.loaders.gprof_line_parser import GprofLineParser
 from attacksurfacemeter.loaders.javacg_line_parser import JavaCGLineParser
 
+# Flags in the classification of a Call
+STDLIB = 1
+INPUT = 2
+OUTPUT = 4
+DANGEROUS = 8
+
 
 class Call():
 
-    """Represents a function or method in a system."""
+    """Represents a function or method in a system.
+
+    The identity of a Call is computed once, when it is constructed, since a
+    Call is hashed whenever it is used as a node in a call graph. The hash of
+    the identity is in turn cached by the string itself.
+    """
+
+    __slots__ = (
+        '_function_name', '_function_signature', '_environment',
+        '_granularity', '_identity', '_classification', 'level',
+        'class_name', 'package_name'
+    )
 
-    _android_input_methods = []
-    _android_output_methods = []
+    _android_input_methods = None
+    _android_output_methods = None
 
-    _c_std_lib_functions = []
-    _c_input_functions = []
-    _c_output_functions = []
-    _c_dangerous_sys_calls = []
+    _c_std_lib_functions = None
+    _c_input_functions = None
+    _c_output_functions = None
+    _c_dangerous_sys_calls = None
 
     def __init__(self, name, signature, environment,
                  granularity=Granularity.FUNC):
@@ -30,7 +48,9 @@ class Call():
         signature : str
             A piece of information associated with the function represented by
             this object. In the current implementation, it is the name of the
-            file where the function is defined.
+            file where the function is defined or, at DIRECTORY, CLASS, or
+            PACKAGE granularity, the directory, class, or package that the
+            object represents.
         environment : str
             The environment of the function. See
             attacksurfacemeter.environments.Environments for available choices.
@@ -47,10 +67,59 @@ class Call():
         self._function_name = name
         self._function_signature = signature
         self._environment = environment
-        if granularity not in [Granularity.FILE, Granularity.FUNC]:
+        if granularity not in [
+                Granularity.FILE, Granularity.FUNC, Granularity.DIRECTORY,
+                Granularity.CLASS, Granularity.PACKAGE]:
             raise Exception('Unsupported granularity {}'.format(granularity))
         self._granularity = granularity
 
+        self._identity = self._get_identity()
+        self._classification = None
+
+    @classmethod
+    def from_pool(cls, pool, name, signature, environment,
+                  granularity=Granularity.FUNC):
+        """Return the instance of Call in a pool, creating it if necessary.
+
+        Loaders use a pool to share one instance of Call, and one copy of its
+        name and signature, among all occurrences of a function in a call
+        graph.
+
+        Parameters
+        ----------
+        pool : dict
+            The pool of instances of Call, keyed by the tuple (name,
+            signature, environment, granularity). A new instance is added to
+            the pool.
+        name : str
+            The name of the function represented by the object.
+        signature : str
+            The signature of the function represented by the object.
+        environment : str
+            The environment of the function. See
+            attacksurfacemeter.environments.Environments for available choices.
+        granularity : str
+            The granularity of the call graph into which the instance of Call
+            will be added to. See attacksurfacemeter.granularity.Granularity
+            for available choices.
+
+        Returns
+        -------
+        (instance, is_new) : tuple
+            The instance of Call in the pool and True if the instance was
+            created by this call, False otherwise.
+        """
+        key = (name, signature, environment, granularity)
+        instance = pool.get(key)
+        if instance is not None:
+            return (instance, False)
+
+        instance = cls(
+            sys.intern(name), sys.intern(signature), environment, granularity
+        )
+        pool[key] = instance
+        return (instance, True)
+
     @classmethod
     def from_cflow(cls, cflow_line, granularity=Granularity.FUNC):
         """Instantiate Call by parsing a line from cflow call graph.
@@ -69,20 +138,19 @@ class Call():
         new_instance : Call
             An instance of Call.
         """
-        cflow_line_parser = CflowLineParser.get_instance(cflow_line)
+        (level, function_name, function_signature) = cflow_line_parser.parse(
+            cflow_line
+        )
 
         new_instance = cls(
-            cflow_line_parser.get_function_name(),
-            cflow_line_parser.get_function_signature(),
-            Environments.C,
-            granularity
+            function_name, function_signature, Environments.C, granularity
         )
-        new_instance.level = cflow_line_parser.get_level()
+        new_instance.level = level
 
         return new_instance
 
     @classmethod
-    def from_gprof(cls, gprof_line, granularity=Granularity.FUNC):
+    def from_gprof(cls, gprof_line, granularity=Granularity.FUNC, pool=None):
         """Instantiate Call by parsing a line from gprof call graph.
 
         Parameters
@@ -93,6 +161,8 @@ class Call():
             The granularity of the call graph into which the instance of Call
             will be added to. See attacksurfacemeter.granularity.Granularity
             for available choices.
+        pool : dict, optional
+            A pool of instances of Call. See Call.from_pool.
 
         Returns
         -------
@@ -101,17 +171,27 @@ class Call():
         """
         gprof_line_parser = GprofLineParser.get_instance(gprof_line)
 
-        new_instance = cls(
-            gprof_line_parser.get_function_name(),
-            gprof_line_parser.get_function_signature(),
-            Environments.C,
-            granularity
-        )
+        if pool is None:
+            new_instance = cls(
+                gprof_line_parser.get_function_name(),
+                gprof_line_parser.get_function_signature(),
+                Environments.C,
+                granularity
+            )
+        else:
+            (new_instance, _) = cls.from_pool(
+                pool,
+                gprof_line_parser.get_function_name(),
+                gprof_line_parser.get_function_signature(),
+                Environments.C,
+                granularity
+            )
 
         return new_instance
 
     @classmethod
-    def from_javacg(cls, javacg_line, granularity=Granularity.FUNC):
+    def from_javacg(cls, javacg_line, granularity=Granularity.FUNC,
+                    pool=None):
         """Instantiate Call by parsing a line from Java call graph.
 
         Parameters
@@ -122,6 +202,8 @@ class Call():
             The granularity of the call graph into which the instance of Call
             will be added to. See attacksurfacemeter.granularity.Granularity
             for available choices.
+        pool : dict, optional
+            A pool of instances of Call. See Call.from_pool.
 
         Returns
         -------
@@ -130,15 +212,26 @@ class Call():
         """
         javacg_line_parser = JavaCGLineParser.get_instance(javacg_line)
 
-        new_instance = cls(
-            javacg_line_parser.get_function_name(),
-            javacg_line_parser.get_function_signature(),
-            Environments.ANDROID,
-            granularity
-        )
+        if pool is None:
+            new_instance = cls(
+                javacg_line_parser.get_function_name(),
+                javacg_line_parser.get_function_signature(),
+                Environments.ANDROID,
+                granularity
+            )
+            is_new = True
+        else:
+            (new_instance, is_new) = cls.from_pool(
+                pool,
+                javacg_line_parser.get_function_name(),
+                javacg_line_parser.get_function_signature(),
+                Environments.ANDROID,
+                granularity
+            )
 
-        new_instance.class_name = javacg_line_parser.get_class()
-        new_instance.package_name = javacg_line_parser.get_package()
+        if is_new:
+            new_instance.class_name = javacg_line_parser.get_class()
+            new_instance.package_name = javacg_line_parser.get_package()
 
         return new_instance
 
@@ -150,7 +243,7 @@ class Call():
         call : str
             A String representation of the Call.
         """
-        if self._environment == Environments.ANDROID:
+        if self._environment == Environments.ANDROID and self._function_name:
             return self._function_signature + '.' + self._function_name
         else:
             return self.identity
@@ -173,7 +266,7 @@ class Call():
         hash : int
             A number that represents the calculated hash of this instance.
         """
-        return hash(self.identity)
+        return hash(self._identity)
 
     def __eq__(self, other):
         """Override == operator to allow comparing two Call instances.
@@ -188,7 +281,9 @@ class Call():
         is_equal : bool
             True if this instance is equal to other, False otherwise.
         """
-        return self.identity == other.identity
+        if self is other:
+            return True
+        return self._identity == other.identity
 
     def __ne__(self, other):
         """Override != operator to allow comparing two Call instances.
@@ -203,11 +298,13 @@ class Call():
         is_notequal : bool
             True if this instance is not equal to other, False otherwise.
         """
-        return self.identity != other.identity
+        if self is other:
+            return False
+        return self._identity != other.identity
 
     @staticmethod
     def _get_android_input_methods():
-        if not Call._android_input_methods:
+        if Call._android_input_methods is None:
             Call._android_input_methods = Call._load_function_list(
                 'android_input_methods'
             )
@@ -216,7 +313,7 @@ class Call():
 
     @staticmethod
     def _get_android_output_methods():
-        if not Call._android_output_methods:
+        if Call._android_output_methods is None:
             Call._android_output_methods = Call._load_function_list(
                 'android_output_methods'
             )
@@ -225,7 +322,7 @@ class Call():
 
     @staticmethod
     def _get_c_input_functions():
-        if not Call._c_input_functions:
+        if Call._c_input_functions is None:
             Call._c_input_functions = Call._load_function_list(
                 'c_input_functions'
             )
@@ -234,7 +331,7 @@ class Call():
 
     @staticmethod
     def _get_c_output_functions():
-        if not Call._c_output_functions:
+        if Call._c_output_functions is None:
             Call._c_output_functions = Call._load_function_list(
                 'c_output_functions'
             )
@@ -243,7 +340,7 @@ class Call():
 
     @staticmethod
     def _get_c_std_lib_functions():
-        if not Call._c_std_lib_functions:
+        if Call._c_std_lib_functions is None:
             Call._c_std_lib_functions = Call._load_function_list(
                 'c_std_lib_functions'
             )
@@ -252,7 +349,7 @@ class Call():
 
     @staticmethod
     def _get_c_dangerous_sys_calls():
-        if not Call._c_dangerous_sys_calls:
+        if Call._c_dangerous_sys_calls is None:
             Call._c_dangerous_sys_calls = Call._load_function_list(
                 'c_dangerous_sys_calls'
             )
@@ -268,10 +365,57 @@ class Call():
         )
 
         with open(file_name) as f:
-            functions = f.read().splitlines()
+            functions = frozenset(f.read().splitlines())
 
         return functions
 
+    @property
+    def classification(self):
+        """Return the classification of the function as a bitmask.
+
+        The function is classified against the lists of functions in the data
+        directory the first time the classification is requested and the
+        classification is reused thereafter.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        classification : int
+            A bitwise or of the flags STDLIB, INPUT, OUTPUT and DANGEROUS
+            that apply to the function.
+        """
+        if self._classification is None:
+            self._classification = self._classify()
+        return self._classification
+
+    def _classify(self):
+        classification = 0
+
+        name = self._function_name
+        if not self._function_signature:
+            if name in Call._get_c_std_lib_functions():
+                classification |= STDLIB
+            if name in Call._get_c_dangerous_sys_calls():
+                classification |= DANGEROUS
+
+        if self._environment == Environments.C:
+            if not self._function_signature:
+                if name in Call._get_c_input_functions():
+                    classification |= INPUT
+                if name in Call._get_c_output_functions():
+                    classification |= OUTPUT
+        elif self._environment == Environments.ANDROID:
+            method = self._function_signature + '.' + name
+            if method in Call._get_android_input_methods():
+                classification |= INPUT
+            if method in Call._get_android_output_methods():
+                classification |= OUTPUT
+
+        return classification
+
     def is_input(self):
         """Return True if the function is standard input, False otherwise.
 
@@ -290,21 +434,7 @@ class Call():
         is_input : bool
             True if the function is standard input, False otherwise.
         """
-        is_input = False
-
-        if self._environment == Environments.C:
-            input_functions = Call._get_c_input_functions()
-            is_input = (
-                not self._function_signature and
-                self._function_name in input_functions
-            )
-        elif self._environment == Environments.ANDROID:
-            input_functions = Call._get_android_input_methods()
-            is_input = (
-                self._function_signature + "." + self._function_name
-            ) in input_functions
-
-        return is_input
+        return bool(self.classification & INPUT)
 
     def is_output(self):
         """Return True if the function is standard output, False otherwise.
@@ -324,21 +454,7 @@ class Call():
         is_output : bool
             True if function is standard output, False otherwise.
         """
-        is_output = False
-
-        if self._environment == Environments.C:
-            output_functions = Call._get_c_output_functions()
-            is_output = (
-                not self._function_signature and
-                self._function_name in output_functions
-            )
-        elif self._environment == Environments.ANDROID:
-            output_functions = Call._get_android_output_methods()
-            is_output = (
-                self._function_signature + "." + self._function_name
-            ) in output_functions
-
-        return is_output
+        return bool(self.classification & OUTPUT)
 
     def is_dangerous(self):
         """Return True if the function is a dangerous, False otherwise.
@@ -361,12 +477,7 @@ class Call():
         is_dangerous : bool
             True if the function is dangerous, False otherwise.
         """
-        c_dangerous_sys_calls = Call._get_c_dangerous_sys_calls()
-        is_dangerous = (
-            not self._function_signature and
-            self._function_name in c_dangerous_sys_calls
-        )
-        return is_dangerous
+        return bool(self.classification & DANGEROUS)
 
     def in_stdlib(self):
         """Return True if the function is part of C library, False otherwise.
@@ -386,12 +497,7 @@ class Call():
         in_stdlib : bool
             True if function is part of C library, False otherwise.
         """
-        c_std_lib_functions = Call._get_c_std_lib_functions()
-        in_stdlib = (
-            not self._function_signature and
-            self._function_name in c_std_lib_functions
-        )
-        return in_stdlib
+        return bool(self.classification & STDLIB)
 
     @property
     def identity(self):
@@ -406,12 +512,15 @@ class Call():
         identity : str
             The unique representation of this object.
         """
+        return self._identity
+
+    def _get_identity(self):
         identity = None
         if self._granularity == Granularity.FUNC:
             identity = self._function_name
             if self._function_signature:
                 identity += ' ' + self._function_signature
-        elif self._granularity == Granularity.FILE:
+        else:
             identity = self._function_signature
 
         return identity
@@ -460,3 +569,20 @@ class Call():
             The environment of the function represented by this object.
         """
         return self._environment
+
+    @property
+    def granularity(self):
+        """Return the granularity of the call graph containing this object.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        granularity : str
+            The granularity of the call graph into which this object was
+            added. See attacksurfacemeter.granularity.Granularity for
+            available choices.
+        """
+        return self._granularity
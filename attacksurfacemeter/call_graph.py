@@ -1,13 +1,22 @@
+import collections
 import json
 import os
 import statistics as stat
 
 import networkx as nx
+import numpy as np
 
+from attacksurfacemeter import contraction
+from attacksurfacemeter import snapshot
 from attacksurfacemeter import utilities
 from attacksurfacemeter.call import Call
+from attacksurfacemeter.csr_graph import CALL, CsrGraph
 from attacksurfacemeter.environments import Environments
 from attacksurfacemeter.granularity import Granularity
+from attacksurfacemeter.proximity import Proximity, get_mean_lengths
+from attacksurfacemeter.reachability import Reachability
+from attacksurfacemeter.risky_walk import RiskyWalk
+from attacksurfacemeter.versioned_graph import VersionedDiGraph
 
 
 class CallGraph():
@@ -35,7 +44,8 @@ class CallGraph():
             path to the directory containing the source code of a system the
             call graph for which is to be generated.
         graph : networkx.DiGraph
-            Internal representation of the graph data structure.
+            Internal representation of the graph data structure. A graph that
+            is not a VersionedDiGraph is copied into one.
         load_errors : list, optional
             A list of erroneous lines that the call graph loader may have
             failed to load.
@@ -58,24 +68,81 @@ class CallGraph():
         self.monolithicity = None
         self.granularity = granularity
 
-        self._init()
         self._sanitize()
 
         if fragmentize:
-            fragments = utilities.get_fragments(graph)
-            fragment = utilities.get_largest_fragment(fragments)
-
-            self.num_fragments = len(fragments)
-            self.monolithicity = len(fragment.nodes()) / len(graph.nodes())
-            self.call_graph = fragment
+            self._fragmentize()
 
     def _init(self):
         """Initialize private instance variables."""
-        self._entry_points = None
-        self._exit_points = None
+        self._cache = dict()
+        self._version = None
+        self._snapshot = None
+
+    @property
+    def call_graph(self):
+        """Return the graph data structure underlying the call graph.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        call_graph : VersionedDiGraph
+            Internal representation of the graph data structure.
+        """
+        if self._call_graph is None:
+            # The graph of a call graph loaded from a snapshot is decoded on
+            #   first access; results cached until then remain valid
+            (_snapshot, nodes) = self._snapshot
+            self._call_graph = _snapshot.get_graph(nodes)
+            self._version = self._call_graph.version
+            self._snapshot = None
+        return self._call_graph
+
+    @call_graph.setter
+    def call_graph(self, graph):
+        if not isinstance(graph, VersionedDiGraph):
+            graph = VersionedDiGraph(graph)
+        self._call_graph = graph
+        self._init()
+
+    def _memoize(self, key, function, *args):
+        """Return the result of a computation over the call graph.
 
-        self._degree = None
-        self._fan = None
+        Results are cached by key, which identifies the metric and the
+        parameters it was computed with, and remain valid for as long as the
+        version of the graph that they were computed from is current.
+
+        Parameters
+        ----------
+        key : tuple
+            A tuple whose first element is the name of the metric and the
+            remaining elements are the parameters of the computation.
+        function : callable
+            The function to compute the result with, called with args when the
+            result is not cached.
+        args : positional arguments, optional
+            The arguments to call function with.
+
+        Returns
+        -------
+        result : object
+            The result of function(*args) for the current version of the graph.
+        """
+        cache = self._get_cache()
+        if key not in cache:
+            cache[key] = function(*args)
+        return cache[key]
+
+    def _get_cache(self):
+        """Return the cache of results for the current version of the graph."""
+        if (self._call_graph is not None and
+                self._version != self._call_graph.version):
+            self._cache = dict()
+            self._version = self._call_graph.version
+        return self._cache
 
     def _sanitize(self):
         """Sanitize the graph by removing empty nodes."""
@@ -83,9 +150,20 @@ class CallGraph():
             if not str(node):
                 self.call_graph.remove_node(node)
 
+    def _fragmentize(self):
+        """Replace the graph by its largest fragment."""
+        fragments = utilities.get_fragments(self.call_graph)
+        fragment = utilities.get_largest_fragment(fragments)
+
+        self.num_fragments = len(fragments)
+        self.monolithicity = (
+            len(fragment.nodes()) / len(self.call_graph.nodes())
+        )
+        self.call_graph = fragment
+
     @classmethod
     def from_loader(cls, loader, fragmentize=False,
-                    granularity=Granularity.FUNC):
+                    granularity=Granularity.FUNC, cache=None):
         """Construct a CallGraph using the given loader.
 
         Parameters
@@ -95,6 +173,11 @@ class CallGraph():
         granularity : str
             The granularity at which the call graph must be loaded. See
             attacksurfacemeter.granularity.Granularity for available choices.
+        cache : CallGraphCache, optional
+            A cache of call graphs loaded before. A call graph found in the
+            cache is loaded from it instead of by the loader and a call graph
+            loaded by the loader is added to it, unless adding it fails. See
+            attacksurfacemeter.call_graph_cache.CallGraphCache.
 
         Returns
         -------
@@ -102,10 +185,155 @@ class CallGraph():
             An instance of CallGraph representing a call graph loaded by the
             specified loader.
         """
+        if cache is not None:
+            path = cache.get_path(loader, granularity)
+            if cache.touch(path):
+                try:
+                    call_graph = cls.from_snapshot(path, fragmentize)
+                    call_graph.source = loader.source
+                    return call_graph
+                except (snapshot.SnapshotError, OSError, ValueError):
+                    pass
+
         graph = loader.load_call_graph(granularity)
-        load_errors = loader.errors
+        call_graph = cls(
+            loader.source, graph, loader.errors, granularity=granularity
+        )
 
-        return cls(loader.source, graph, load_errors, fragmentize, granularity)
+        if cache is not None:
+            # Failing to cache a call graph, such as when the cache is full or
+            #   read-only, does not fail the load
+            try:
+                cache.add(path, call_graph)
+            except (OSError, ValueError):
+                pass
+
+        if fragmentize:
+            call_graph._fragmentize()
+
+        return call_graph
+
+    @classmethod
+    def from_snapshot(cls, path, fragmentize=False):
+        """Construct a CallGraph from a snapshot saved using CallGraph.save.
+
+        The snapshot is memory mapped and the array-backed view of the call
+        graph uses the adjacency arrays in the snapshot in place, so they are
+        shared among all processes that load the snapshot. Unless the call
+        graph is fragmentized, opening the snapshot decodes neither its nodes
+        nor its graph: a node is decoded into a Call on first access, and the
+        graph on first access to CallGraph.call_graph, e.g. through nodes or
+        edges.
+
+        Parameters
+        ----------
+        path : str
+            The absolute path of the snapshot file.
+        fragmentize : bool, optional
+            If true, the call graph is fragmentized such that the largest
+            subgraph becomes the new call graph.
+
+        Returns
+        -------
+        call_graph : CallGraph
+            An instance of CallGraph representing the call graph saved in the
+            snapshot.
+
+        Raises
+        ------
+        attacksurfacemeter.snapshot.SnapshotError
+            If the file is not a snapshot or is of an unsupported version.
+        """
+        _snapshot = snapshot.Snapshot(path)
+        metadata = _snapshot.metadata
+        nodes = _snapshot.get_nodes()
+
+        if fragmentize:
+            call_graph = cls(
+                metadata['source'], _snapshot.get_graph(nodes),
+                metadata['load_errors'], fragmentize, metadata['granularity']
+            )
+            # The snapshot is unmapped once decoded since the array-backed
+            #   view of the fragment is built from the graph
+            _snapshot.close()
+            return call_graph
+
+        # The graph saved was sanitized when it was constructed
+        call_graph = cls(
+            metadata['source'], VersionedDiGraph(), metadata['load_errors'],
+            granularity=metadata['granularity']
+        )
+        call_graph._call_graph = None
+        call_graph._snapshot = (_snapshot, nodes)
+        call_graph.num_fragments = metadata['num_fragments']
+        call_graph.monolithicity = metadata['monolithicity']
+        call_graph._get_cache()[('csr_graph',)] = (
+            _snapshot.get_csr_graph(nodes)
+        )
+
+        return call_graph
+
+    def save(self, path):
+        """Save the call graph to a binary snapshot.
+
+        See attacksurfacemeter.snapshot.Snapshot for the format of the
+        snapshot. The call graph is loaded from the snapshot using
+        CallGraph.from_snapshot.
+
+        Parameters
+        ----------
+        path : str
+            The absolute path of the snapshot file.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If a node or an edge has an attribute whose value is neither None
+            nor a number.
+        """
+        snapshot.save(path, self)
+
+    def contract(self, granularity):
+        """Contract the call graph to a coarser granularity.
+
+        The call graph, loaded at FUNC granularity, is contracted without
+        loading it again, so a call graph at FILE granularity and its rollups
+        by directory or, for Java, by class or package are derived from a
+        single load. See attacksurfacemeter.contraction.contract for how the
+        attributes of nodes and edges are merged.
+
+        Parameters
+        ----------
+        granularity : str
+            The granularity to contract the call graph to: FILE, DIRECTORY,
+            CLASS, or PACKAGE. See attacksurfacemeter.granularity.Granularity.
+
+        Returns
+        -------
+        call_graph : CallGraph
+            An instance of CallGraph representing the contracted call graph.
+
+        Raises
+        ------
+        ValueError
+            If the call graph is not at FUNC granularity or cannot be
+            contracted to the granularity.
+        """
+        if self.granularity != Granularity.FUNC:
+            raise ValueError(
+                'Call graph at {0} granularity cannot be contracted.'.format(
+                    self.granularity
+                )
+            )
+
+        return CallGraph(
+            self.source, contraction.contract(self.call_graph, granularity),
+            self.load_errors, granularity=granularity
+        )
 
     @classmethod
     def from_merge(cls, cflow_call_graph, gprof_call_graph, fragmentize=False):
@@ -132,7 +360,7 @@ class CallGraph():
         )
         utilities.fix(cflow_call_graph, using=gprof_call_graph)
 
-        graph = nx.DiGraph()
+        graph = VersionedDiGraph()
 
         # WARNING: The merge order CANNOT change. The value of the 'tested'
         #   attribute of the graph nodes works on the assumption that nodes
@@ -167,9 +395,7 @@ class CallGraph():
         entry_points : list
             A list of Call objects, each representing an entry point.
         """
-        if self._entry_points is None:
-            self._entry_points = self.get_nodes('entry')
-        return self._entry_points
+        return self._memoize(('entry_points',), self.get_nodes, 'entry')
 
     @property
     def exit_points(self):
@@ -184,9 +410,7 @@ class CallGraph():
         exit_points : list
             A list of Call objects, each representing an exit point.
         """
-        if self._exit_points is None:
-            self._exit_points = self.get_nodes('exit')
-        return self._exit_points
+        return self._memoize(('exit_points',), self.get_nodes, 'exit')
 
     @property
     def nodes(self):
@@ -223,6 +447,27 @@ class CallGraph():
         """
         return self.call_graph.edges(data=True)
 
+    @property
+    def csr_graph(self):
+        """Return an array-backed view of the call graph.
+
+        The view is built on first access and reused until the call graph is
+        modified.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        csr_graph : CsrGraph
+            An instance of CsrGraph representing the call graph in compressed
+            sparse row form.
+        """
+        return self._memoize(
+            ('csr_graph',), lambda: CsrGraph.from_graph(self.call_graph)
+        )
+
     @utilities.deprecation
     def get_degree(self, call=None):
         """Return the degree of a specific call.
@@ -238,19 +483,22 @@ class CallGraph():
             A 2-tuple, (indegree, outdegree), of call (if provided) or a
             dictionary keyed by call with (indegree, outdegree) as the value.
         """
-        if self._degree is None:
-            _in_degree = self.call_graph.in_degree()
-            _out_degree = self.call_graph.out_degree()
-
-            if _in_degree or _out_degree:
-                keys = set(list(_in_degree.keys()) + list(_out_degree.keys()))
-                self._degree = {
-                    k: (_in_degree[k], _out_degree[k]) for k in keys
-                }
+        degree = self._memoize(('degree',), self._get_degree)
 
         if call:
-            return self._degree[call]
-        return self._degree
+            return degree[call]
+        return degree
+
+    def _get_degree(self):
+        """Return a dictionary keyed by call with (indegree, outdegree)."""
+        if not len(self.csr_graph):
+            return None
+
+        (_in_degree, _out_degree) = self.csr_graph.get_degrees()
+        return dict(zip(
+            self.csr_graph.nodes,
+            zip(_in_degree.tolist(), _out_degree.tolist())
+        ))
 
     def get_fan(self, call=None):
         """Return the fan metrics of a specific call.
@@ -266,30 +514,39 @@ class CallGraph():
             A 2-tuple, (fan_in, dan_out), of call (if provided) or a
             dictionary keyed by call with (fan_in, fan_out) as the value.
         """
-        if self._fan is None:
-            self._fan = dict()
-            for (i, _) in self.nodes:
-                _fan_in = _fan_out = 0
-
-                # # callers
-                _in_edges = self.call_graph.in_edges_iter(i, data=True)
-                _callers = [
-                    u for (u, _, attrs) in _in_edges if 'call' in attrs
-                ]
-                _fan_in = len(_callers)
-
-                # # callee
-                _out_edges = self.call_graph.out_edges_iter(i, data=True)
-                _callees = [
-                    u for (u, _, attrs) in _out_edges if 'call' in attrs
-                ]
-                _fan_out = len(_callees)
-
-                self._fan[i] = (_fan_in, _fan_out)
+        fan = self._memoize(('fan',), self._get_fan)
 
         if call:
-            return self._fan[call]
-        return self._fan
+            return fan[call]
+        return fan
+
+    def _get_fan(self):
+        """Return a dictionary keyed by call with (fan_in, fan_out)."""
+        return dict(zip(
+            self.csr_graph.nodes, map(tuple, self.get_fans().tolist())
+        ))
+
+    def get_fans(self):
+        """Return the fan metrics of all calls as an array.
+
+        The fan-in and fan-out of every call are counted in a single pass
+        over the edges that represent a call.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        fans : numpy.ndarray
+            A two-dimensional array with one row per node, aligned with
+            csr_graph.nodes, containing (fan_in, fan_out) of the node.
+        """
+        return self._memoize(('fans',), self._get_fans)
+
+    def _get_fans(self):
+        """Return an array with (fan_in, fan_out) of each node."""
+        return np.column_stack(self.csr_graph.get_degrees(CALL))
 
     def get_ancestors(self, call):
         """Return the list of ancestors of a specific call.
@@ -308,7 +565,7 @@ class CallGraph():
             A list of Call objects, each of which represent the ancestor of the
             given call.
         """
-        return list(nx.ancestors(self.call_graph, call))
+        return self._get_reachability().get_ancestors(call)
 
     def get_descendants(self, call):
         """Return the list of descendants of a specific call.
@@ -327,7 +584,11 @@ class CallGraph():
             A list of Call objects, each of which represent the descendant of
             the given call.
         """
-        return list(nx.descendants(self.call_graph, call))
+        return self._get_reachability().get_descendants(call)
+
+    def _get_reachability(self):
+        """Return the index used to answer reachability queries."""
+        return self._memoize(('reachability',), Reachability, self.csr_graph)
 
     def get_nodes(self, attribute):
         """Return a list of nodes that have a specific attribute set.
@@ -344,9 +605,20 @@ class CallGraph():
             associated with them. An empty list is returned when there are no
             nodes that have the specified attribute associated with them.
         """
+        if self._call_graph is None:
+            (_snapshot, nodes) = self._snapshot
+            return [nodes[i] for i in _snapshot.get_positions(attribute)]
+
         nodes = list(nx.get_node_attributes(self.call_graph, attribute).keys())
         return nodes
 
+    def _has_attribute(self, call, attribute):
+        """Return True if call is a node that has attribute set."""
+        return (
+            call in self.call_graph and
+            attribute in self.call_graph.node[call]
+        )
+
     def get_entry_point_reachability(self, call):
         """Return the percentage of system accessible from an entry point.
 
@@ -360,10 +632,11 @@ class CallGraph():
         reachability : float
             The calculated percentage.
         """
-        if call not in self.entry_points:
+        if not self._has_attribute(call, 'entry'):
             raise Exception('{0} must be an entry point.'.format(call))
 
-        return len(self.get_descendants(call)) / len(self.nodes)
+        reachability = self._get_reachability()
+        return reachability.count_descendants(call) / len(self.csr_graph)
 
     def get_exit_point_reachability(self, call):
         """Return the percentage of system that accesses an exit point.
@@ -378,10 +651,11 @@ class CallGraph():
         reachability : float
             The calculated percentage.
         """
-        if call not in self.exit_points:
+        if not self._has_attribute(call, 'exit'):
             raise Exception('{0} must be an exit point.'.format(call))
 
-        return len(self.get_ancestors(call)) / len(self.nodes)
+        reachability = self._get_reachability()
+        return reachability.count_ancestors(call) / len(self.csr_graph)
 
     def get_shortest_path_length(self, call, attribute):
         """Return shortest path from call to all nodes identified by attribute.
@@ -404,23 +678,109 @@ class CallGraph():
             are no nodes with the specified attribute defined, then None is
             returned.
         """
-        lengths = None
+        return self.get_proximity(attribute).get_lengths(call)
 
-        nodes = self.get_nodes(attribute)
-        if call in nodes:
-            lengths = dict()
-        else:
-            _lengths = dict()
-            for node in self.get_nodes(attribute):
-                if nx.has_path(self.call_graph, source=call, target=node):
-                    _lengths[node] = nx.shortest_path_length(
-                        self.call_graph, source=call, target=node
-                    )
+    def get_proximity(self, attribute):
+        """Return the distance from all nodes to nodes identified by attribute.
+
+        The distance table is computed once per attribute, with a single
+        reverse breadth-first search per node identified by the attribute,
+        and reused by subsequent calls.
+
+        Parameters
+        ----------
+        attribute : str
+            The name of the attribute that identifies the nodes.
+
+        Returns
+        -------
+        proximity : Proximity
+            An instance of Proximity holding the length of the shortest path
+            from every node in the call graph to every node identified by
+            the attribute.
+        """
+        return self._memoize(
+            ('proximity', attribute), lambda: Proximity.from_csr_graph(
+                self.csr_graph, self.get_nodes(attribute)
+            )
+        )
+
+    def get_proximities(self, attributes):
+        """Return the distance from all nodes to nodes identified by each of
+        several attributes.
+
+        The distance tables of attributes that have not been computed yet are
+        obtained together: a single reverse breadth-first search is performed
+        per distinct node identified by any of the attributes and the shared
+        table is then split by attribute.
+
+        Parameters
+        ----------
+        attributes : list
+            A list of names of attributes, each identifying a set of nodes.
 
-            if _lengths:
-                lengths = _lengths
+        Returns
+        -------
+        proximities : dict
+            A dictionary keyed by attribute with an instance of Proximity as
+            the value. See get_proximity.
+        """
+        cache = self._get_cache()
+        pending = [a for a in attributes if ('proximity', a) not in cache]
+
+        if pending:
+            targets = {a: self.get_nodes(a) for a in pending}
+
+            union = list()
+            for attribute in pending:
+                union.extend(targets[attribute])
+            shared = Proximity.from_csr_graph(
+                self.csr_graph, list(collections.OrderedDict.fromkeys(union))
+            )
 
-        return lengths
+            for attribute in pending:
+                cache[('proximity', attribute)] = shared.select(
+                    targets[attribute]
+                )
+
+        return {a: self.get_proximity(a) for a in attributes}
+
+    def get_mean_lengths(self, attributes):
+        """Return the mean shortest path length from all nodes to nodes
+        identified by each of several attributes.
+
+        The mean of an attribute whose distance table has been computed is
+        taken from the table. The means of the other attributes are computed
+        together, without building their tables, and reused by subsequent
+        calls; see attacksurfacemeter.proximity.get_mean_lengths.
+
+        Parameters
+        ----------
+        attributes : list
+            A list of names of attributes, each identifying a set of nodes.
+
+        Returns
+        -------
+        means : dict
+            A dictionary keyed by attribute with the mean path length as the
+            value. See Proximity.get_mean.
+        """
+        cache = self._get_cache()
+        for attribute in attributes:
+            if ('proximity', attribute) in cache:
+                cache[('mean_length', attribute)] = cache[
+                    ('proximity', attribute)
+                ].get_mean()
+        pending = [a for a in attributes if ('mean_length', a) not in cache]
+
+        if pending:
+            means = get_mean_lengths(
+                self.csr_graph, {a: self.get_nodes(a) for a in pending}
+            )
+            for attribute in pending:
+                cache[('mean_length', attribute)] = means[attribute]
+
+        return {a: cache[('mean_length', a)] for a in attributes}
 
     @utilities.deprecation
     def get_entry_surface_metrics(self, call):
@@ -499,7 +859,7 @@ class CallGraph():
         return metrics
 
     def get_page_rank(self, call=None, damping=0.85, entry=10000, exit=10000,
-                      other=1):
+                      other=1, tol=1.0e-6, max_iter=100, nstart=None):
         """Compute the page rank of nodes in the call graph.
 
         Parameters
@@ -515,6 +875,14 @@ class CallGraph():
         other : int, optional
             A non-zero personalization value for a node that is neither an
             entry point nor an exit point.
+        tol : float, optional
+            The error tolerance used to check convergence of the power method.
+        max_iter : int, optional
+            The maximum number of iterations of the power method.
+        nstart : dict, optional
+            A dictionary keyed by node with the starting value of its page
+            rank as the value, e.g. the result of a previous call with
+            similar parameters.
 
         Returns
         -------
@@ -524,27 +892,85 @@ class CallGraph():
             the call graph is returned with the node being the key and the
             page rank being the value.
         """
-        personalization = dict()
-        personalization.update({n: other for (n, _) in self.nodes})
-        personalization.update({n: entry for n in self.entry_points})
-        personalization.update({n: exit for n in self.exit_points})
-        personalization.update(
-            {
-                n: (entry + exit)
-                for n in set(self.entry_points).intersection(self.exit_points)
-            }
+        nodes = self.csr_graph.nodes
+
+        parameters = (damping, entry, exit, other, tol, max_iter)
+        if nstart is None:
+            page_rank = self._memoize(
+                ('page_rank',) + parameters, self._get_page_rank, *parameters
+            )
+        else:
+            page_rank = self._get_page_rank(
+                *parameters, nstart=[nstart[n] for n in nodes]
+            )
+
+        if call is not None:
+            return float(page_rank[self.csr_graph.index[call]])
+        return dict(zip(nodes, page_rank.tolist()))
+
+    def _get_page_rank(self, damping, entry, exit, other, tol, max_iter,
+                       nstart=None):
+        """Return an array containing the page rank of each node."""
+        risky_walk = self._get_risky_walk()
+
+        personalization = risky_walk.get_personalization(
+            self.entry_points, self.exit_points, entry, exit, other
+        )
+        return risky_walk.get_page_rank(
+            personalization, damping, tol, max_iter, nstart
         )
 
-        page_rank = nx.pagerank(
-            self.call_graph,
-            alpha=damping,
-            weight='weight',
-            personalization=personalization
+    def get_page_ranks(self, configurations, tol=1.0e-6, max_iter=100):
+        """Compute the page rank of nodes for several sets of parameters.
+
+        The sets of parameters are solved together over the same transition
+        probabilities, sharing the vectors propagated by those with the same
+        damping and starting each damping from the result of the previous
+        one, so a sweep over the parameters costs less than separate calls
+        to get_page_rank. See RiskyWalk.get_sweep.
+
+        Parameters
+        ----------
+        configurations : list
+            A list of dictionaries, each containing the parameters of one
+            computation. The keys damping, entry, exit, and other are
+            recognized and have the meaning and the default values of the
+            parameters of get_page_rank.
+        tol : float, optional
+            The error tolerance used to check convergence of the power method.
+        max_iter : int, optional
+            The maximum number of iterations of the power method.
+
+        Returns
+        -------
+        page_ranks : list
+            A list of dictionaries aligned with configurations, each
+            containing the page rank of all nodes in the call graph with the
+            node being the key and the page rank being the value.
+        """
+        parameters = [
+            (
+                configuration.get('damping', 0.85),
+                configuration.get('entry', 10000),
+                configuration.get('exit', 10000),
+                configuration.get('other', 1)
+            )
+            for configuration in configurations
+        ]
+
+        page_ranks = self._memoize(
+            ('page_ranks', tuple(parameters), tol, max_iter),
+            lambda: self._get_risky_walk().get_sweep(
+                self.entry_points, self.exit_points, parameters, tol, max_iter
+            )
         )
 
-        if call is not None:
-            return page_rank[call]
-        return page_rank
+        nodes = self.csr_graph.nodes
+        return [dict(zip(nodes, column)) for column in page_ranks.T.tolist()]
+
+    def _get_risky_walk(self):
+        """Return the engine used to compute the page rank of nodes."""
+        return self._memoize(('risky_walk',), RiskyWalk, self.csr_graph)
 
     def assign_page_rank(self, damping=0.85, entry=10000, exit=10000, other=1,
                          name='page_rank'):
@@ -575,6 +1001,7 @@ class CallGraph():
                 damping=damping, entry=entry, exit=exit, other=other
             )
         )
+        self.call_graph.touch()
 
     def assign_weights(self, weights=None):
         """Assign weights to edges.
@@ -617,6 +1044,8 @@ class CallGraph():
 
             self.call_graph.edge[caller][callee]['weight'] = weight
 
+        self.call_graph.touch()
+
     def get_critical_graph(self):
 
         critical_graph = nx.DiGraph()
@@ -0,0 +1,185 @@
+import hashlib
+import os
+
+from attacksurfacemeter import snapshot
+
+# Version of the keys of the cache, to be incremented whenever the call graph
+#   loaded from the same sources with the same parameters may change
+VERSION = 1
+
+# Default cap, in bytes, on the size of the cache
+MAX_SIZE = 1 << 30
+
+EXTENSION = '.snapshot'
+
+
+class CallGraphCache():
+
+    """Represents a directory of call graphs loaded before.
+
+    A call graph is cached as a snapshot (see attacksurfacemeter.snapshot)
+    named by a digest of everything that the call graph loaded depends on:
+    the class of the loader, the fingerprints of its sources, the
+    granularity, the reverse flag, the defenses and vulnerabilities, and any
+    other parameter of the loader. The fingerprint of a source is a digest of
+    its content or, if content is False, of its path, size, and modification
+    time. The fingerprint of a directory is that of the files in it that the
+    loader reads (see BaseLoader.get_source_files), so the same sources are
+    found in the cache wherever they are when fingerprinted by content and
+    other files, such as build outputs, do not change the fingerprint.
+
+    The size of the cache is capped by evicting the least recently used call
+    graphs, those whose snapshots were least recently loaded or saved, when a
+    call graph is added. The cache may be shared among processes.
+    """
+
+    def __init__(self, directory, max_size=MAX_SIZE, content=True):
+        """CallGraphCache constructor.
+
+        Parameters
+        ----------
+        directory : str
+            The absolute path of the directory of the cache. The directory is
+            created if it does not exist.
+        max_size : int, optional
+            The maximum size, in bytes, of the snapshots in the cache.
+        content : bool, optional
+            If true, the fingerprint of a source is a digest of its content.
+            Otherwise, it is a digest of its path, size, and modification
+            time.
+
+        Returns
+        -------
+        cache : CallGraphCache
+            An instance of CallGraphCache.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.content = content
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_path(self, loader, granularity):
+        """Return the path of the snapshot caching a call graph.
+
+        Parameters
+        ----------
+        loader : BaseLoader or its derivative
+            Loader used to load the call graph.
+        granularity : str
+            The granularity at which the call graph is loaded. See
+            attacksurfacemeter.granularity.Granularity for available choices.
+
+        Returns
+        -------
+        path : str
+            The absolute path of the snapshot, which may not exist.
+        """
+        digest = hashlib.sha1()
+
+        cls = type(loader)
+        parameters = [
+            str(VERSION), '{0}.{1}'.format(cls.__module__, cls.__name__),
+            granularity, str(bool(loader.is_reverse))
+        ]
+        parameters.append(
+            '\n'.join(sorted(call.identity for call in loader.defenses))
+        )
+        parameters.append(
+            '\n'.join(sorted(call.identity for call in loader.vulnerabilities))
+        )
+        parameters.extend(loader.get_parameters())
+        digest.update('\0'.join(parameters).encode())
+
+        for source in loader.get_sources():
+            digest.update(b'\0')
+            self._update(digest, loader, source)
+
+        return os.path.join(
+            self.directory, '{0}{1}'.format(digest.hexdigest(), EXTENSION)
+        )
+
+    def touch(self, path):
+        """Record a use of a cached call graph.
+
+        Parameters
+        ----------
+        path : str
+            The absolute path of the snapshot caching the call graph. See
+            CallGraphCache.get_path.
+
+        Returns
+        -------
+        is_cached : bool
+            True if the call graph is in the cache, False otherwise.
+        """
+        try:
+            os.utime(path)
+        except OSError:
+            return False
+        return True
+
+    def add(self, path, call_graph):
+        """Add a call graph to the cache.
+
+        Least recently used call graphs are evicted until the size of the
+        cache is within its cap, the call graph added included.
+
+        Parameters
+        ----------
+        path : str
+            The absolute path of the snapshot caching the call graph. See
+            CallGraphCache.get_path.
+        call_graph : CallGraph
+            The call graph to cache.
+
+        Returns
+        -------
+        None
+        """
+        snapshot.save(path, call_graph)
+        self._evict()
+
+    def _evict(self):
+        entries = list()
+        for name in os.listdir(self.directory):
+            if name.endswith(EXTENSION):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        size = sum(entry[1] for entry in entries)
+        for (_, _size, name) in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            size -= _size
+
+    def _update(self, digest, loader, source):
+        """Update a digest with the fingerprint of a source."""
+        if not self.content:
+            digest.update(os.path.abspath(source).encode())
+        if os.path.isdir(source):
+            for name in loader.get_source_files(source):
+                digest.update(b'\0')
+                digest.update(name.encode())
+                self._update_file(digest, os.path.join(source, name))
+        elif os.path.isfile(source):
+            self._update_file(digest, source)
+
+    def _update_file(self, digest, path):
+        digest.update(b'\0')
+        if self.content:
+            with open(path, 'rb') as file_:
+                for block in iter(lambda: file_.read(1 << 20), b''):
+                    digest.update(block)
+        else:
+            stat = os.stat(path)
+            digest.update(
+                '{0}:{1}'.format(stat.st_size, stat.st_mtime_ns).encode()
+            )
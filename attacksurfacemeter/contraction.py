@@ -0,0 +1,168 @@
+import posixpath
+
+import numpy as np
+
+from attacksurfacemeter import snapshot
+from attacksurfacemeter.call import Call
+from attacksurfacemeter.environments import Environments
+from attacksurfacemeter.granularity import Granularity
+from attacksurfacemeter.versioned_graph import VersionedDiGraph
+
+# Granularities to which a call graph at FUNC granularity may be contracted
+GRANULARITIES = (
+    Granularity.FILE, Granularity.DIRECTORY, Granularity.CLASS,
+    Granularity.PACKAGE
+)
+
+
+def contract(graph, granularity):
+    """Contract a call graph at FUNC granularity to a coarser granularity.
+
+    Each node is mapped to the file, directory, class, or package that it is
+    in and the nodes and edges mapped to the same node or edge are merged in
+    a single group-by over arrays encoding their attributes.
+
+    Attributes without values, the flags of nodes and edges, are unioned as
+    they are when a loader adds calls to different functions that are equal
+    at the granularity to the same node or edge, so a call graph contracted
+    to FILE granularity has the nodes, edges, and flags of the call graph
+    loaded directly at FILE granularity. Attributes with values, such as
+    frequencies, are merged by taking their maximum, which is the value that
+    a direct load by a single loader assigns since every call adds the same
+    value. The frequencies that MultigprofLoader counts across call graphs
+    cannot be recovered once the call graphs are summarized, so their
+    maximum is a lower bound of the frequencies of a direct load.
+
+    Parameters
+    ----------
+    graph : networkx.DiGraph
+        The call graph at FUNC granularity.
+    granularity : str
+        The granularity to contract the call graph to: FILE, DIRECTORY,
+        CLASS, or PACKAGE. See attacksurfacemeter.granularity.Granularity.
+
+    Returns
+    -------
+    graph : VersionedDiGraph
+        The contracted call graph. Each node is a Call at granularity whose
+        signature is the file, directory, class, or package represented.
+
+    Raises
+    ------
+    ValueError
+        If the granularity is not one that a call graph may be contracted to,
+        at DIRECTORY granularity, if a node was not loaded from a C call
+        graph, or, at CLASS or PACKAGE granularity, if a node does not have a
+        class or package, which only nodes loaded from Java call graphs have.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(
+            'Unsupported granularity {0} to contract to.'.format(granularity)
+        )
+
+    contracted = VersionedDiGraph()
+
+    nodes = graph.nodes()
+    if not nodes:
+        return contracted
+    index = dict((node, i) for (i, node) in enumerate(nodes))
+
+    (keys, groups) = np.unique(
+        [_get_key(node, granularity) for node in nodes], return_inverse=True
+    )
+    (first, node_attrs) = _reduce(
+        'node', groups, len(keys), [graph.node[node] for node in nodes]
+    )
+    calls = [
+        _get_call(nodes[i], key, granularity)
+        for (i, key) in zip(first.tolist(), keys.tolist())
+    ]
+    contracted.add_nodes_from(zip(calls, node_attrs))
+
+    edges = graph.edges(data=True)
+    if not edges:
+        return contracted
+
+    # Each edge is keyed by the pair of groups of its caller and its callee
+    sources = groups[[index[caller] for (caller, _, _) in edges]]
+    destinations = groups[[index[callee] for (_, callee, _) in edges]]
+    (pairs, _groups) = np.unique(
+        sources * len(keys) + destinations, return_inverse=True
+    )
+    (_, edge_attrs) = _reduce(
+        'edge', _groups, len(pairs), [attrs for (_, _, attrs) in edges]
+    )
+    contracted.add_edges_from(
+        (calls[source], calls[destination], attrs)
+        for (source, destination, attrs) in zip(
+            (pairs // len(keys)).tolist(), (pairs % len(keys)).tolist(),
+            edge_attrs
+        )
+    )
+
+    return contracted
+
+
+def _get_key(call, granularity):
+    """Return the file, directory, class, or package of a Call."""
+    if granularity == Granularity.FILE:
+        return call.function_signature
+    elif granularity == Granularity.DIRECTORY:
+        # The signature of a Java method is a class name, not a path
+        if call.environment != Environments.C:
+            raise ValueError(
+                'Call {0} has no directory to contract to.'.format(call)
+            )
+        # Calls without a file are mapped to no directory so that, as at FILE
+        #   granularity, they are removed when the call graph is sanitized
+        if not call.function_signature:
+            return ''
+        return posixpath.dirname(call.function_signature) or '.'
+
+    name = 'class_name' if granularity == Granularity.CLASS else 'package_name'
+    key = getattr(call, name, None)
+    if key is None:
+        raise ValueError(
+            'Call {0} has no {1} to contract to.'.format(call, granularity)
+        )
+    return key
+
+
+def _get_call(call, key, granularity):
+    """Return the Call representing the group of the Call call."""
+    _call = Call('', key, call.environment, granularity)
+
+    class_name = getattr(call, 'class_name', None)
+    package_name = getattr(call, 'package_name', None)
+    if class_name is not None and granularity in (
+            Granularity.FILE, Granularity.CLASS):
+        _call.class_name = class_name
+    if package_name is not None and granularity != Granularity.DIRECTORY:
+        _call.package_name = package_name
+
+    return _call
+
+
+def _reduce(kind, groups, count, attrs):
+    """Merge the attributes of the nodes or edges in each group.
+
+    Returns the index of the first node or edge in each group and a list of
+    the merged attributes of each group.
+    """
+    (flags, values, masks, arrays) = snapshot.encode_attributes(kind, attrs)
+
+    # Sort the nodes or edges by group, stably so that the first of each
+    #   group is the first in the call graph
+    order = np.argsort(groups, kind='mergesort')
+    starts = np.searchsorted(groups[order], np.arange(count))
+
+    masks = np.bitwise_or.reduceat(masks[order], starts)
+    arrays = dict(
+        (name, np.fmax.reduceat(array[order], starts))
+        for (name, array) in arrays.items()
+    )
+
+    return (
+        order[starts],
+        list(snapshot.decode_attributes(flags, values, masks, arrays))
+    )
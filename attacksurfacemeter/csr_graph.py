@@ -0,0 +1,294 @@
+import numpy as np
+
+# Bit flags recording the attributes associated with an edge
+CALL = 1
+RETURN = 2
+CFLOW = 4
+GPROF = 8
+
+FLAGS = (
+    ('call', CALL), ('return', RETURN), ('cflow', CFLOW), ('gprof', GPROF)
+)
+
+# Sentinel stored in a distance array when a node is not reachable
+UNREACHABLE = -1
+
+
+class CsrGraph():
+
+    """Represents an immutable, array-backed view of a call graph.
+
+    The adjacency of the graph is stored in compressed sparse row (CSR) form.
+    Nodes are identified by their position in the nodes list and the
+    successors of the node at position i are indices[indptr[i]:indptr[i+1]].
+    The attributes of each edge are held in per-edge arrays aligned with
+    indices.
+    """
+
+    def __init__(self, nodes, indptr, indices, flags, weights, index=None):
+        """CsrGraph constructor.
+
+        Parameters
+        ----------
+        nodes : list
+            A list of Call objects. The position of a node in the list is the
+            integer used to identify the node in the arrays.
+        indptr : numpy.ndarray
+            An array of len(nodes) + 1 offsets into indices.
+        indices : numpy.ndarray
+            An array containing the destination of each edge, grouped by the
+            source of the edge.
+        flags : numpy.ndarray
+            An array containing a bitmask of CALL, RETURN, CFLOW, and GPROF
+            for each edge.
+        weights : numpy.ndarray
+            An array containing the weight of each edge.
+        index : dict, optional
+            A dictionary keyed by Call with the position of the Call in nodes
+            as the value. Computed from nodes on first use when not
+            specified.
+
+        Returns
+        -------
+        csr_graph : CsrGraph
+            An instance of CsrGraph.
+        """
+        self.nodes = nodes
+        self.indptr = indptr
+        self.indices = indices
+        self.flags = flags
+        self.weights = weights
+
+        self._index = index
+
+        self._sources = None
+        self._transpose = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Construct a CsrGraph from a networkx graph.
+
+        Parameters
+        ----------
+        graph : networkx.DiGraph
+            The graph to construct the view of. Edges without a weight
+            attribute are assigned a weight of 1.
+
+        Returns
+        -------
+        csr_graph : CsrGraph
+            An instance of CsrGraph.
+        """
+        nodes = graph.nodes()
+        index = {node: i for (i, node) in enumerate(nodes)}
+
+        count = graph.number_of_edges()
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        indices = np.empty(count, dtype=np.int32)
+        flags = np.zeros(count, dtype=np.uint8)
+        weights = np.ones(count, dtype=np.float64)
+
+        position = 0
+        for (i, node) in enumerate(nodes):
+            for (successor, attrs) in graph.succ[node].items():
+                indices[position] = index[successor]
+
+                flag = 0
+                for (name, value) in FLAGS:
+                    if name in attrs:
+                        flag |= value
+                flags[position] = flag
+
+                if 'weight' in attrs:
+                    weights[position] = attrs['weight']
+
+                position += 1
+            indptr[i + 1] = position
+
+        return cls(nodes, indptr, indices, flags, weights, index)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def index(self):
+        """Return the position of every node.
+
+        The dictionary is built on first access so that a view whose nodes
+        are decoded on demand, e.g. from a snapshot, does not decode all of
+        them until a node is looked up.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        index : dict
+            A dictionary keyed by Call with the position of the Call in nodes
+            as the value.
+        """
+        if self._index is None:
+            # A graph and its transpose share the index of their nodes
+            transpose = self._transpose
+            if transpose is not None and transpose._index is not None:
+                self._index = transpose._index
+            else:
+                self._index = {
+                    node: i for (i, node) in enumerate(self.nodes)
+                }
+                if transpose is not None:
+                    transpose._index = self._index
+        return self._index
+
+    @property
+    def sources(self):
+        """Return the source of each edge, aligned with indices.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        sources : numpy.ndarray
+            An array containing the source of each edge.
+        """
+        if self._sources is None:
+            self._sources = np.repeat(
+                np.arange(len(self.nodes), dtype=np.int32),
+                np.diff(self.indptr)
+            )
+        return self._sources
+
+    def transpose(self):
+        """Return a view of the graph with the direction of edges reversed.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        transpose : CsrGraph
+            An instance of CsrGraph in which the successors of a node are the
+            predecessors of the node in this graph.
+        """
+        if self._transpose is None:
+            order = np.argsort(self.indices, kind='mergesort')
+
+            indptr = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+            np.cumsum(
+                np.bincount(self.indices, minlength=len(self.nodes)),
+                out=indptr[1:]
+            )
+
+            self._transpose = CsrGraph(
+                self.nodes, indptr, self.sources[order], self.flags[order],
+                self.weights[order], self._index
+            )
+            self._transpose._transpose = self
+        return self._transpose
+
+    def get_mask(self, flag):
+        """Return a boolean mask of the edges that have a flag set.
+
+        Parameters
+        ----------
+        flag : int
+            One of CALL, RETURN, CFLOW, or GPROF, or a combination of them.
+
+        Returns
+        -------
+        mask : numpy.ndarray
+            An array of booleans aligned with indices.
+        """
+        return (self.flags & flag) != 0
+
+    def get_degrees(self, flag=None):
+        """Return the in-degree and the out-degree of every node.
+
+        Parameters
+        ----------
+        flag : int, optional
+            One of CALL, RETURN, CFLOW, or GPROF, or a combination of them.
+            When specified, only the edges that have the flag set are counted.
+
+        Returns
+        -------
+        degrees : 2-tuple
+            A 2-tuple, (in_degrees, out_degrees), of arrays indexed by node
+            position.
+        """
+        (sources, destinations) = (self.sources, self.indices)
+        if flag is not None:
+            mask = self.get_mask(flag)
+            (sources, destinations) = (sources[mask], destinations[mask])
+
+        return (
+            np.bincount(destinations, minlength=len(self.nodes)),
+            np.bincount(sources, minlength=len(self.nodes))
+        )
+
+    def get_successors(self, frontier):
+        """Return the successors of a set of nodes.
+
+        Parameters
+        ----------
+        frontier : numpy.ndarray
+            An array of node positions.
+
+        Returns
+        -------
+        successors : numpy.ndarray
+            An array of node positions, one per edge originating at a node in
+            frontier. A node may appear more than once.
+        """
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+
+        total = int(counts.sum())
+        if not total:
+            return np.empty(0, dtype=self.indices.dtype)
+
+        # Concatenation of the ranges [start, start + count) for each node
+        offsets = np.cumsum(counts) - counts
+        positions = (
+            np.repeat(starts - offsets, counts) + np.arange(total)
+        )
+        return self.indices[positions]
+
+    def get_distances(self, source):
+        """Return the length of the shortest path from source to every node.
+
+        The graph is traversed breadth-first, expanding a whole frontier of
+        nodes at a time.
+
+        Parameters
+        ----------
+        source : int
+            The position of the node to start the traversal from.
+
+        Returns
+        -------
+        distances : numpy.ndarray
+            An array of path lengths indexed by node position. Nodes that are
+            not reachable from source have a path length of UNREACHABLE.
+        """
+        distances = np.full(len(self.nodes), UNREACHABLE, dtype=np.int32)
+        distances[source] = 0
+
+        frontier = np.array([source], dtype=np.int64)
+        length = 0
+        while frontier.size:
+            length += 1
+
+            successors = self.get_successors(frontier)
+            successors = np.unique(
+                successors[distances[successors] == UNREACHABLE]
+            )
+            distances[successors] = length
+
+            frontier = successors
+
+        return distances
@@ -3,8 +3,7 @@ from statistics import StatisticsError
 
 import networkx as nx
 
-from django.template import Template, Context
-from django.conf import settings
+from attacksurfacemeter.formatters import renderer
 
 
 class BaseFormatter(object):
@@ -27,13 +26,7 @@ class BaseFormatter(object):
             os.path.dirname(os.path.realpath(__file__)), template_file
         )
 
-        if not settings.configured:
-            settings.configure()
-
-        template = None
-        with open(template_file, 'r') as file_:
-            template = file_.read()
-        return Template(template)
+        return renderer.get_template(template_file)
 
     @staticmethod
     def _get_signature(call):
@@ -49,21 +42,27 @@ class BaseFormatter(object):
         ]
         return calls
 
+    def _get_distances(self):
+        """Return the mean distance to dangerous, exit, and entry nodes.
+
+        The means for the three kinds of nodes are computed together and
+        cached by the call graph, so the summary and the full output share
+        a single analysis.
+        """
+        means = self.call_graph.get_mean_lengths(
+            ['dangerous', 'exit', 'entry']
+        )
+
+        return {
+            attribute: mean if mean is not None else 0
+            for (attribute, mean) in means.items()
+        }
+
     def write_summary(self):
         template = BaseFormatter._get_template(self.summary_template_file)
-        countnodes = 0
-        sumNodes = 0
-        meandanger = 0
-        if len(nx.get_node_attributes(self.call_graph.call_graph,'dangerous')) > 0:
-            for (c, attrs) in self.call_graph.nodes:
-                dangerdict = self.call_graph.get_shortest_path_length(c, 'dangerous')
-                if dangerdict is not None:
-                    for key, value in dangerdict.items():
-                        sumNodes += value
-                        countnodes += 1
-            meandanger = sumNodes / countnodes
-
-        context = Context({
+        distances = self._get_distances()
+
+        context = {
             'directory': self.call_graph.source,
             'nodes_count': len(self.call_graph.nodes),
             'edges_count': len(self.call_graph.edges),
@@ -73,57 +72,52 @@ class BaseFormatter(object):
                 len(nx.get_node_attributes(
                     self.call_graph.call_graph, 'dangerous'
                 )),
-            'distance_dangerous': meandanger,
+            'distance_dangerous': distances['dangerous'],
 
-        })
+        }
 
         return template.render(context)
 
     def write_output(self):
-        countnodes = 0
-        sumNodes = 0
-        for (c, attrs) in self.call_graph.nodes:
-            dangerdict = self.call_graph.get_shortest_path_length(c,'dangerous')
-            if dangerdict is not None:
-                for key, value in dangerdict.items():
-                    sumNodes += value
-                    countnodes += 1
-        meandanger = sumNodes/countnodes
-        countnodes = 0
-        sumNodes = 0
-        for (c, attrs) in self.call_graph.nodes:
-            exitdict = self.call_graph.get_shortest_path_length(c,'exit')
-            if exitdict is not None:
-                for key, value in exitdict.items():
-                    sumNodes += value
-                    countnodes += 1
-        meanexit = sumNodes/countnodes
-        countnodes = 0
-        sumNodes = 0
-        for (c, attrs) in self.call_graph.nodes:
-            enterdict = self.call_graph.get_shortest_path_length(c,'entry')
-            if enterdict is not None:
-                for key, value in enterdict.items():
-                    sumNodes += value
-                    countnodes += 1
-        meanenter = sumNodes / countnodes
+        return ''.join(self.stream_output())
+
+    def stream_output(self):
+        """Generate the verbose report a piece at a time.
+
+        The rows of the functions and calls sections, including the degree
+        of each function, are produced from the call graph as they are
+        rendered rather than collected in advance. The mean distances to
+        entry, exit, and dangerous nodes are aggregates over the whole call
+        graph and are computed before the first piece is produced, one
+        reverse search at a time, without building the distance tables (see
+        CallGraph.get_mean_lengths), so the memory used grows with the size
+        of the call graph only. The concatenation of the pieces is identical
+        to write_output.
+
+        Returns
+        -------
+        output : generator
+            A generator of strings, the pieces of the rendered report.
+        """
+        distances = self._get_distances()
         template = BaseFormatter._get_template(self.template_file)
-        context = Context({
+        graph = self.call_graph.call_graph
+        context = {
             'directory': self.call_graph.source,
-            'nodes_count': len(self.call_graph.nodes),
-            'nodes': [
+            'nodes_count': graph.number_of_nodes(),
+            'nodes': (
                 {
                     'function_name': c.function_name,
                     'function_signature': BaseFormatter._get_signature(c),
-                    'degree': self.call_graph.get_degree(c)
+                    'degree': (graph.in_degree(c), graph.out_degree(c))
                     #'walk':self.call_graph.get_page_rank(c)
-                } for (c, attrs) in self.call_graph.nodes
-            ],
-            'edges_count': len(self.call_graph.edges),
-            'edges': [
+                } for c in graph.nodes_iter()
+            ),
+            'edges_count': graph.number_of_edges(),
+            'edges': (
                 {'from': f.function_name, 'to': t.function_name}
-                for (f, t, attrs) in self.call_graph.edges
-            ],
+                for (f, t) in graph.edges_iter()
+            ),
             'entry_points_count': len(self.call_graph.entry_points),
             'entry_points': BaseFormatter._transform_calls(
                 self.call_graph.entry_points
@@ -140,12 +134,12 @@ class BaseFormatter(object):
                 nx.get_node_attributes(
                     self.call_graph.call_graph, 'dangerous'
                 ).keys(),
-            'distance_dangerous': meandanger,
-            'distance_entry': meanenter,
-            'distance_exit':meanexit,
-        })
+            'distance_dangerous': distances['dangerous'],
+            'distance_entry': distances['entry'],
+            'distance_exit': distances['exit'],
+        }
 
-        return template.render(context)
+        return template.stream(context)
 
     @property
     def template_file(self):
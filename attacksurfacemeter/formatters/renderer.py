@@ -0,0 +1,450 @@
+import re
+
+# Tags, variables, and comments in the syntax of Django templates
+TOKEN = re.compile(r'({%.*?%}|{{.*?}}|{#.*?#})')
+WORD = re.compile(r'"[^"]*"|\'[^\']*\'|\S+')
+NUMBER = re.compile(r'^-?\d+(\.\d+)?$')
+
+COMPARISONS = {
+    '==': lambda x, y: x == y,
+    '!=': lambda x, y: x != y,
+    '<': lambda x, y: x < y,
+    '>': lambda x, y: x > y,
+    '<=': lambda x, y: x <= y,
+    '>=': lambda x, y: x >= y,
+    'in': lambda x, y: x in y,
+    'not in': lambda x, y: x not in y,
+}
+
+FILTERS = {
+    'stringformat': lambda value, arg: _format(value, arg),
+}
+
+# Value of a variable that could not be resolved
+_MISSING = object()
+
+_templates = dict()
+
+
+class TemplateSyntaxError(Exception):
+
+    """Raised when a template uses syntax that the renderer does not
+    support."""
+
+
+class Template():
+
+    """Represents a report template compiled for repeated rendering.
+
+    The subset of the Django template language used by the report templates
+    is supported: variables with attribute lookups and the stringformat
+    filter, if/elif/else and for/empty blocks, and comments. Variables are
+    rendered the way Django renders them with autoescaping on, so the output
+    is identical to that of a Django template.
+
+    A template is compiled into a tree of closures, one per node, each of
+    which generates the rendered pieces of its node given a context.
+    """
+
+    def __init__(self, source):
+        """Template constructor.
+
+        Parameters
+        ----------
+        source : str
+            The text of the template.
+
+        Returns
+        -------
+        template : Template
+            An instance of Template.
+
+        Raises
+        ------
+        TemplateSyntaxError
+            If the template uses syntax that is not supported.
+        """
+        tokens = [token for token in TOKEN.split(source) if token]
+
+        (self._nodes, end) = _compile(tokens, 0, ())
+        if end is not None:
+            raise TemplateSyntaxError(
+                'Unexpected tag {0}.'.format(tokens[end])
+            )
+
+    def render(self, context):
+        """Return the template rendered with a context.
+
+        Parameters
+        ----------
+        context : dict
+            A dictionary keyed by variable name with the value of the
+            variable as the value.
+
+        Returns
+        -------
+        output : str
+            The rendered template.
+        """
+        return ''.join(self.stream(context))
+
+    def stream(self, context):
+        """Render the template a piece at a time.
+
+        Each iteration of a for loop is produced as a separate piece and the
+        sequence that is looped over is consumed lazily, so a template may be
+        rendered over a generator of any length in bounded memory.
+
+        Parameters
+        ----------
+        context : dict
+            A dictionary keyed by variable name with the value of the
+            variable as the value.
+
+        Returns
+        -------
+        output : generator
+            A generator of strings, the pieces of the rendered template.
+        """
+        context = dict(context)
+        for node in self._nodes:
+            yield from node(context)
+
+
+class DjangoTemplate():
+
+    """Adapts a Django template to the interface of Template.
+
+    Used for templates that use syntax that Template does not support when
+    Django is installed.
+    """
+
+    def __init__(self, source):
+        from django.conf import settings
+        from django.template import Template as _Template
+
+        if not settings.configured:
+            settings.configure()
+        self._template = _Template(source)
+
+    def render(self, context):
+        from django.template import Context
+
+        return self._template.render(Context(context))
+
+    def stream(self, context):
+        yield self.render(context)
+
+
+def get_template(path):
+    """Return a compiled template, compiling it on first use.
+
+    Parameters
+    ----------
+    path : str
+        The absolute path of the template file.
+
+    Returns
+    -------
+    template : Template or DjangoTemplate
+        The compiled template. A DjangoTemplate is returned only if the
+        template cannot be compiled by Template and Django is installed.
+    """
+    if path not in _templates:
+        with open(path, 'r') as file_:
+            source = file_.read()
+
+        try:
+            template = Template(source)
+        except TemplateSyntaxError as error:
+            try:
+                template = DjangoTemplate(source)
+            except ImportError:
+                raise error
+        _templates[path] = template
+    return _templates[path]
+
+
+def _compile(tokens, start, ends):
+    """Compile tokens into nodes up to a tag named in ends.
+
+    Returns the nodes and the position of the ending tag, or None if the
+    tokens were exhausted.
+    """
+    nodes = list()
+
+    position = start
+    while position < len(tokens):
+        token = tokens[position]
+        if token.startswith('{%'):
+            words = WORD.findall(token[2:-2])
+            if not words:
+                raise TemplateSyntaxError('Empty tag.')
+            if words[0] in ends:
+                return (nodes, position)
+
+            if words[0] == 'if':
+                (node, position) = _compile_if(tokens, position, words)
+            elif words[0] == 'for':
+                (node, position) = _compile_for(tokens, position, words)
+            else:
+                raise TemplateSyntaxError(
+                    'Unsupported tag {0}.'.format(token)
+                )
+            nodes.append(node)
+        elif token.startswith('{{'):
+            nodes.append(_compile_variable(token[2:-2]))
+        elif not token.startswith('{#'):
+            nodes.append(_text(token))
+        position += 1
+
+    return (nodes, None)
+
+
+def _compile_if(tokens, position, words):
+    branches = list()
+
+    condition = _compile_condition(words[1:])
+    while True:
+        (nodes, end) = _compile(
+            tokens, position + 1, ('elif', 'else', 'endif')
+        )
+        if end is None:
+            raise TemplateSyntaxError('Unclosed tag {0}.'.format(words[0]))
+        branches.append((condition, nodes))
+
+        ending = WORD.findall(tokens[end][2:-2])
+        position = end
+        if ending[0] == 'endif':
+            break
+        elif ending[0] == 'elif':
+            condition = _compile_condition(ending[1:])
+        else:
+            condition = lambda context: True
+
+    def node(context):
+        for (condition, nodes) in branches:
+            if _test(condition, context):
+                for _node in nodes:
+                    yield from _node(context)
+                break
+
+    return (node, position)
+
+
+def _compile_for(tokens, position, words):
+    if len(words) != 4 or words[2] != 'in' or ',' in words[1]:
+        raise TemplateSyntaxError('Unsupported tag {0}.'.format(words))
+    (name, sequence) = (words[1], _compile_lookup(words[3]))
+
+    (loop, end) = _compile(tokens, position + 1, ('empty', 'endfor'))
+    if end is None:
+        raise TemplateSyntaxError('Unclosed tag for.')
+
+    empty = list()
+    if WORD.findall(tokens[end][2:-2])[0] == 'empty':
+        (empty, end) = _compile(tokens, end + 1, ('endfor',))
+        if end is None:
+            raise TemplateSyntaxError('Unclosed tag for.')
+
+    def node(context):
+        values = sequence(context)
+
+        previous = context.get(name, _MISSING)
+        is_empty = True
+        if values is None or values is _MISSING:
+            values = ()
+        for item in values:
+            is_empty = False
+            context[name] = item
+            yield ''.join(
+                piece for _node in loop for piece in _node(context)
+            )
+        if previous is _MISSING:
+            context.pop(name, None)
+        else:
+            context[name] = previous
+
+        if is_empty:
+            for _node in empty:
+                yield from _node(context)
+
+    return (node, end)
+
+
+def _compile_variable(expression):
+    parts = [part.strip() for part in _split_filters(expression)]
+    value = _compile_operand(parts[0])
+
+    filters = list()
+    for part in parts[1:]:
+        (name, _, arg) = part.partition(':')
+        if name not in FILTERS:
+            raise TemplateSyntaxError('Unsupported filter {0}.'.format(name))
+        filters.append((FILTERS[name], _compile_operand(arg) if arg else None))
+
+    def node(context):
+        _value = value(context)
+        if _value is _MISSING:
+            _value = ''
+        for (function, arg) in filters:
+            _value = function(_value, arg(context) if arg else None)
+        yield _escape(_value)
+
+    return node
+
+
+def _compile_condition(words):
+    """Compile an if condition: or, and, not, and comparisons."""
+    (condition, position) = _compile_or(words, 0)
+    if position != len(words):
+        raise TemplateSyntaxError(
+            'Unsupported condition {0}.'.format(' '.join(words))
+        )
+    return condition
+
+
+def _compile_or(words, position):
+    (operands, position) = _compile_operator(
+        words, position, 'or', _compile_and
+    )
+    if len(operands) == 1:
+        return (operands[0], position)
+    return ((lambda c: any(_test(x, c) for x in operands)), position)
+
+
+def _compile_and(words, position):
+    (operands, position) = _compile_operator(
+        words, position, 'and', _compile_not
+    )
+    if len(operands) == 1:
+        return (operands[0], position)
+    return ((lambda c: all(_test(x, c) for x in operands)), position)
+
+
+def _compile_operator(words, position, operator, compile_operand):
+    """Compile operands separated by a boolean operator."""
+    (operand, position) = compile_operand(words, position)
+    operands = [operand]
+    while position < len(words) and words[position] == operator:
+        (operand, position) = compile_operand(words, position + 1)
+        operands.append(operand)
+    return (operands, position)
+
+
+def _compile_not(words, position):
+    if position < len(words) and words[position] == 'not':
+        (operand, position) = _compile_not(words, position + 1)
+        return ((lambda c: not _test(operand, c)), position)
+    return _compile_comparison(words, position)
+
+
+def _compile_comparison(words, position):
+    if position >= len(words):
+        raise TemplateSyntaxError('Incomplete condition.')
+    left = _compile_operand(words[position])
+    position += 1
+
+    operator = None
+    if position < len(words):
+        if words[position] in COMPARISONS:
+            operator = words[position]
+            position += 1
+        elif words[position:position + 2] == ['not', 'in']:
+            operator = 'not in'
+            position += 2
+    if operator is None:
+        return (left, position)
+
+    if position >= len(words):
+        raise TemplateSyntaxError('Incomplete condition.')
+    right = _compile_operand(words[position])
+    comparison = COMPARISONS[operator]
+
+    def condition(context):
+        (x, y) = (_value(left, context), _value(right, context))
+        try:
+            return comparison(x, y)
+        except Exception:
+            return False
+
+    return (condition, position + 1)
+
+
+def _compile_operand(word):
+    if word[:1] in ('"', "'") and word[-1:] == word[:1] and len(word) > 1:
+        literal = word[1:-1]
+        return lambda context: literal
+    if NUMBER.match(word):
+        literal = float(word) if '.' in word else int(word)
+        return lambda context: literal
+    return _compile_lookup(word)
+
+
+def _compile_lookup(word):
+    bits = word.split('.')
+    if bits[0] == 'forloop':
+        raise TemplateSyntaxError('Unsupported variable {0}.'.format(word))
+
+    def lookup(context):
+        current = context
+        for bit in bits:
+            try:
+                current = current[bit]
+            except (TypeError, AttributeError, KeyError, ValueError,
+                    IndexError):
+                try:
+                    current = getattr(current, bit)
+                except (TypeError, AttributeError):
+                    try:
+                        current = current[int(bit)]
+                    except (IndexError, ValueError, KeyError, TypeError):
+                        return _MISSING
+            if callable(current):
+                if getattr(current, 'do_not_call_in_templates', False):
+                    pass
+                elif getattr(current, 'alters_data', False):
+                    return _MISSING
+                else:
+                    try:
+                        current = current()
+                    except TypeError:
+                        return _MISSING
+        return current
+
+    return lookup
+
+
+def _split_filters(expression):
+    return re.split(r'\|(?=(?:[^"\']|"[^"]*"|\'[^\']*\')*$)', expression)
+
+
+def _text(text):
+    def node(context):
+        yield text
+    return node
+
+
+def _test(condition, context):
+    value = condition(context)
+    return value is not _MISSING and bool(value)
+
+
+def _value(operand, context):
+    value = operand(context)
+    return None if value is _MISSING else value
+
+
+def _format(value, arg):
+    try:
+        return ('%' + str(arg)) % value
+    except (ValueError, TypeError):
+        return ''
+
+
+def _escape(value):
+    return (
+        str(value).replace('&', '&amp;').replace('<', '&lt;')
+        .replace('>', '&gt;').replace('"', '&quot;').replace("'", '&#39;')
+    )
+
@@ -1,4 +1,12 @@
 class Granularity():
-    """Class to enumerate the available levels of call graph granularity"""
+    """Class to enumerate the available levels of call graph granularity
+
+    Call graphs are loaded at FILE or FUNC granularity. Call graphs at
+    DIRECTORY, CLASS, and PACKAGE granularity are contracted from call graphs
+    loaded at FUNC granularity. See CallGraph.contract.
+    """
     FILE = 'file'
     FUNC = 'function'
+    DIRECTORY = 'directory'
+    CLASS = 'class'
+    PACKAGE = 'package'
@@ -1,3 +1,5 @@
+import os
+
 from attacksurfacemeter.granularity import Granularity
 
 
@@ -37,6 +39,58 @@ class BaseLoader(object):
     def load_call_graph(self, granularity=Granularity.FILE):
         raise NotImplementedError()
 
+    def get_sources(self):
+        """Return the sources that the call graph is loaded from.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        sources : list
+            A list of absolute paths to files or directories.
+        """
+        return [self.source]
+
+    def get_source_files(self, directory):
+        """Return the files in a source directory that the call graph loaded
+        depends on.
+
+        Parameters
+        ----------
+        directory : str
+            The absolute path of a directory returned by get_sources.
+
+        Returns
+        -------
+        files : list
+            A sorted list of the paths of the files, relative to directory.
+        """
+        files = list()
+        for (dirpath, _, filenames) in os.walk(directory):
+            for filename in filenames:
+                files.append(
+                    os.path.relpath(os.path.join(dirpath, filename), directory)
+                )
+        return sorted(files)
+
+    def get_parameters(self):
+        """Return the parameters of the loader, other than its sources,
+        reverse flag, defenses, and vulnerabilities, that the call graph loaded
+        depends on.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        parameters : list
+            A list of str.
+        """
+        return list()
+
     @property
     def errors(self):
         return self._errors
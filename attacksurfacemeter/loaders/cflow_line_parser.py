@@ -4,6 +4,48 @@ import re
 
 from attacksurfacemeter.loaders.base_line_parser import BaseLineParser
 
+INDENT = '    '
+
+# The first function name in the line followed, optionally, by the file in
+#   which the function is defined
+PATTERN = re.compile(r'(\w+)\(\)(?:.*?at (.*?):\d+>)?')
+
+
+def parse(cflow_line):
+    """Parse a line from a cflow call graph.
+
+    The parse does not depend on or modify any shared state, so lines may be
+    parsed concurrently.
+
+    Parameters
+    ----------
+    cflow_line : str
+        A line of string from the cflow call graph.
+
+    Returns
+    -------
+    parsed : tuple
+        A three-tuple, (level, function_name, function_signature), where level
+        is the depth of indentation of the line and function_signature is an
+        empty string if the line does not name the file in which the function
+        is defined.
+
+    Raises
+    ------
+    ValueError
+        If the line does not contain a function name.
+    """
+    level = cflow_line.count(INDENT)
+    if level:
+        cflow_line = cflow_line[cflow_line.rindex(INDENT) + len(INDENT):]
+
+    match = PATTERN.search(cflow_line)
+    if match is None:
+        raise ValueError('Invalid cflow line: {0}'.format(cflow_line))
+    (function_name, function_signature) = match.groups('')
+
+    return (level, function_name, function_signature)
+
 
 class CflowLineParser(BaseLineParser):
     """"""
@@ -18,25 +60,16 @@ class CflowLineParser(BaseLineParser):
 
         return CflowLineParser._instance
 
-    indent = "    "
+    indent = INDENT
 
     def __init__(self):
         super(CflowLineParser, self).__init__()
         self._level = 0
 
     def load(self, cflow_line):
-        self.__init__()
-
-        split_line = cflow_line.split(CflowLineParser.indent)
-        function_info = split_line[-1].strip()
-        self._level = len(split_line) - 1
-
-        function_name = re.search(r"(\w+\(\))", function_info).group(0)
-        self._function_name = function_name[:function_name.index('(')]
-
-        match = re.search(r"at (.*?)(?::\d+>)", function_info)
-        if match:
-            self._function_signature = match.group(1)
+        (self._level, self._function_name, self._function_signature) = (
+            parse(cflow_line)
+        )
 
     def get_level(self, cflow_line=None):
         self._load_if_new(cflow_line)
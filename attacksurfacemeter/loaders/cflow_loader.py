@@ -1,28 +1,49 @@
+import heapq
+import multiprocessing
 import os
+import re
 import subprocess
-
-import networkx as nx
+import sys
+import time
 
 from attacksurfacemeter import utilities
 from attacksurfacemeter.call import Call
+from attacksurfacemeter.environments import Environments
 from attacksurfacemeter.granularity import Granularity
+from attacksurfacemeter.loaders import cflow_line_parser
+from attacksurfacemeter.loaders import compression
 from attacksurfacemeter.loaders.base_loader import BaseLoader
 from attacksurfacemeter.loaders.stack import Stack
+from attacksurfacemeter.versioned_graph import VersionedDiGraph
+
+# Minimum size, in bytes, of a chunk of a call graph parsed by a process
+CHUNK_SIZE = 1 << 24
+# Number of chunks of a call graph parsed by each process
+CHUNKS_PER_PROCESS = 4
+
+# Command, as a list of arguments, that executes cflow when generating a call
+#   graph in shards
+CFLOW = ['cflow']
+# Function from which cflow starts the call graph unless -r or -A is given
+MAIN = 'main'
+# Source files for which run_cflow.sh generates a call graph
+SOURCE_FILE = re.compile(r'\.[ch]$')
+EXCLUDED_PATH = re.compile(r'\b(tests|doc)\b')
 
 
 class CflowLoader(BaseLoader):
     """"""
     def __init__(self, source, reverse=False, defenses=None,
-                 vulnerabilities=None):
+                 vulnerabilities=None, processes=1, shards=1):
         """Constructor for CflowParser.
 
         Parameters
         ----------
         source : str
-            The absolute path to a text file containing the call graph
-            generated using cflow or the absolute path to a directory
-            containing the source files for which a call graph must be
-            generated using cflow.
+            The absolute path to a text file, which may be compressed using
+            gzip, bzip2, or xz, containing the call graph generated using
+            cflow or the absolute path to a directory containing the source
+            files for which a call graph must be generated using cflow.
         reverse : bool
             If true, the call graph is assumed to have been created using the
             cflow's -r option.
@@ -32,10 +53,22 @@ class CflowLoader(BaseLoader):
         vulnerabilities : list, optional
             A list of Call objects, each representing a vulnerable function in
             the system.
+        processes : int, optional
+            Number of processes to spawn when parsing a large call graph from
+            a text file or generating a call graph in shards.
+        shards : int, optional
+            Number of groups of source files, or shards, for which call
+            graphs are generated separately, and in parallel, when the call
+            graph of a directory is generated using cflow. See
+            CflowLoader.load_call_graph.
         """
         super(CflowLoader, self).__init__(
             source, reverse, defenses, vulnerabilities
         )
+        self._processes = processes
+        self._shards = shards
+        self._lines = 0
+        self._elapsed = 0.0
 
     def load_call_graph(self, granularity=Granularity.FUNC):
         """Load a call graph generated by cflow.
@@ -43,6 +76,21 @@ class CflowLoader(BaseLoader):
         If necessary, the static call graph generation utility (cflow) is
         invoked to generate the call graph before attempting to load it.
 
+        A call graph in a text file that is large enough is split into
+        chunks, each starting at a function at the top level of the call
+        graph, that are parsed in parallel. The call graph loaded is identical
+        to one parsed by a single process.
+
+        The call graph of a directory may be generated in shards, each a group
+        of source files for which a call graph of all global functions is
+        generated by a separate cflow process, in parallel. A function called
+        in one shard but defined in another has no signature in the call
+        graph of the former and is resolved, by name, to its definition when
+        the call graphs of the shards are merged into one. As cflow does for
+        all source files at once, the merged call graph is restricted to the
+        functions reachable from main, if any, unless it is reversed. A shard
+        for which cflow fails is reported in CflowLoader.errors.
+
         Parameters
         ----------
         granularity : str
@@ -54,61 +102,264 @@ class CflowLoader(BaseLoader):
         call_graph : networkx.DiGraph
             An object representing the call graph.
         """
-        call_graph = nx.DiGraph()
-        parent = Stack()
+        call_graph = VersionedDiGraph()
+        pool = dict()
+        resolver = utilities.NodeAttributeResolver(
+            'cflow', self.defenses, self.vulnerabilities
+        )
+
+        self._lines = 0
+        start = time.perf_counter()
+        try:
+            chunks = self._get_chunks()
+            shards = self._get_shards()
+            if len(shards) > 1:
+                calls = self._get_calls_in_shards(shards)
+            elif len(chunks) > 1:
+                calls = self._get_calls_in_parallel(chunks)
+            else:
+                calls = self._get_calls()
+
+            for (caller, callee) in calls:
+                (caller, _) = Call.from_pool(
+                    pool, caller[0], caller[1], Environments.C, granularity
+                )
+                (callee, _) = Call.from_pool(
+                    pool, callee[0], callee[1], Environments.C, granularity
+                )
+
+                attributes = resolver.get_node_attrs(caller, callee)
+                if attributes is None:
+                    continue
+                (caller_attrs, callee_attrs) = attributes
+
+                call_graph.add_node(caller, caller_attrs)
+
+                if callee_attrs is not None:
+                    call_graph.add_node(callee, callee_attrs)
+
+                    # Adding the edge caller --  callee
+                    attrs = {'cflow': None, 'call': None}
+                    call_graph.add_edge(caller, callee, attrs)
+
+                    # Adding the edge callee -- caller with the assumption
+                    #   that every call must return
+                    attrs = {'cflow': None, 'return': None}
+                    call_graph.add_edge(callee, caller, attrs)
+        finally:
+            self._elapsed = time.perf_counter() - start
+            if 'DEBUG' in os.environ:
+                self._print_status()
+
+        return call_graph
+
+    def get_parameters(self):
+        """Return the parameters of the loader that the call graph loaded
+        depends on.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        parameters : list
+            The number of shards if the call graph of a directory is
+            generated in shards, an empty list otherwise.
+        """
+        if len(self._get_shards()) > 1:
+            return [str(self._shards)]
+        return list()
+
+    def get_source_files(self, directory):
+        """Return the source files in a directory for which run_cflow.sh
+        generates a call graph.
+
+        Parameters
+        ----------
+        directory : str
+            The absolute path of the directory.
 
+        Returns
+        -------
+        files : list
+            A sorted list of the paths of the source files, relative to
+            directory and prefixed with ./ as cflow is given them.
+        """
+        files = list()
+        for (dirpath, _, filenames) in os.walk(directory):
+            for filename in filenames:
+                name = './' + os.path.relpath(
+                    os.path.join(dirpath, filename), directory
+                )
+                if SOURCE_FILE.search(name) and not EXCLUDED_PATH.search(name):
+                    files.append(name)
+        return sorted(files)
+
+    @property
+    def lines_per_second(self):
+        """Return the rate at which lines were parsed in the last load.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        lines_per_second : float
+            The number of lines of the cflow call graph parsed per second, or
+            0.0 if no call graph has been loaded.
+        """
+        if self._elapsed == 0:
+            return 0.0
+        return self._lines / self._elapsed
+
+    def _get_calls(self):
         raw_call_graph = None
         if os.path.isfile(self.source):
-            raw_call_graph = open(self.source)
+            raw_call_graph = compression.open(self.source)
         elif os.path.isdir(self.source):
             raw_call_graph = self._exec_cflow()
 
+        tree = _CallTree(self.is_reverse)
         try:
-            previous = Call.from_cflow(raw_call_graph.readline(), granularity)
-            for line in raw_call_graph:
-                current = Call.from_cflow(line, granularity)
-
-                if current.level > previous.level:
-                    parent.push(previous)
-                elif current.level < previous.level:
-                    for t in range(previous.level - current.level):
-                        parent.pop()
-
-                if parent.top:
-                    caller = callee = None
-                    entry = exit = dangerous = defense = False
-                    if self.is_reverse:
-                        caller = current
-                        callee = parent.top
-                    else:
-                        caller = parent.top
-                        callee = current
-
-                    (caller_attrs, callee_attrs) = utilities.get_node_attrs(
-                        'cflow', caller, callee, self.defenses,
-                        self.vulnerabilities
+            yield from tree.get_calls(raw_call_graph)
+        finally:
+            if raw_call_graph:
+                raw_call_graph.close()
+            self._lines = tree.lines
+
+    def _get_calls_in_parallel(self, chunks):
+        with multiprocessing.Pool(self._processes) as pool:
+            for (calls, lines) in pool.imap(_parse_chunk, chunks):
+                yield from calls
+                self._lines += lines
+
+    def _get_calls_in_shards(self, shards):
+        calls = dict()
+        with multiprocessing.Pool(min(self._processes, len(shards))) as pool:
+            results = pool.imap(_generate_shard, shards)
+            for ((_, _, files, _), result) in zip(shards, results):
+                (_calls, lines, status) = result
+                if status != 0:
+                    self._errors.append(
+                        'Error: cflow exited with status {0} for the shard of'
+                        ' {1}\n'.format(status, ' '.join(files))
                     )
+                for call in _calls:
+                    calls[call] = None
+                self._lines += lines
 
-                    call_graph.add_node(caller, caller_attrs)
+        # Resolving functions called from one shard and defined in another
+        signatures = dict()
+        for call in calls:
+            for (name, signature) in call:
+                if signature:
+                    signatures.setdefault(name, set()).add(signature)
 
-                    if callee_attrs is not None:
-                        call_graph.add_node(callee, callee_attrs)
+        def resolve(function):
+            (name, signature) = function
+            if not signature and len(signatures.get(name, ())) == 1:
+                return (name, next(iter(signatures[name])))
+            return function
 
-                        # Adding the edge caller --  callee
-                        attrs = {'cflow': None, 'call': None}
-                        call_graph.add_edge(caller, callee, attrs)
+        resolved = dict()
+        for (caller, callee) in calls:
+            resolved[(resolve(caller), resolve(callee))] = None
 
-                        # Adding the edge callee -- caller with the assumption
-                        #   that every call must return
-                        attrs = {'cflow': None, 'return': None}
-                        call_graph.add_edge(callee, caller, attrs)
+        if self.is_reverse:
+            return list(resolved)
+        return _get_reachable(list(resolved), MAIN)
 
-                previous = current
-        finally:
-            if raw_call_graph:
-                raw_call_graph.close()
+    def _get_shards(self):
+        """Return the shards of the source files in the directory.
 
-        return call_graph
+        A shard is a group of source files for which a call graph is
+        generated separately. The source files are those for which
+        run_cflow.sh would generate a call graph, grouped so that the groups
+        are of about equal size.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        shards : list
+            A list of tuples (command, source, files, is_reverse), each
+            identifying a shard, where command is the list of arguments that
+            executes cflow in source, the directory, and files is the list of
+            source files relative to it. The list has fewer than two shards
+            if the call graph must not be generated in shards.
+        """
+        if (self._shards < 2 or self._processes < 2 or
+                not os.path.isdir(self.source)):
+            return list()
+
+        files = [
+            (name, os.path.getsize(os.path.join(self.source, name)))
+            for name in self.get_source_files(self.source)
+        ]
+
+        # Assigning the largest file to the smallest shard first
+        shards = [(0, index, list()) for index in range(self._shards)]
+        for (path, size) in sorted(files, key=lambda f: (-f[1], f[0])):
+            (total, index, paths) = heapq.heappop(shards)
+            paths.append(path)
+            heapq.heappush(shards, (total + size, index, paths))
+
+        command = CFLOW + ['-b', '-A']
+        if self.is_reverse:
+            command.append('-r')
+
+        return [
+            (command, self.source, sorted(paths), self.is_reverse)
+            for (_, _, paths) in sorted(shards, key=lambda s: s[1]) if paths
+        ]
+
+    def _get_chunks(self):
+        """Return the byte ranges of the chunks of the call graph.
+
+        The call graph is split at the first function at the top level of the
+        call graph following each of a number of equally spaced offsets.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        chunks : list
+            A list of tuples (source, start, end, is_reverse), each identifying
+            a chunk. The list has fewer than two chunks if the call graph must
+            be parsed by a single process, e.g. if it is compressed.
+        """
+        if (self._processes < 2 or not os.path.isfile(self.source) or
+                compression.is_compressed(self.source)):
+            return list()
+
+        size = os.path.getsize(self.source)
+        count = min(self._processes * CHUNKS_PER_PROCESS, size // CHUNK_SIZE)
+
+        boundaries = [0]
+        with open(self.source, 'rb') as raw_call_graph:
+            for index in range(1, count):
+                raw_call_graph.seek(max(size * index // count, boundaries[-1]))
+                raw_call_graph.readline()
+
+                position = raw_call_graph.tell()
+                for line in raw_call_graph:
+                    if _INDENT not in line:
+                        break
+                    position += len(line)
+                if boundaries[-1] < position < size:
+                    boundaries.append(position)
+        boundaries.append(size)
+
+        return [
+            (self.source, start, end, self.is_reverse)
+            for (start, end) in zip(boundaries[:-1], boundaries[1:])
+        ]
 
     def _exec_cflow(self):
         """Execute cflow as a subprocess and return its output.
@@ -135,3 +386,171 @@ class CflowLoader(BaseLoader):
         )
 
         return proc.stdout
+
+    def _print_status(self):
+        sys.stdout.write(
+            'Parsed {0:d} lines in {1:.3f}s ({2:.0f} lines/s)\n'.format(
+                self._lines, self._elapsed, self.lines_per_second
+            )
+        )
+        sys.stdout.flush()
+
+
+# cflow_line_parser.INDENT as bytes
+_INDENT = cflow_line_parser.INDENT.encode()
+
+
+class _CallTree():
+
+    """Represents the tree of calls in a call graph generated by cflow."""
+
+    def __init__(self, is_reverse):
+        self.is_reverse = is_reverse
+        self.lines = 0
+
+    def get_calls(self, lines):
+        """Return the calls in the tree.
+
+        Parameters
+        ----------
+        lines : iterable
+            The lines of the tree, the first of which is at the top level.
+
+        Returns
+        -------
+        calls : generator
+            A generator of tuples (caller, callee), each of which is a tuple
+            (function_name, function_signature).
+        """
+        lines = iter(lines)
+        parent = Stack()
+
+        line = next(lines, None)
+        if line is None:
+            return
+        parsed = cflow_line_parser.parse(line)
+        (previous_level, previous) = (parsed[0], parsed[1:])
+        self.lines += 1
+        for line in lines:
+            self.lines += 1
+            parsed = cflow_line_parser.parse(line)
+            (current_level, current) = (parsed[0], parsed[1:])
+
+            if current_level > previous_level:
+                parent.push(previous)
+            elif current_level < previous_level:
+                for t in range(previous_level - current_level):
+                    parent.pop()
+
+            if parent.top:
+                if self.is_reverse:
+                    yield (current, parent.top)
+                else:
+                    yield (parent.top, current)
+
+            (previous_level, previous) = (current_level, current)
+
+
+def _parse_chunk(chunk):
+    """Return the distinct calls in a chunk of a call graph.
+
+    Parameters
+    ----------
+    chunk : tuple
+        A tuple (source, start, end, is_reverse). See CflowLoader._get_chunks.
+
+    Returns
+    -------
+    (calls, lines) : tuple
+        The list of distinct calls in the order of their first occurrence in
+        the chunk and the number of lines in the chunk.
+    """
+    (source, start, end, is_reverse) = chunk
+
+    def get_lines(raw_call_graph):
+        position = start
+        raw_call_graph.seek(start)
+        for line in raw_call_graph:
+            if position >= end:
+                break
+            position += len(line)
+            yield line.decode(errors='replace')
+
+    tree = _CallTree(is_reverse)
+    calls = dict()
+    with open(source, 'rb') as raw_call_graph:
+        for call in tree.get_calls(get_lines(raw_call_graph)):
+            calls[call] = None
+
+    return (list(calls), tree.lines)
+
+
+def _generate_shard(shard):
+    """Return the distinct calls in the call graph of a shard.
+
+    Parameters
+    ----------
+    shard : tuple
+        A tuple (command, source, files, is_reverse). See
+        CflowLoader._get_shards.
+
+    Returns
+    -------
+    (calls, lines, status) : tuple
+        The list of distinct calls in the order of their first occurrence in
+        the call graph of the shard, the number of lines in it, and the exit
+        status of cflow.
+    """
+    (command, source, files, is_reverse) = shard
+
+    proc = subprocess.Popen(
+        command + files,
+        cwd=source,
+        stdout=subprocess.PIPE,
+        universal_newlines=True
+    )
+
+    tree = _CallTree(is_reverse)
+    calls = dict()
+    with proc.stdout:
+        for call in tree.get_calls(proc.stdout):
+            calls[call] = None
+    status = proc.wait()
+
+    return (list(calls), tree.lines, status)
+
+
+def _get_reachable(calls, name):
+    """Return the calls made by functions reachable from functions named
+    name.
+
+    Parameters
+    ----------
+    calls : list
+        A list of tuples (caller, callee), each of which is a tuple
+        (function_name, function_signature).
+    name : str
+        The name of the functions from which reachability is determined.
+
+    Returns
+    -------
+    calls : list
+        The calls, in order, whose caller is reachable from a function named
+        name, or all calls if no caller is named name.
+    """
+    callees = dict()
+    for (caller, callee) in calls:
+        callees.setdefault(caller, list()).append(callee)
+
+    reached = set(caller for caller in callees if caller[0] == name)
+    if not reached:
+        return calls
+
+    stack = list(reached)
+    while stack:
+        for callee in callees.get(stack.pop(), ()):
+            if callee not in reached:
+                reached.add(callee)
+                stack.append(callee)
+
+    return [call for call in calls if call[0] in reached]
@@ -0,0 +1,78 @@
+import builtins
+import bz2
+import gzip
+import io
+import lzma
+
+# Magic numbers at the start of a compressed file with the class that reads
+#   a file of each format
+FORMATS = (
+    (b'\x1f\x8b', gzip.GzipFile),
+    (b'BZh', bz2.BZ2File),
+    (b'\xfd7zXZ\x00', lzma.LZMAFile),
+)
+
+# Size, in bytes, of the buffer of decompressed data read from a compressed
+#   file at a time
+BUFFER_SIZE = 1 << 20
+
+
+def is_compressed(path):
+    """Return True if a file is compressed using gzip, bzip2, or xz.
+
+    The format of the file is detected from its first bytes rather than its
+    extension.
+
+    Parameters
+    ----------
+    path : str
+        The absolute path of the file.
+
+    Returns
+    -------
+    is_compressed : bool
+        True if the file is compressed, False otherwise.
+    """
+    return _get_format(path) is not None
+
+
+def open(path, mode='r'):
+    """Open a file, which may be compressed, for reading.
+
+    A compressed file is decompressed as it is read. Decompressed data is
+    read in large blocks so that lines are read from a compressed file at
+    close to the rate that they are read from a plain file.
+
+    Parameters
+    ----------
+    path : str
+        The absolute path of the file.
+    mode : str, optional
+        'r' to read the file as text or 'rb' to read it as bytes.
+
+    Returns
+    -------
+    file_ : file
+        A file object reading the decompressed content of the file.
+    """
+    if mode not in ('r', 'rb'):
+        raise ValueError('Unsupported mode {0}.'.format(mode))
+
+    format_ = _get_format(path)
+    if format_ is None:
+        return builtins.open(path, mode)
+
+    file_ = io.BufferedReader(format_(path, 'rb'), BUFFER_SIZE)
+    if mode == 'r':
+        file_ = io.TextIOWrapper(file_)
+    return file_
+
+
+def _get_format(path):
+    with builtins.open(path, 'rb') as file_:
+        magic = file_.read(max(len(magic) for (magic, _) in FORMATS))
+
+    for (_magic, format_) in FORMATS:
+        if magic.startswith(_magic):
+            return format_
+    return None
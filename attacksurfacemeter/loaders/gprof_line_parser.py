@@ -4,6 +4,49 @@ from attacksurfacemeter.loaders.base_line_parser import BaseLineParser
 
 # Regular expression to parse the name field from gprof call graph
 RE_NAME = re.compile('^(\w+)(?:(?:\(?.*\)?\s\()([\w\.\-\/]+\.\w+))?')
+# RE_NAME for a line as bytes, matched from the column at which the name
+#   field begins
+RE_NAME_BYTES = re.compile(
+    rb'\s*(\w+)(?:(?:\(?.*\)?\s\()([\w\.\-\/]+\.\w+))?'
+)
+
+
+def parse_bytes(gprof_line):
+    """Parse a line, as bytes, from a gprof call graph.
+
+    Only the name field of the line is decoded.
+
+    Parameters
+    ----------
+    gprof_line : bytes
+        A line from the gprof call graph.
+
+    Returns
+    -------
+    parsed : tuple
+        A two-tuple, (function_name, function_signature), where
+        function_signature is an empty string if the line does not name the
+        file in which the function is defined.
+
+    Raises
+    ------
+    ValueError
+        If the name field of the line cannot be parsed.
+    """
+    # See GprofLineParser.load for the columns at which the name field begins
+    match = RE_NAME_BYTES.match(
+        gprof_line, 45 if gprof_line.startswith(b'[') else 49
+    )
+
+    if match is None:
+        raise ValueError(
+            'Unable to parse gprof line - "{0}"'.format(
+                gprof_line.decode(errors='replace')
+            )
+        )
+    (function_name, function_signature) = match.groups(default=b'')
+
+    return (function_name.decode(), function_signature.decode())
 
 
 class GprofLineParser(BaseLineParser):
@@ -1,15 +1,21 @@
+import mmap
 import os
 
-import networkx as nx
-
 from attacksurfacemeter import utilities
 from attacksurfacemeter.call import Call
+from attacksurfacemeter.environments import Environments
 from attacksurfacemeter.granularity import Granularity
+from attacksurfacemeter.loaders import compression
+from attacksurfacemeter.loaders import gprof_line_parser
 from attacksurfacemeter.loaders.base_loader import BaseLoader
+from attacksurfacemeter.versioned_graph import VersionedDiGraph
+
+HEADER = b"index % time    self  children    called     name\n"
+SEPARATOR = b"-----------------------------------------------\n"
+EOF = b"\x0c\n"
 
-HEADER = "index % time    self  children    called     name\n"
-SEPARATOR = "-----------------------------------------------\n"
-EOF = "\x0c\n"
+# HEADER with a CRLF line ending
+_CRLF_HEADER = HEADER[:-1] + b"\r\n"
 
 
 class GprofLoader(BaseLoader):
@@ -22,8 +28,9 @@ class GprofLoader(BaseLoader):
         Parameters
         ----------
         source : str
-            The absolute path to a text file containing the call graph
-            generated using gprof.
+            The absolute path to a text file, which may be compressed using
+            gzip, bzip2, or xz, containing the call graph generated using
+            gprof.
         reverse : bool, optional
             Parameter irrelevant.
         defenses : list, optional
@@ -51,9 +58,12 @@ class GprofLoader(BaseLoader):
         call_graph : networkx.DiGraph
             An object representing the call graph.
         """
-        call_graph = nx.DiGraph()
-
-        header_passed = False
+        call_graph = VersionedDiGraph()
+        pool = dict()
+        calls = dict()
+        resolver = utilities.NodeAttributeResolver(
+            'gprof', self.defenses, self.vulnerabilities
+        )
 
         function = None
 
@@ -70,25 +80,23 @@ class GprofLoader(BaseLoader):
         #   SEPARATOR
         #   ...
         #   EOF
-        with open(self.source) as raw_call_graph:
-            # Fast-forwarding the file pointer to the line after the header
-            for line in raw_call_graph:
-                if line == HEADER:
-                    break
+        if compression.is_compressed(self.source):
+            get_lines = _get_stream_lines
+        else:
+            get_lines = _get_lines
 
-            for line in raw_call_graph:
-                if line.startswith('['):
+        with compression.open(self.source, 'rb') as raw_call_graph:
+            for line in get_lines(raw_call_graph):
+                if line.startswith(b'['):
                     # gprof function line
-                    function = Call.from_gprof(line, granularity)
+                    function = _get_call(line, granularity, pool, calls)
                     is_caller = False
                 elif line == SEPARATOR:
                     for caller in callers:
-                        (caller_attrs, callee_attrs) = (
-                            utilities.get_node_attrs(
-                                'gprof', caller, function, self.defenses,
-                                self.vulnerabilities
-                            )
-                        )
+                        attributes = resolver.get_node_attrs(caller, function)
+                        if attributes is None:
+                            continue
+                        (caller_attrs, callee_attrs) = attributes
 
                         call_graph.add_node(caller, caller_attrs)
 
@@ -104,19 +112,16 @@ class GprofLoader(BaseLoader):
                             attrs = {'gprof': None, 'return': None}
                             call_graph.add_edge(function, caller, attrs)
 
-                    (function_attrs, _) = utilities.get_node_attrs(
-                        'gprof', function, None, self.defenses,
-                        self.vulnerabilities
-                    )
-                    call_graph.add_node(function, function_attrs)
+                    attributes = resolver.get_node_attrs(function, None)
+                    if attributes is not None:
+                        (function_attrs, _) = attributes
+                        call_graph.add_node(function, function_attrs)
 
                     for callee in callees:
-                        (caller_attrs, callee_attrs) = (
-                            utilities.get_node_attrs(
-                                'gprof', function, callee, self.defenses,
-                                self.vulnerabilities
-                            )
-                        )
+                        attributes = resolver.get_node_attrs(function, callee)
+                        if attributes is None:
+                            continue
+                        (caller_attrs, callee_attrs) = attributes
 
                         call_graph.add_node(function, caller_attrs)
 
@@ -141,13 +146,167 @@ class GprofLoader(BaseLoader):
                     try:
                         if is_caller:
                             # gprof caller line
-                            callers.append(Call.from_gprof(line, granularity))
+                            callers.append(
+                                _get_call(line, granularity, pool, calls)
+                            )
                         else:
                             # gprof callee line
-                            callees.append(Call.from_gprof(line, granularity))
+                            callees.append(
+                                _get_call(line, granularity, pool, calls)
+                            )
                     except ValueError as e:
                         self._errors.append(
-                            "Error: " + str(e) + " Input line: " + line
+                            "Error: " + str(e) + " Input line: " +
+                            line.decode(errors='replace')
                         )
 
         return call_graph
+
+
+def _get_lines(raw_call_graph):
+    """Return the lines of the call graph in a gprof output file.
+
+    The file is mapped into memory and the lines following the header of
+    the call graph are produced as bytes, each terminated by a line feed
+    even if the file has CRLF line endings.
+
+    Parameters
+    ----------
+    raw_call_graph : file
+        The gprof output file opened in binary mode.
+
+    Returns
+    -------
+    lines : generator
+        A generator of lines of the call graph.
+    """
+    if os.fstat(raw_call_graph.fileno()).st_size == 0:
+        return
+
+    buffer = mmap.mmap(raw_call_graph.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        # The header is the first line that matches HEADER in its entirety,
+        #   with either line terminator
+        headers = [
+            (start, header) for (start, header) in (
+                (_find_line(buffer, header), header)
+                for header in (HEADER, _CRLF_HEADER)
+            )
+            if start != -1
+        ]
+        if not headers:
+            return
+
+        (start, header) = min(headers)
+        buffer.seek(start + len(header))
+        lines = iter(buffer.readline, b'')
+        if header == _CRLF_HEADER:
+            lines = _strip_cr(lines)
+        yield from lines
+    finally:
+        buffer.close()
+
+
+def _get_stream_lines(raw_call_graph):
+    """Return the lines of the call graph in a gprof output file that cannot
+    be mapped into memory, e.g. a compressed file.
+
+    Parameters
+    ----------
+    raw_call_graph : file
+        The gprof output file opened in binary mode.
+
+    Returns
+    -------
+    lines : generator
+        A generator of lines of the call graph. See _get_lines.
+    """
+    for line in raw_call_graph:
+        if line == HEADER:
+            yield from raw_call_graph
+            return
+        elif line == _CRLF_HEADER:
+            yield from _strip_cr(raw_call_graph)
+            return
+
+
+def _find_line(buffer, line):
+    """Return the offset of the first line in a buffer that matches a line in
+    its entirety.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap
+        The buffer to search.
+    line : bytes
+        The line, with its line terminator, to search for.
+
+    Returns
+    -------
+    start : int
+        The offset of the line in the buffer, or -1 if it is not found.
+    """
+    start = buffer.find(line)
+    while start > 0 and buffer[start - 1] != ord('\n'):
+        start = buffer.find(line, start + 1)
+    return start
+
+
+def _strip_cr(lines):
+    """Return lines with CRLF line endings terminated by a line feed only.
+
+    Parameters
+    ----------
+    lines : iterable
+        The lines, as bytes.
+
+    Returns
+    -------
+    lines : generator
+        A generator of the lines, each with a trailing carriage return
+        removed.
+    """
+    for line in lines:
+        if line.endswith(b'\r\n'):
+            line = line[:-2] + b'\n'
+        yield line
+
+
+def _get_call(gprof_line, granularity, pool, calls):
+    """Return the Call named in a line from a gprof call graph.
+
+    Parameters
+    ----------
+    gprof_line : bytes
+        A line from the gprof call graph.
+    granularity : str
+        The granularity of the call graph being loaded.
+    pool : dict
+        The pool of instances of Call. See Call.from_pool.
+    calls : dict
+        The instances of Call keyed by the name field of the lines they were
+        parsed from. The field of a function is repeated in every entry in
+        which the function appears, so the field is parsed only once.
+
+    Returns
+    -------
+    call : Call
+        The instance of Call in the pool.
+
+    Raises
+    ------
+    ValueError
+        If the name field of the line cannot be parsed.
+    """
+    field = gprof_line[45 if gprof_line.startswith(b'[') else 49:]
+    call = calls.get(field)
+    if call is None:
+        (function_name, function_signature) = gprof_line_parser.parse_bytes(
+            gprof_line
+        )
+        (call, _) = Call.from_pool(
+            pool, function_name, function_signature, Environments.C,
+            granularity
+        )
+        calls[field] = call
+    return call
@@ -3,6 +3,49 @@ __author__ = 'kevin'
 from attacksurfacemeter.loaders.base_line_parser import BaseLineParser
 
 
+def parse(javacg_line):
+    """Parse a caller or a callee from a java-callgraph call graph.
+
+    The parse does not depend on or modify any shared state, so it may be
+    used by loaders that parse lines concurrently.
+
+    Parameters
+    ----------
+    javacg_line : str
+        A caller, prefixed with "M:", or a callee, prefixed with the type of
+        the call in parentheses, from a line of the java-callgraph call graph.
+
+    Returns
+    -------
+    parsed : tuple
+        A four-tuple, (function_name, function_signature, class_name,
+        package_name).
+
+    Raises
+    ------
+    ValueError
+        If the caller or callee does not separate the class from the function
+        with a colon.
+    """
+    if javacg_line.startswith("M:"):
+        javacg_line = javacg_line[2:].strip()  # Remove the trailing "M:"
+    else:  # if javacg_line.startswith("(M)") or "(I)" or "(O)" or "(S)"
+        javacg_line = javacg_line[3:].strip()  # Remove the trailing "(*)"
+
+    index = javacg_line.index(":")
+    (function_signature, function_name) = (
+        javacg_line[:index], javacg_line[index + 1:]
+    )
+
+    class_name = function_signature
+    if "." in class_name:
+        package_name = class_name[:class_name.rindex(".")]
+    else:
+        package_name = class_name
+
+    return (function_name, function_signature, class_name, package_name)
+
+
 class JavaCGLineParser(BaseLineParser):
     """"""
     _instance = None
@@ -25,20 +68,10 @@ class JavaCGLineParser(BaseLineParser):
     def load(self, javacg_line):
         self.__init__()
 
-        if javacg_line.startswith("M:"):
-            javacg_line = javacg_line[2:].strip()  # Remove the trailing "M:"
-        else: # if javacg_line.startswith("(M)") or "(I)" or "(O)" or "(S)"
-            javacg_line = javacg_line[3:].strip()  # Remove the trailing "(*)"
-
-        self._function_name = javacg_line[javacg_line.index(":") + 1:]
-        self._function_signature = javacg_line[:javacg_line.index(":")]
-
-        self._class_name = self._function_signature
-
-        if "." in self._class_name:
-            self._package_name = ".".join(self._class_name.split(".")[:-1])
-        else:
-            self._package_name = self._class_name
+        (
+            self._function_name, self._function_signature, self._class_name,
+            self._package_name
+        ) = parse(javacg_line)
 
     def get_class(self):
         return self._class_name
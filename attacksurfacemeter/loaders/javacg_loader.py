@@ -1,8 +1,12 @@
-import networkx as nx
+import re
 
 from attacksurfacemeter.call import Call
+from attacksurfacemeter.environments import Environments
 from attacksurfacemeter.granularity import Granularity
+from attacksurfacemeter.loaders import compression
+from attacksurfacemeter.loaders import javacg_line_parser
 from attacksurfacemeter.loaders.base_loader import BaseLoader
+from attacksurfacemeter.versioned_graph import VersionedDiGraph
 
 
 class JavaCGLoader(BaseLoader):
@@ -13,38 +17,149 @@ class JavaCGLoader(BaseLoader):
         self.app_packages = app_packages
 
     def load_call_graph(self, granularity=Granularity.FUNC):
-        """
-            Description.
+        """Load a call graph generated by java-callgraph.
+
+        The call graph, which may be compressed using gzip, bzip2, or xz, is
+        streamed a line at a time and each distinct caller and callee is
+        parsed only once. If application packages were
+        specified, only the calls whose caller or callee is in a class that
+        starts with one of the packages are loaded.
 
-            Comments.
+        Parameters
+        ----------
+        granularity : str
+            The granularity at which the call graph must be loaded. See
+            attacksurfacemeter.granularity.Granularity for available choices.
 
-            Returns:
-                A call graph.
+        Returns
+        -------
+        call_graph : networkx.DiGraph
+            An object representing the call graph.
         """
-        call_graph = nx.DiGraph()
+        call_graph = VersionedDiGraph()
+        pool = dict()
+        calls = dict()
 
+        packages = None
         if self.app_packages:
-            def condition_to_add(line):
-                return (
-                    line.startswith("M:") and
-                    self._contains_call_in_package(line)
-                )
-        else:
-            def condition_to_add(line): return line.startswith("M:")
-
-        with open(self.source) as raw_call_graph:
+            packages = _compile_prefixes(self.app_packages)
+
+        with compression.open(self.source) as raw_call_graph:
             # line is like this:
             # M:com.example.kevin.helloandroid.Greeter:sayHelloInSpanish (M)jav
             # a.lang.StringBuilder:toString.
             for line in raw_call_graph:
-                if condition_to_add(line):
-                    caller, callee = line.split(" ")
-                    call_graph.add_edge(
-                        Call.from_javacg(caller, granularity),
-                        Call.from_javacg(callee, granularity)
-                    )
+                if not line.startswith("M:"):
+                    continue
+
+                caller, callee = line.split()
+                if packages is not None and not (
+                    packages.match(caller, 2) or packages.match(callee, 3)
+                ):
+                    continue
+
+                caller = _get_call(caller, 2, granularity, pool, calls)
+                callee = _get_call(callee, 3, granularity, pool, calls)
+                if not call_graph.has_edge(caller, callee):
+                    call_graph.add_edge(caller, callee)
 
         return call_graph
 
-    def _contains_call_in_package(self, line):
-            return any([(p in line) for p in self.app_packages])
+    def get_parameters(self):
+        """Return the parameters of the loader that the call graph loaded
+        depends on.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        parameters : list
+            The application packages, sorted, or an empty list if none were
+            specified.
+        """
+        return sorted(self.app_packages or [])
+
+
+def _compile_prefixes(prefixes):
+    """Return a regular expression that matches a string starting with any
+    of a list of prefixes.
+
+    The prefixes are arranged in a trie that is translated into nested
+    alternations, one per branch of the trie, so matching a string is
+    bounded by the length of the longest prefix times the branching of the
+    trie rather than by the number of prefixes.
+
+    Parameters
+    ----------
+    prefixes : list
+        The prefixes to match.
+
+    Returns
+    -------
+    pattern : re.RegexObject
+        The compiled regular expression.
+    """
+    trie = dict()
+    for prefix in prefixes:
+        node = trie
+        for character in prefix:
+            node = node.setdefault(character, dict())
+        node[None] = None
+
+    def get_expression(node):
+        # A string matching a prefix that ends at the node also matches every
+        #   longer prefix that starts with it, so the branch can be pruned
+        if None in node:
+            return ''
+
+        alternatives = [
+            re.escape(character) + get_expression(child)
+            for (character, child) in sorted(node.items())
+        ]
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:{0})'.format('|'.join(alternatives))
+
+    return re.compile(get_expression(trie))
+
+
+def _get_call(javacg_call, start, granularity, pool, calls):
+    """Return the Call named by a caller or callee in a javacg call graph.
+
+    Parameters
+    ----------
+    javacg_call : str
+        A caller or a callee from a line of the javacg call graph.
+    start : int
+        The length of the prefix of javacg_call that precedes the class of
+        the function, i.e. 2 for a caller and 3 for a callee.
+    granularity : str
+        The granularity of the call graph being loaded.
+    pool : dict
+        The pool of instances of Call. See Call.from_pool.
+    calls : dict
+        The instances of Call keyed by the class and function that they were
+        parsed from, so that each function is parsed only once.
+
+    Returns
+    -------
+    call : Call
+        The instance of Call in the pool.
+    """
+    key = javacg_call[start:]
+    call = calls.get(key)
+    if call is None:
+        (function_name, function_signature, class_name, package_name) = (
+            javacg_line_parser.parse(javacg_call)
+        )
+        (call, is_new) = Call.from_pool(
+            pool, function_name, function_signature, Environments.ANDROID,
+            granularity
+        )
+        if is_new:
+            call.class_name = class_name
+            call.package_name = package_name
+        calls[key] = call
+    return call
@@ -1,25 +1,43 @@
+import hashlib
 import os
+import math
 import multiprocessing
+import pickle
 import sys
+import tempfile
 
-import networkx as nx
-
+from attacksurfacemeter.call import Call
+from attacksurfacemeter.environments import Environments
 from attacksurfacemeter.granularity import Granularity
 from attacksurfacemeter.loaders.base_loader import BaseLoader
 from attacksurfacemeter.loaders.gprof_loader import GprofLoader
+from attacksurfacemeter.versioned_graph import VersionedDiGraph
+
+# Attributes of the nodes and edges of a gprof call graph, other than
+#   frequency, encoded in summaries as the bits of an integer
+ATTRIBUTES = (
+    'tested', 'defense', 'vulnerable', 'dangerous', 'entry', 'exit', 'gprof',
+    'call', 'return'
+)
+BITS = dict((name, 1 << index) for (index, name) in enumerate(ATTRIBUTES))
+
+# Version of the format of the summaries in the cache, to be incremented
+#   whenever the format changes
+CACHE_VERSION = 1
 
 
 class MultigprofLoader(BaseLoader):
     """"""
 
     def __init__(self, sources, reverse=False, defenses=None,
-                 vulnerabilities=None, processes=1):
+                 vulnerabilities=None, processes=1, cache=None):
         """Constructor for MultigprofLoader.
 
         Parameters
         ----------
-        source : str
-            The absolute path to a text file containing the call graph
+        sources : list
+            The absolute paths to the text files, each of which may be
+            compressed using gzip, bzip2, or xz, containing the call graphs
             generated using gprof.
         reverse : bool, optional
             Parameter irrelevant.
@@ -32,16 +50,35 @@ class MultigprofLoader(BaseLoader):
         processes : int, optional
             Number of processes to spawn when aggregating multiple gprof call
             graphs.
+        cache : str, optional
+            The absolute path to a directory in which the summary of each
+            gprof call graph is cached. A call graph whose content has been
+            loaded before at the same granularity and with the same defenses
+            and vulnerabilities is read from the cache instead of being
+            parsed. The directory is created if it does not exist.
         """
         super(MultigprofLoader, self).__init__(
             'multiple', reverse, defenses, vulnerabilities
         )
         self.sources = sources
         self._processes = processes
+        self._cache = cache
 
     def load_call_graph(self, granularity=Granularity.FUNC):
         """Load an aggregate of multiple call graphs generated by gprof.
 
+        The sources are split into one chunk per process, each of which is
+        loaded by the process into a compact summary of the nodes and edges in
+        the call graphs of the chunk. The summaries are then merged in pairs,
+        in parallel, until a single summary remains from which the aggregate
+        call graph is built. A single process loads all sources without
+        spawning a process. See MultigprofLoader.__init__ for the caching of
+        summaries.
+
+        The frequency attribute of a node is the number of call graphs in
+        which the node was called and that of an edge is the number of call
+        graphs in which the edge was found.
+
         Parameters
         ----------
         granularity : str
@@ -53,69 +90,276 @@ class MultigprofLoader(BaseLoader):
         call_graph : networkx.DiGraph
             An object representing the call graph.
         """
-        call_graph = None
+        if self._cache is not None:
+            os.makedirs(self._cache, exist_ok=True)
+
+        count = len(self.sources)
+        size = max(1, math.ceil(count / self._processes))
+        chunks = [
+            (range(start, min(start + size, count)), granularity)
+            for start in range(0, count, size)
+        ]
 
-        manager = multiprocessing.Manager()
-        sync_queue = manager.Queue(maxsize=50)
-        out_queue = manager.Queue(maxsize=1)
+        if len(chunks) > 1:
+            with multiprocessing.Pool(self._processes) as pool:
+                summaries = self._load_summaries(
+                    pool.imap(self._load_summary, chunks), count
+                )
 
-        process = multiprocessing.Process(
-            name='process.merger',
-            target=self._merge_call_graph,
-            args=(sync_queue, out_queue)
-        )
-        process.start()
-
-        with multiprocessing.Pool(self._processes) as pool:
-            pool.starmap(
-                func=self._load_call_graph,
-                iterable=[
-                    (index, granularity, sync_queue)
-                    for index in range(len(self.sources))
-                ],
-                chunksize=1
+                while len(summaries) > 1:
+                    merged = pool.starmap(
+                        _merge_summaries,
+                        zip(summaries[0::2], summaries[1::2])
+                    )
+                    if len(summaries) % 2:
+                        merged.append(summaries[-1])
+                    summaries = merged
+        else:
+            summaries = self._load_summaries(
+                map(self._load_summary, chunks), count
             )
 
-        process.join()
+        (nodes, edges, errors, _) = (
+            summaries[0] if summaries else _get_summary()
+        )
+        self._errors = errors
+
+        return _get_call_graph(nodes, edges, granularity)
+
+    def get_sources(self):
+        """Return the sources that the call graph is loaded from.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        sources : list
+            A list of absolute paths to the text files containing the call
+            graphs generated using gprof.
+        """
+        return list(self.sources)
+
+    def _load_summaries(self, summaries, count):
+        _summaries = list()
+
+        index = 0
+        for summary in summaries:
+            _summaries.append(summary)
+            index += len(summary[3])
+            if 'DEBUG' in os.environ:
+                self._print_status(index, count)
+
+        return _summaries
 
-        (call_graph, self._errors) = out_queue.get(block=True)
+    def _load_summary(self, chunk):
+        (indices, granularity) = chunk
 
-        return call_graph
+        summary = _get_summary()
+        for index in indices:
+            if self._cache is None:
+                _summary = self._parse_summary(index, granularity)
+            else:
+                _summary = self._get_cached_summary(index, granularity)
+            _merge_summaries(summary, _summary)
 
-    def _load_call_graph(self, index, granularity, sync_queue):
+        return summary
+
+    def _parse_summary(self, index, granularity):
         loader = GprofLoader(
             self.sources[index], self.is_reverse, self.defenses,
             self.vulnerabilities
         )
         call_graph = loader.load_call_graph(granularity)
 
-        sync_queue.put((call_graph, loader.errors), block=True)
+        summary = _get_summary()
+        _add_call_graph(summary, call_graph, loader.errors)
+        summary[3].append(index)
 
-    def _merge_call_graph(self, sync_queue, out_queue):
-        call_graph = nx.DiGraph()
-        attributes = dict()
-        errors = list()
+        return summary
 
-        count = len(self.sources)
-        index = 0
-        while index < count:
-            (_call_graph, _errors) = sync_queue.get(block=True)
-            index += 1
-            if 'DEBUG' in os.environ:
-                self._print_status(index, count)
-            for (node, attrs) in _call_graph.nodes(data=True):
-                if 'frequency' in attrs and node in attributes:
-                    attrs['frequency'] = attributes[node] + 1
-                call_graph.add_node(node, **attrs)
-            call_graph.add_edges_from(_call_graph.edges(data=True))
-            attributes = nx.get_node_attributes(call_graph, 'frequency')
+    def _get_cached_summary(self, index, granularity):
+        path = os.path.join(
+            self._cache, self._get_cache_key(index, granularity)
+        )
+
+        # Any failure to read a cached summary, including one of an
+        #   unexpected shape, is a cache miss
+        try:
+            with open(path, 'rb') as file_:
+                (nodes, edges, errors) = pickle.load(file_)
+            if _is_summary(nodes, edges, errors):
+                return (nodes, edges, errors, [index])
+        except Exception:
+            pass
+
+        summary = self._parse_summary(index, granularity)
 
-            errors.extend(_errors)
+        # Writing to a temporary file that replaces the cached summary to
+        #   prevent a concurrent load from reading a partial summary
+        (descriptor, temporary) = tempfile.mkstemp(dir=self._cache)
+        try:
+            with os.fdopen(descriptor, 'wb') as file_:
+                pickle.dump(
+                    summary[:3], file_, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(temporary, path)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
 
-        out_queue.put((call_graph, errors), block=True)
+        return summary
+
+    def _get_cache_key(self, index, granularity):
+        """Return the name of the file caching the summary of a source.
+
+        The name is a digest of the content of the source and of everything
+        else that the summary depends on.
+        """
+        digest = hashlib.sha1()
+        with open(self.sources[index], 'rb') as file_:
+            for block in iter(lambda: file_.read(1 << 20), b''):
+                digest.update(block)
+
+        parameters = [str(CACHE_VERSION), granularity]
+        parameters.append(
+            '\n'.join(sorted(call.identity for call in self.defenses))
+        )
+        parameters.append(
+            '\n'.join(sorted(call.identity for call in self.vulnerabilities))
+        )
+        digest.update('\0'.join(parameters).encode())
+
+        return '{0}.summary'.format(digest.hexdigest())
 
     def _print_status(self, index, count):
         sys.stdout.write('\r')
         sys.stdout.write('\033[K')
         sys.stdout.write('Processing {0:4d}/{1:4d}'.format(index, count))
         sys.stdout.flush()
+
+
+def _get_summary():
+    """Return an empty summary of call graphs.
+
+    A summary is a tuple (nodes, edges, errors, indices). nodes is a
+    dictionary keyed by the identity of a node with the list [name,
+    signature, attributes, frequency] as the value and edges is a dictionary
+    keyed by the tuple of the identities of the nodes of an edge with the
+    list [attributes, frequency] as the value, where attributes is the
+    bitwise or of the BITS of the attributes of the node or edge. errors is
+    a list of errors encountered while loading the call graphs and indices
+    is a list of indices of the sources summarized.
+    """
+    return (dict(), dict(), list(), list())
+
+
+def _is_summary(nodes, edges, errors):
+    """Return True if nodes, edges, and errors are those of a summary."""
+    if not (isinstance(nodes, dict) and isinstance(edges, dict) and
+            isinstance(errors, list)):
+        return False
+    for (identity, node) in nodes.items():
+        if not (isinstance(identity, str) and isinstance(node, list) and
+                len(node) == 4 and isinstance(node[0], str) and
+                isinstance(node[1], str) and isinstance(node[2], int) and
+                isinstance(node[3], int)):
+            return False
+    for (edge, _edge) in edges.items():
+        if not (isinstance(edge, tuple) and len(edge) == 2 and
+                edge[0] in nodes and edge[1] in nodes and
+                isinstance(_edge, list) and len(_edge) == 2 and
+                isinstance(_edge[0], int) and isinstance(_edge[1], int)):
+            return False
+    return True
+
+
+def _add_call_graph(summary, call_graph, errors):
+    (nodes, edges, _errors, _) = summary
+
+    for (node, attrs) in call_graph.nodes_iter(data=True):
+        (attributes, frequency) = _encode(attrs)
+        _node = nodes.get(node.identity)
+        if _node is None:
+            nodes[node.identity] = [
+                node.function_name, node.function_signature, attributes,
+                frequency
+            ]
+        else:
+            _node[2] |= attributes
+            _node[3] += frequency
+
+    for (caller, callee, attrs) in call_graph.edges_iter(data=True):
+        (attributes, _) = _encode(attrs)
+        edge = (caller.identity, callee.identity)
+        _edge = edges.get(edge)
+        if _edge is None:
+            edges[edge] = [attributes, 1]
+        else:
+            _edge[0] |= attributes
+            _edge[1] += 1
+
+    _errors.extend(errors)
+
+
+def _merge_summaries(summary, other):
+    (nodes, edges, errors, indices) = summary
+
+    for (identity, node) in other[0].items():
+        _node = nodes.get(identity)
+        if _node is None:
+            nodes[identity] = node
+        else:
+            _node[2] |= node[2]
+            _node[3] += node[3]
+
+    for (edge, _edge) in other[1].items():
+        __edge = edges.get(edge)
+        if __edge is None:
+            edges[edge] = _edge
+        else:
+            __edge[0] |= _edge[0]
+            __edge[1] += _edge[1]
+
+    errors.extend(other[2])
+    indices.extend(other[3])
+
+    return summary
+
+
+def _get_call_graph(nodes, edges, granularity):
+    call_graph = VersionedDiGraph()
+
+    calls = dict()
+    for (identity, (name, signature, attributes, frequency)) in nodes.items():
+        call = Call(name, signature, Environments.C, granularity)
+        attrs = _decode(attributes)
+        if frequency:
+            attrs['frequency'] = frequency
+        call_graph.add_node(call, attrs)
+        calls[identity] = call
+
+    for ((caller, callee), (attributes, frequency)) in edges.items():
+        attrs = _decode(attributes)
+        attrs['frequency'] = frequency
+        call_graph.add_edge(calls[caller], calls[callee], attrs)
+
+    return call_graph
+
+
+def _encode(attrs):
+    attributes = 0
+    frequency = 0
+    for name in attrs:
+        if name == 'frequency':
+            frequency = 1
+        else:
+            attributes |= BITS[name]
+    return (attributes, frequency)
+
+
+def _decode(attributes):
+    return dict(
+        (name, None) for name in ATTRIBUTES if attributes & BITS[name]
+    )
@@ -0,0 +1,298 @@
+import collections
+
+import networkx as nx
+import numpy as np
+
+from attacksurfacemeter.csr_graph import UNREACHABLE
+
+# Largest target position and path length stored as a 16-bit integer
+LIMIT = np.iinfo(np.uint16).max
+
+
+class Proximity():
+
+    """Represents the distance from every node in a call graph to a set of
+    target nodes.
+
+    Only the distances from each node to the targets that it has a path to
+    are stored, in compressed sparse row (CSR) form: the pairs of the node at
+    position i are columns[indptr[i]:indptr[i + 1]], the positions of the
+    targets, and lengths[indptr[i]:indptr[i + 1]], the lengths of the
+    shortest paths to them. Lengths are stored as 16-bit integers unless a
+    path is too long for them, so the table takes a few bytes per pair of a
+    node and a target that it reaches rather than per node and target.
+    """
+
+    def __init__(self, nodes, targets, indptr, columns, lengths, index=None):
+        """Proximity constructor.
+
+        Parameters
+        ----------
+        nodes : list
+            A list of Call objects, each representing a node in the call
+            graph. The position of a node in the list is its row in the
+            distance table.
+        targets : list
+            A list of Call objects, each representing a target node. The
+            position of a target in the list is its column in the distance
+            table.
+        indptr : numpy.ndarray
+            An array of len(nodes) + 1 offsets into columns and lengths
+            delimiting the pairs of each node.
+        columns : numpy.ndarray
+            The position in targets of the target of each pair.
+        lengths : numpy.ndarray
+            The length of the shortest path from the node to the target of
+            each pair.
+        index : dict, optional
+            A dictionary keyed by Call with the position of the Call in nodes
+            as the value. Computed from nodes when not specified.
+
+        Returns
+        -------
+        proximity : Proximity
+            An instance of Proximity.
+        """
+        self.nodes = nodes
+        self.targets = targets
+        self.indptr = indptr
+        self.columns = columns
+        self.lengths = lengths
+
+        if index is None:
+            index = {node: i for (i, node) in enumerate(nodes)}
+        self._index = index
+        self._targets = set(targets)
+
+    @classmethod
+    def from_csr_graph(cls, csr_graph, targets):
+        """Construct a Proximity by searching backwards from each target.
+
+        A single breadth-first search over the predecessors of a target
+        yields the length of the shortest path from every node to that
+        target, so the whole table costs one search per target. Only the
+        nodes reached by each search are kept.
+
+        Parameters
+        ----------
+        csr_graph : CsrGraph
+            The graph the distances are computed on.
+        targets : list
+            A list of nodes in graph to which the distances are computed.
+
+        Returns
+        -------
+        proximity : Proximity
+            An instance of Proximity.
+        """
+        transpose = csr_graph.transpose()
+        column_type = np.uint16 if len(targets) <= LIMIT else np.int32
+
+        positions = [np.empty(0, dtype=np.int32)]
+        columns = [np.empty(0, dtype=column_type)]
+        lengths = [np.empty(0, dtype=np.uint16)]
+        for (i, target) in enumerate(targets):
+            distances = transpose.get_distances(csr_graph.index[target])
+            reached = np.flatnonzero(distances != UNREACHABLE)
+
+            positions.append(reached.astype(np.int32))
+            columns.append(np.full(len(reached), i, dtype=column_type))
+            _lengths = distances[reached]
+            if _lengths.max() <= LIMIT:
+                _lengths = _lengths.astype(np.uint16)
+            lengths.append(_lengths)
+
+        positions = np.concatenate(positions)
+        # Ordering the pairs by node, stably so that the pairs of each node
+        #   are in the order of the targets
+        order = np.argsort(positions, kind='mergesort')
+        indptr = np.zeros(len(csr_graph) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(positions, minlength=len(csr_graph)), out=indptr[1:]
+        )
+
+        return cls(
+            csr_graph.nodes, list(targets), indptr,
+            np.concatenate(columns)[order], np.concatenate(lengths)[order],
+            csr_graph.index
+        )
+
+    def __contains__(self, call):
+        return call in self._index
+
+    def select(self, targets):
+        """Return the distances to a subset of the targets.
+
+        Parameters
+        ----------
+        targets : list
+            A list of Call objects, each of which is a target of this
+            Proximity.
+
+        Returns
+        -------
+        proximity : Proximity
+            An instance of Proximity sharing the distance table of this one.
+        """
+        rows = {target: i for (i, target) in enumerate(self.targets)}
+        mapping = np.full(len(self.targets), -1, dtype=np.int64)
+        mapping[[rows[target] for target in targets]] = np.arange(
+            len(targets)
+        )
+
+        columns = mapping[self.columns]
+        kept = columns >= 0
+        offsets = np.zeros(len(kept) + 1, dtype=np.int64)
+        np.cumsum(kept, out=offsets[1:])
+
+        return Proximity(
+            self.nodes, list(targets), offsets[self.indptr],
+            columns[kept].astype(self.columns.dtype), self.lengths[kept],
+            self._index
+        )
+
+    def get_means(self):
+        """Return the mean shortest path length from each node to the targets.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        means : numpy.ndarray
+            An array indexed by node position containing the mean length of
+            the shortest paths from the node to the targets that it has a path
+            to. The value is NaN for a node that is itself a target or that
+            has no path to any target.
+        """
+        (sums, counts) = self._get_totals()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return sums / counts
+
+    def get_mean(self):
+        """Return the mean shortest path length from all nodes to the targets.
+
+        The mean is taken over every pair of a node that is not a target and
+        a target that the node has a path to, i.e. over all the values in the
+        dictionaries returned by get_lengths.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        mean : float
+            The mean path length, or None if no node has a path to a target.
+        """
+        (sums, counts) = self._get_totals()
+
+        count = int(counts.sum())
+        return float(sums.sum()) / count if count else None
+
+    def _get_totals(self):
+        """Return the sum and number of path lengths from each node."""
+        totals = np.zeros(len(self.lengths) + 1, dtype=np.int64)
+        np.cumsum(self.lengths, dtype=np.int64, out=totals[1:])
+
+        sums = totals[self.indptr[1:]] - totals[self.indptr[:-1]]
+        counts = np.diff(self.indptr)
+
+        targets = [self._index[target] for target in self._targets]
+        sums[targets] = 0
+        counts[targets] = 0
+        return (sums, counts)
+
+    def get_lengths(self, call):
+        """Return shortest path lengths from call to all the targets.
+
+        Parameters
+        ----------
+        call : Call
+            An object representing a function call in the call graph.
+
+        Returns
+        -------
+        lengths - dict
+            A dictionary keyed by the target that the given call has a path
+            to and the value is the length of the shortest path from the call
+            to the target. If the given call itself is a target, an empty
+            dictionary is returned. If the given call has no path to any of
+            the targets or if there are no targets, then None is returned.
+        """
+        if call in self._targets:
+            return dict()
+        if not self.targets:
+            return None
+
+        if call not in self._index:
+            raise nx.NetworkXError(
+                '{0} is not in the call graph.'.format(call)
+            )
+        i = self._index[call]
+        (start, end) = (self.indptr[i], self.indptr[i + 1])
+
+        lengths = {
+            self.targets[column]: length
+            for (column, length) in zip(
+                self.columns[start:end].tolist(),
+                self.lengths[start:end].tolist()
+            )
+        }
+
+        return lengths if lengths else None
+
+
+def get_mean_lengths(csr_graph, targets):
+    """Return the mean shortest path length from all nodes to each of several
+    sets of targets without building their distance tables.
+
+    A reverse breadth-first search is performed once per distinct target and
+    the lengths it yields are added to the sum, and counted, for every set
+    that the target is in before the next search, so the memory used grows
+    with the number of nodes rather than the number of pairs of a node and
+    a target that it reaches.
+
+    Parameters
+    ----------
+    csr_graph : CsrGraph
+        The graph the distances are computed on.
+    targets : dict
+        A dictionary keyed by name with a list of nodes in graph, the
+        targets, as the value.
+
+    Returns
+    -------
+    means : dict
+        A dictionary keyed by name with the mean path length to the targets
+        as the value. The mean of each set is that of Proximity.get_mean.
+    """
+    transpose = csr_graph.transpose()
+
+    masks = dict()
+    owners = collections.OrderedDict()
+    for (name, nodes) in targets.items():
+        masks[name] = np.zeros(len(csr_graph), dtype=bool)
+        masks[name][[csr_graph.index[node] for node in nodes]] = True
+        for node in nodes:
+            names = owners.setdefault(node, list())
+            if name not in names:
+                names.append(name)
+
+    sums = dict.fromkeys(targets, 0)
+    counts = dict.fromkeys(targets, 0)
+    for (target, names) in owners.items():
+        distances = transpose.get_distances(csr_graph.index[target])
+        reached = distances != UNREACHABLE
+        for name in names:
+            # Paths from targets of the set are not counted
+            kept = reached & ~masks[name]
+            sums[name] += int(distances[kept].sum(dtype=np.int64))
+            counts[name] += int(np.count_nonzero(kept))
+
+    return {
+        name: float(sums[name]) / counts[name] if counts[name] else None
+        for name in targets
+    }
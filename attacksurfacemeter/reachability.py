@@ -0,0 +1,242 @@
+import networkx as nx
+import numpy as np
+
+
+class Reachability():
+
+    """Represents an index of the nodes reachable from and reaching each node
+    in a call graph.
+
+    The strongly connected components of the graph are condensed into a
+    directed acyclic graph and the components are numbered in reverse
+    topological order. Nodes are assigned bit positions such that the members
+    of a component occupy a contiguous range of bits and, for each component,
+    the set of nodes reachable from it (its descendant closure) and the set
+    of nodes from which it is reachable (its ancestor closure) are stored as
+    bitsets. Reachability queries are then bitwise operations.
+    """
+
+    def __init__(self, csr_graph):
+        """Reachability constructor.
+
+        Parameters
+        ----------
+        csr_graph : CsrGraph
+            The graph to build the index for.
+
+        Returns
+        -------
+        reachability : Reachability
+            An instance of Reachability.
+        """
+        self.csr_graph = csr_graph
+
+        self.components = Reachability._get_components(csr_graph)
+        count = int(self.components.max()) + 1 if len(csr_graph) else 0
+
+        # Bit position of each node, grouping the nodes of a component
+        self._order = np.argsort(self.components, kind='mergesort')
+        self._positions = np.empty(len(csr_graph), dtype=np.int64)
+        self._positions[self._order] = np.arange(len(csr_graph))
+
+        sizes = np.bincount(self.components, minlength=count).tolist()
+        starts = (np.cumsum(sizes) - sizes).tolist()
+        members = [
+            ((1 << size) - 1) << start for (size, start) in zip(sizes, starts)
+        ]
+
+        # Edges of the condensation
+        (sources, destinations) = (
+            self.components[csr_graph.sources],
+            self.components[csr_graph.indices]
+        )
+        external = sources != destinations
+        edges = np.unique(
+            sources[external].astype(np.int64) * count +
+            destinations[external]
+        )
+        (sources, destinations) = (
+            (edges // count).tolist(), (edges % count).tolist()
+        )
+
+        successors = [list() for _ in range(count)]
+        predecessors = [list() for _ in range(count)]
+        for (source, destination) in zip(sources, destinations):
+            successors[source].append(destination)
+            predecessors[destination].append(source)
+
+        # Successors of a component are numbered lower than the component
+        self._descendants = list(members)
+        for component in range(count):
+            closure = self._descendants[component]
+            for successor in successors[component]:
+                closure |= self._descendants[successor]
+            self._descendants[component] = closure
+
+        self._ancestors = list(members)
+        for component in reversed(range(count)):
+            closure = self._ancestors[component]
+            for predecessor in predecessors[component]:
+                closure |= self._ancestors[predecessor]
+            self._ancestors[component] = closure
+
+    @staticmethod
+    def _get_components(csr_graph):
+        """Return the strongly connected component of each node.
+
+        Implements an iterative form of Tarjan's algorithm. Components are
+        numbered in the order in which they are completed, which is a reverse
+        topological order of the condensation.
+
+        Parameters
+        ----------
+        csr_graph : CsrGraph
+            The graph to find the strongly connected components of.
+
+        Returns
+        -------
+        components : numpy.ndarray
+            An array containing the number of the component of each node.
+        """
+        indptr = csr_graph.indptr.tolist()
+        indices = csr_graph.indices.tolist()
+        count = len(csr_graph)
+
+        index = [-1] * count
+        lowlink = [0] * count
+        on_stack = [False] * count
+        components = [-1] * count
+
+        stack = list()
+        counter = 0
+        component = 0
+        for root in range(count):
+            if index[root] != -1:
+                continue
+
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            work = [(root, indptr[root])]
+            while work:
+                (node, position) = work[-1]
+                end = indptr[node + 1]
+                while position < end:
+                    successor = indices[position]
+                    position += 1
+                    if index[successor] == -1:
+                        work[-1] = (node, position)
+
+                        index[successor] = lowlink[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+
+                        work.append((successor, indptr[successor]))
+                        break
+                    elif on_stack[successor]:
+                        if index[successor] < lowlink[node]:
+                            lowlink[node] = index[successor]
+                else:
+                    work.pop()
+                    if lowlink[node] == index[node]:
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            components[member] = component
+                            if member == node:
+                                break
+                        component += 1
+                    if work:
+                        parent = work[-1][0]
+                        if lowlink[node] < lowlink[parent]:
+                            lowlink[parent] = lowlink[node]
+
+        return np.array(components, dtype=np.int32)
+
+    def _get_bits(self, call, closures):
+        if call not in self.csr_graph.index:
+            raise nx.NetworkXError(
+                '{0} is not in the call graph.'.format(call)
+            )
+        node = self.csr_graph.index[call]
+
+        closure = closures[self.components[node]]
+        return closure & ~(1 << int(self._positions[node]))
+
+    def _get_nodes(self, bits):
+        count = len(self.csr_graph)
+
+        # Unpack the bitset into a boolean per bit position, least
+        #   significant bit first
+        raw = np.frombuffer(
+            bits.to_bytes((count + 7) // 8, 'little'), dtype=np.uint8
+        )
+        positions = np.flatnonzero(np.unpackbits(raw).reshape(-1, 8)[:, ::-1])
+
+        nodes = self.csr_graph.nodes
+        return [nodes[i] for i in self._order[positions].tolist()]
+
+    def get_descendants(self, call):
+        """Return the list of nodes reachable from a specific call.
+
+        Parameters
+        ----------
+        call : Call
+            An instance of Call the descendants of which should be returned.
+
+        Returns
+        -------
+        descendants : list
+            A list of Call objects, each of which is reachable from call. The
+            call itself is not included.
+        """
+        return self._get_nodes(self._get_bits(call, self._descendants))
+
+    def get_ancestors(self, call):
+        """Return the list of nodes from which a specific call is reachable.
+
+        Parameters
+        ----------
+        call : Call
+            An instance of Call the ancestors of which should be returned.
+
+        Returns
+        -------
+        ancestors : list
+            A list of Call objects, from each of which call is reachable. The
+            call itself is not included.
+        """
+        return self._get_nodes(self._get_bits(call, self._ancestors))
+
+    def count_descendants(self, call):
+        """Return the number of nodes reachable from a specific call.
+
+        Parameters
+        ----------
+        call : Call
+            An instance of Call the descendants of which should be counted.
+
+        Returns
+        -------
+        count : int
+            The number of nodes reachable from call, excluding call.
+        """
+        return bin(self._get_bits(call, self._descendants)).count('1')
+
+    def count_ancestors(self, call):
+        """Return the number of nodes from which a specific call is reachable.
+
+        Parameters
+        ----------
+        call : Call
+            An instance of Call the ancestors of which should be counted.
+
+        Returns
+        -------
+        count : int
+            The number of nodes from which call is reachable, excluding call.
+        """
+        return bin(self._get_bits(call, self._ancestors)).count('1')
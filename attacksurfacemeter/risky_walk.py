@@ -0,0 +1,356 @@
+import networkx as nx
+import numpy as np
+
+
+class RiskyWalk():
+
+    """Computes the risky walk (personalized PageRank) of a call graph.
+
+    The transition probabilities are derived once from the weights of the
+    edges in a CsrGraph and the PageRank vector is then obtained by power
+    iteration over those arrays. The iteration mirrors networkx.pagerank:
+    the same starting vector, treatment of dangling nodes, and convergence
+    criterion are used so that the results of the two agree within the
+    tolerance.
+    """
+
+    def __init__(self, csr_graph):
+        """RiskyWalk constructor.
+
+        Parameters
+        ----------
+        csr_graph : CsrGraph
+            The graph on which the random walk is performed. The weights of
+            the edges determine the transition probabilities.
+
+        Returns
+        -------
+        risky_walk : RiskyWalk
+            An instance of RiskyWalk.
+        """
+        self.csr_graph = csr_graph
+
+        sources = csr_graph.sources
+        out_weight = np.bincount(
+            sources, weights=csr_graph.weights, minlength=len(csr_graph)
+        )
+
+        # Probability of moving along each edge, aligned with the edge arrays
+        with np.errstate(divide='ignore', invalid='ignore'):
+            probabilities = csr_graph.weights / out_weight[sources]
+        probabilities[out_weight[sources] == 0] = 0.0
+
+        self._sources = sources
+        self._destinations = csr_graph.indices
+        self._probabilities = probabilities
+        # 1.0 for a node without outgoing transitions, 0.0 otherwise, so that
+        #   the total page rank of such nodes is a product with the vector
+        self._dangling = (np.bincount(
+            sources, weights=probabilities, minlength=len(csr_graph)
+        ) == 0).astype(np.float64)
+
+    def get_personalization(self, entry_points, exit_points, entry=10000,
+                            exit=10000, other=1):
+        """Return the personalization vector for the random walk.
+
+        Parameters
+        ----------
+        entry_points : list
+            A list of Call objects, each representing an entry point.
+        exit_points : list
+            A list of Call objects, each representing an exit point.
+        entry : int, optional
+            A non-zero personalization value for a node that is an entry point.
+        exit : int, optional
+            A non-zero personalization value for a node that is an exit point.
+        other : int, optional
+            A non-zero personalization value for a node that is neither an
+            entry point nor an exit point.
+
+        Returns
+        -------
+        personalization : numpy.ndarray
+            An array containing the personalization value of each node. A node
+            that is both an entry point and an exit point is given the sum of
+            entry and exit.
+        """
+        (is_entry, is_exit) = self._get_masks(entry_points, exit_points)
+
+        personalization = np.full(len(self.csr_graph), other, dtype=np.float64)
+        personalization[is_entry] = entry
+        personalization[is_exit] = exit
+        personalization[is_entry & is_exit] = entry + exit
+
+        return personalization
+
+    def get_page_rank(self, personalization, damping=0.85, tol=1.0e-6,
+                      max_iter=100, nstart=None):
+        """Return the page rank of the nodes in the graph.
+
+        Parameters
+        ----------
+        personalization : numpy.ndarray
+            An array containing the non-zero personalization value of each
+            node. The array need not be normalized.
+        damping : float, optional
+            The damping parameter used in the Page Rank algorithm
+        tol : float, optional
+            The error tolerance used to check convergence. The iteration stops
+            when the sum of the absolute change in page rank over all nodes
+            is less than the number of nodes times tol.
+        max_iter : int, optional
+            The maximum number of iterations of the power method.
+        nstart : numpy.ndarray, optional
+            An array containing the starting value of the page rank of each
+            node, e.g. the result of a previous computation with similar
+            parameters. The array need not be normalized. A uniform vector is
+            used when not specified.
+
+        Returns
+        -------
+        page_rank : numpy.ndarray
+            An array containing the page rank of each node.
+
+        Raises
+        ------
+        networkx.NetworkXError
+            If the power iteration fails to converge in max_iter iterations.
+        """
+        if nstart is not None:
+            nstart = np.asarray(nstart, dtype=np.float64)[:, np.newaxis]
+
+        page_ranks = self.get_page_ranks(
+            np.asarray(personalization, dtype=np.float64)[:, np.newaxis],
+            [damping], tol, max_iter, nstart
+        )
+
+        return page_ranks[:, 0]
+
+    def get_page_ranks(self, personalizations, dampings, tol=1.0e-6,
+                       max_iter=100, nstart=None):
+        """Return the page rank of the nodes for several sets of parameters.
+
+        All parameter sets are solved together: the personalization vectors
+        are stacked as the columns of a matrix and each step of the power
+        method propagates every column over the shared transition
+        probabilities at once. A column stops being iterated as soon as it
+        converges, so each result is identical to that of get_page_rank with
+        the same parameters.
+
+        Parameters
+        ----------
+        personalizations : numpy.ndarray
+            A two-dimensional array with one column per parameter set, each
+            column containing the non-zero personalization value of each
+            node. The columns need not be normalized.
+        dampings : list
+            A list containing the damping parameter of each parameter set.
+        tol : float, optional
+            The error tolerance used to check convergence. See get_page_rank.
+        max_iter : int, optional
+            The maximum number of iterations of the power method.
+        nstart : numpy.ndarray, optional
+            A two-dimensional array with one column per parameter set, each
+            column containing the starting value of the page rank of each
+            node. A uniform vector is used when not specified.
+
+        Returns
+        -------
+        page_ranks : numpy.ndarray
+            A two-dimensional array with one column per parameter set, each
+            column containing the page rank of each node.
+
+        Raises
+        ------
+        networkx.NetworkXError
+            If the power iteration fails to converge in max_iter iterations
+            for any of the parameter sets.
+        """
+        count = len(self.csr_graph)
+
+        # Each parameter set is held in a row while iterating so that the
+        #   vectors propagated over the edges are contiguous in memory
+        p = np.array(personalizations, dtype=np.float64).T
+        page_ranks = np.empty_like(p)
+        if count == 0:
+            return page_ranks.T
+
+        if nstart is None:
+            x = np.full(p.shape, 1.0 / count, dtype=np.float64)
+        else:
+            x = np.array(nstart, dtype=np.float64).T
+            x /= x.sum(axis=1)[:, np.newaxis]
+
+        p /= p.sum(axis=1)[:, np.newaxis]
+        damping = np.asarray(dampings, dtype=np.float64)[:, np.newaxis]
+        teleport = (1.0 - damping) * p
+
+        # Positions of the parameter sets that have yet to converge
+        active = np.arange(p.shape[0])
+        for _ in range(max_iter):
+            xlast = x
+
+            x = self._propagate(xlast)
+            x += xlast.dot(self._dangling)[:, np.newaxis] * p
+            x *= damping
+            x += teleport
+
+            converged = np.abs(x - xlast).sum(axis=1) < count * tol
+            if converged.any():
+                page_ranks[active[converged]] = x[converged]
+
+                remaining = ~converged
+                active = active[remaining]
+                if not active.size:
+                    return page_ranks.T
+
+                x = x[remaining]
+                p = p[remaining]
+                damping = damping[remaining]
+                teleport = teleport[remaining]
+
+        raise nx.NetworkXError(
+            'pagerank: power iteration failed to converge in {0} '
+            'iterations.'.format(max_iter)
+        )
+
+    def get_sweep(self, entry_points, exit_points, parameters, tol=1.0e-6,
+                  max_iter=100):
+        """Return the page rank of the nodes for a sweep over parameters.
+
+        For a given damping, the page rank is proportional to the
+        personalization vector multiplied by a fixed matrix, and every
+        personalization vector is a combination of three indicator vectors:
+        of the entry points, of the exit points, and of the remaining nodes.
+        When more sets of parameters share a damping than there are
+        indicator vectors, the page rank is therefore computed for the
+        indicator vectors and the page rank of each of those sets is a
+        normalized combination of them, weighted by entry, exit, and other.
+        Otherwise, the page rank of each set is computed from its own
+        personalization vector, so no more vectors are propagated than
+        separate calls to get_page_rank would.
+
+        The dampings are solved in increasing order, each in one call to
+        get_page_ranks that starts from the page rank of the same vector
+        at the previous damping, which is much closer to the result than a
+        uniform vector and saves most of the iterations of the power method.
+
+        Parameters
+        ----------
+        entry_points : list
+            A list of Call objects, each representing an entry point.
+        exit_points : list
+            A list of Call objects, each representing an exit point.
+        parameters : list
+            A list of four-tuples, (damping, entry, exit, other), each with
+            the meaning of the parameters of get_personalization and
+            get_page_rank.
+        tol : float, optional
+            The error tolerance used to check convergence. See get_page_rank.
+        max_iter : int, optional
+            The maximum number of iterations of the power method.
+
+        Returns
+        -------
+        page_ranks : numpy.ndarray
+            A two-dimensional array with one column per set of parameters,
+            each column containing the page rank of each node. The results
+            agree with those of get_page_rank within the tolerance.
+        """
+        count = len(self.csr_graph)
+        page_ranks = np.empty((count, len(parameters)), dtype=np.float64)
+        if not page_ranks.size:
+            return page_ranks
+
+        (is_entry, is_exit) = self._get_masks(entry_points, exit_points)
+        basis = np.array(
+            [is_entry, is_exit, ~(is_entry | is_exit)], dtype=np.float64
+        )
+        sizes = basis.sum(axis=1)
+        present = sizes > 0
+        basis = basis[present]
+
+        groups = dict()
+        for (i, (damping, _, _, _)) in enumerate(parameters):
+            groups.setdefault(damping, list()).append(i)
+
+        # The page rank of each vector solved at the previous damping, keyed
+        #   by the position of an indicator vector or by the weights of a
+        #   personalization vector
+        previous = dict()
+        uniform = np.full(count, 1.0 / count, dtype=np.float64)
+        for (damping, positions) in sorted(groups.items()):
+            coefficients = np.array(
+                [parameters[i][1:] for i in positions], dtype=np.float64
+            )[:, present]
+
+            is_combined = len(positions) > len(basis)
+            if is_combined:
+                keys = list(range(len(basis)))
+                personalizations = basis
+            else:
+                keys = [tuple(c) for c in coefficients.tolist()]
+                personalizations = coefficients.dot(basis)
+
+            solution = self.get_page_ranks(
+                personalizations.T, [damping] * len(keys), tol, max_iter,
+                np.array([previous.get(key, uniform) for key in keys]).T
+            ).T
+            previous = dict(zip(keys, solution))
+
+            if not is_combined:
+                page_ranks[:, positions] = solution.T
+                continue
+
+            # The page rank of an indicator vector is normalized to sum to
+            #   one; scale each back to the magnitude of the product of the
+            #   indicator vector and the fixed matrix
+            dangling = solution.dot(self._dangling)
+            solution = solution * (
+                sizes[present] / (1.0 - damping + damping * dangling)
+            )[:, np.newaxis]
+
+            combined = coefficients.dot(solution)
+            page_ranks[:, positions] = (
+                combined / combined.sum(axis=1)[:, np.newaxis]
+            ).T
+
+        return page_ranks
+
+    def _get_masks(self, entry_points, exit_points):
+        """Return boolean masks of the entry points and the exit points."""
+        index = self.csr_graph.index
+
+        is_entry = np.zeros(len(self.csr_graph), dtype=bool)
+        is_entry[[index[n] for n in entry_points]] = True
+        is_exit = np.zeros(len(self.csr_graph), dtype=bool)
+        is_exit[[index[n] for n in exit_points]] = True
+
+        return (is_entry, is_exit)
+
+    def _propagate(self, x):
+        """Return the product of x and the transition probabilities.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            A two-dimensional array with one row per parameter set.
+
+        Returns
+        -------
+        y : numpy.ndarray
+            A two-dimensional array of the same shape as x in which each node
+            holds the sum over its incoming edges of the value of the source
+            times the probability of the edge.
+        """
+        # A single bincount over all rows, with the destinations of each row
+        #   offset into a separate range, scatters into an array that is as
+        #   many times larger and is slower than one bincount per row
+        y = np.empty_like(x)
+        for (i, row) in enumerate(x):
+            y[i] = np.bincount(
+                self._destinations,
+                weights=row[self._sources] * self._probabilities,
+                minlength=len(self.csr_graph)
+            )
+        return y
@@ -0,0 +1,628 @@
+import collections.abc
+import json
+import mmap
+import numbers
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from attacksurfacemeter.call import Call
+from attacksurfacemeter.csr_graph import FLAGS, CsrGraph
+from attacksurfacemeter.versioned_graph import VersionedDiGraph
+
+MAGIC = b'ASMSNAP\0'
+# Version of the format of snapshots, to be incremented whenever the format
+#   changes
+VERSION = 1
+
+# Magic, version, offset of the metadata, and length of the metadata
+HEADER = struct.Struct('<8sIQQ')
+# Alignment, in bytes, of the arrays in a snapshot
+ALIGNMENT = 8
+
+# Index of a string that is absent, e.g. the class of a C function
+NONE = -1
+
+
+class SnapshotError(Exception):
+
+    """Raised when a file is not a snapshot that can be loaded."""
+
+
+class Snapshot():
+
+    """Represents the arrays of a call graph stored in a snapshot.
+
+    A snapshot is a binary file containing a table of the distinct strings in
+    a call graph, arrays describing its nodes, including a bitmask of the
+    attributes of each node, and arrays describing its edges in compressed
+    sparse row (CSR) form, followed by the metadata of the call graph encoded
+    as JSON. The arrays are aligned so that they are used in place from a
+    memory map of the file, which is shared among all processes that load the
+    snapshot.
+
+    Attributes that have the value None are stored as bits of a bitmask.
+    Attributes that have a numeric value, e.g. weight or frequency, are
+    stored as an array of floating point values, NaN where the attribute is
+    absent.
+    """
+
+    def __init__(self, path):
+        """Snapshot constructor.
+
+        Parameters
+        ----------
+        path : str
+            The absolute path of the snapshot file.
+
+        Returns
+        -------
+        snapshot : Snapshot
+            An instance of Snapshot.
+
+        Raises
+        ------
+        SnapshotError
+            If the file is not a snapshot or is of an unsupported version.
+        """
+        with open(path, 'rb') as file_:
+            # A file smaller than the header, including an empty file, which
+            #   cannot be memory mapped, is not a snapshot
+            if os.fstat(file_.fileno()).st_size < HEADER.size:
+                raise SnapshotError('{0} is not a snapshot.'.format(path))
+            self._buffer = mmap.mmap(
+                file_.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        try:
+            (magic, version, offset, length) = HEADER.unpack_from(
+                self._buffer
+            )
+            if magic != MAGIC:
+                raise SnapshotError('{0} is not a snapshot.'.format(path))
+            if version != VERSION:
+                raise SnapshotError(
+                    'Unsupported snapshot version {0}.'.format(version)
+                )
+            if offset + length > len(self._buffer):
+                raise SnapshotError('{0} is truncated.'.format(path))
+
+            try:
+                self.metadata = json.loads(
+                    self._buffer[offset:offset + length].decode()
+                )
+            except ValueError:
+                raise SnapshotError('{0} is corrupt.'.format(path))
+            for (dtype, start, count) in self.metadata['arrays'].values():
+                if start + count * np.dtype(dtype).itemsize > len(
+                        self._buffer):
+                    raise SnapshotError('{0} is truncated.'.format(path))
+        except BaseException:
+            self.close()
+            raise
+
+        self._strings = dict()
+        self._string_offsets = self['string_offsets']
+        (_, self._string_start, _) = self.metadata['arrays']['strings']
+
+    def close(self):
+        """Close the memory map of the snapshot.
+
+        Arrays backed by the memory map, such as those of the view returned
+        by Snapshot.get_csr_graph, must not be used once it is closed. A
+        snapshot that is not closed is unmapped when neither it nor any such
+        array is referenced any longer.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getitem__(self, name):
+        """Return an array in the snapshot without copying it.
+
+        Parameters
+        ----------
+        name : str
+            The name of the array.
+
+        Returns
+        -------
+        array : numpy.ndarray
+            A read-only array backed by the memory map of the snapshot.
+        """
+        (dtype, offset, count) = self.metadata['arrays'][name]
+        return np.frombuffer(self._buffer, dtype, count, offset)
+
+    def get_string(self, position):
+        """Return a string in the table of strings in the snapshot.
+
+        A string is decoded on first access and the same object is returned
+        on every subsequent access.
+
+        Parameters
+        ----------
+        position : int
+            The position of the string, as stored in the arrays of the
+            snapshot.
+
+        Returns
+        -------
+        string : str
+            The string, or None if position is NONE.
+        """
+        if position == NONE:
+            return None
+
+        string = self._strings.get(position)
+        if string is None:
+            (begin, end) = self._string_offsets[position:position + 2].tolist()
+            string = self._buffer[
+                self._string_start + begin:self._string_start + end
+            ].decode()
+            self._strings[position] = string
+        return string
+
+    def get_nodes(self):
+        """Return the nodes of the call graph in the snapshot.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        nodes : Nodes
+            A sequence of Call objects, in the order in which they are
+            stored, each decoded on first access.
+        """
+        return Nodes(self)
+
+    def get_positions(self, attribute):
+        """Return the positions of the nodes that have an attribute set.
+
+        Parameters
+        ----------
+        attribute : str
+            The name of the attribute.
+
+        Returns
+        -------
+        positions : list
+            A sorted list of the positions of the nodes, as in get_nodes.
+        """
+        flags = self.metadata['node_flags']
+        values = self.metadata['node_values']
+        if attribute in flags:
+            bit = np.uint64(1 << flags.index(attribute))
+            present = (self['node_attributes'] & bit) != 0
+        elif attribute in values:
+            present = ~np.isnan(
+                self['node_value_{0}'.format(attribute)]
+            )
+        else:
+            return list()
+        return np.flatnonzero(present).tolist()
+
+    def get_graph(self, nodes):
+        """Return the call graph in the snapshot.
+
+        Parameters
+        ----------
+        nodes : Nodes
+            The nodes of the call graph. See Snapshot.get_nodes.
+
+        Returns
+        -------
+        graph : VersionedDiGraph
+            The call graph.
+        """
+        nodes = list(nodes)
+        indptr = self['indptr']
+        sources = np.repeat(np.arange(len(nodes)), np.diff(indptr)).tolist()
+        destinations = self['indices'].tolist()
+
+        graph = VersionedDiGraph()
+        graph.add_nodes_from(
+            zip(nodes, self._get_attrs('node'))
+        )
+        graph.add_edges_from(
+            (nodes[source], nodes[destination], attrs)
+            for (source, destination, attrs) in zip(
+                sources, destinations, self._get_attrs('edge')
+            )
+        )
+
+        return graph
+
+    def get_csr_graph(self, nodes):
+        """Return an array-backed view of the call graph in the snapshot.
+
+        The adjacency of the view is used in place from the memory map.
+
+        Parameters
+        ----------
+        nodes : Nodes
+            The nodes of the call graph. See Snapshot.get_nodes.
+
+        Returns
+        -------
+        csr_graph : CsrGraph
+            An instance of CsrGraph.
+        """
+        attributes = self['edge_attributes']
+        names = self.metadata['edge_flags']
+
+        flags = np.zeros(len(attributes), dtype=np.uint8)
+        for (name, value) in FLAGS:
+            if name in names:
+                bit = np.uint64(1 << names.index(name))
+                flags[(attributes & bit) != 0] |= value
+
+        weights = np.ones(len(attributes), dtype=np.float64)
+        if 'weight' in self.metadata['edge_values']:
+            values = self['edge_value_weight']
+            present = ~np.isnan(values)
+            weights[present] = values[present]
+
+        return CsrGraph(
+            nodes, self['indptr'], self['indices'], flags, weights
+        )
+
+    def _get_attrs(self, kind):
+        """Return a generator of the dictionaries of attributes of the nodes
+        or edges in the snapshot."""
+        values = self.metadata['{0}_values'.format(kind)]
+        return decode_attributes(
+            self.metadata['{0}_flags'.format(kind)], values,
+            self['{0}_attributes'.format(kind)],
+            dict(
+                (name, self['{0}_value_{1}'.format(kind, name)])
+                for name in values
+            )
+        )
+
+
+class Nodes(collections.abc.Sequence):
+
+    """Represents the nodes of the call graph in a snapshot.
+
+    A node is decoded into a Call the first time it is accessed and the same
+    Call is returned on every subsequent access, so opening a snapshot does
+    not decode any node.
+    """
+
+    def __init__(self, snapshot):
+        """Nodes constructor.
+
+        Parameters
+        ----------
+        snapshot : Snapshot
+            The snapshot that the nodes are stored in.
+
+        Returns
+        -------
+        nodes : Nodes
+            An instance of Nodes.
+        """
+        self._snapshot = snapshot
+        self._fields = [
+            snapshot[name] for name in (
+                'node_names', 'node_signatures', 'node_environments',
+                'node_granularities', 'node_classes', 'node_packages'
+            )
+        ]
+        self._nodes = [None] * len(self._fields[0])
+        self._is_decoded = False
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+
+        call = self._nodes[position]
+        if call is None:
+            call = self._decode(
+                [int(field[position]) for field in self._fields]
+            )
+            self._nodes[position] = call
+        return call
+
+    def __iter__(self):
+        # Decoding all nodes at once converts each field to a list only once
+        if not self._is_decoded:
+            fields = [field.tolist() for field in self._fields]
+            for (position, call) in enumerate(self._nodes):
+                if call is None:
+                    self._nodes[position] = self._decode(
+                        [field[position] for field in fields]
+                    )
+            self._is_decoded = True
+        return iter(self._nodes)
+
+    def _decode(self, positions):
+        """Return the Call of a node given the positions of its strings."""
+        (name, signature, environment, granularity, class_name,
+         package_name) = [
+            self._snapshot.get_string(position) for position in positions
+        ]
+        call = Call(name, signature, environment, granularity)
+        if class_name is not None:
+            call.class_name = class_name
+        if package_name is not None:
+            call.package_name = package_name
+        return call
+
+
+def save(path, call_graph):
+    """Save a call graph to a snapshot.
+
+    The snapshot is written to a temporary file that then replaces path so
+    that a snapshot being loaded is never partially written. The snapshot
+    is given the permissions of a file created with the current umask.
+
+    Parameters
+    ----------
+    path : str
+        The absolute path of the snapshot file.
+    call_graph : CallGraph
+        The call graph to save.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If the call graph has an attribute whose value is neither None nor a
+        number.
+    """
+    graph = call_graph.call_graph
+    nodes = graph.nodes()
+    index = dict((node, i) for (i, node) in enumerate(nodes))
+
+    strings = dict()
+
+    def intern(string):
+        if string is None:
+            return NONE
+        position = strings.get(string)
+        if position is None:
+            position = len(strings)
+            strings[string] = position
+        return position
+
+    arrays = list()
+    arrays.append(('node_names', np.array(
+        [intern(node.function_name) for node in nodes], dtype=np.int32
+    )))
+    arrays.append(('node_signatures', np.array(
+        [intern(node.function_signature) for node in nodes], dtype=np.int32
+    )))
+    arrays.append(('node_environments', np.array(
+        [intern(node.environment) for node in nodes], dtype=np.int32
+    )))
+    arrays.append(('node_granularities', np.array(
+        [intern(node.granularity) for node in nodes], dtype=np.int32
+    )))
+    arrays.append(('node_classes', np.array(
+        [intern(getattr(node, 'class_name', None)) for node in nodes],
+        dtype=np.int32
+    )))
+    arrays.append(('node_packages', np.array(
+        [intern(getattr(node, 'package_name', None)) for node in nodes],
+        dtype=np.int32
+    )))
+
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    destinations = list()
+    edges = list()
+    for (i, node) in enumerate(nodes):
+        for (successor, attrs) in graph.succ[node].items():
+            destinations.append(index[successor])
+            edges.append(attrs)
+        indptr[i + 1] = len(destinations)
+    arrays.append(('indptr', indptr))
+    arrays.append(('indices', np.array(destinations, dtype=np.int32)))
+
+    metadata = {
+        'source': call_graph.source,
+        'granularity': call_graph.granularity,
+        'load_errors': call_graph.load_errors,
+        'num_fragments': call_graph.num_fragments,
+        'monolithicity': call_graph.monolithicity,
+    }
+    for (kind, attrs) in (
+            ('node', [graph.node[node] for node in nodes]), ('edge', edges)):
+        (flags, values, masks, _values) = encode_attributes(kind, attrs)
+        arrays.append(('{0}_attributes'.format(kind), masks))
+        for (name, array) in sorted(_values.items()):
+            arrays.append(('{0}_value_{1}'.format(kind, name), array))
+        metadata['{0}_flags'.format(kind)] = flags
+        metadata['{0}_values'.format(kind)] = values
+
+    blob = bytearray()
+    offsets = [0]
+    for string in strings:
+        blob.extend(string.encode())
+        offsets.append(len(blob))
+    arrays.append(('string_offsets', np.array(offsets, dtype=np.int64)))
+    arrays.append(('strings', np.frombuffer(bytes(blob), dtype=np.uint8)))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    (descriptor, temporary) = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(descriptor, 'wb') as file_:
+            file_.write(bytes(HEADER.size))
+
+            metadata['arrays'] = dict()
+            for (name, array) in arrays:
+                _pad(file_)
+                metadata['arrays'][name] = (
+                    array.dtype.str, file_.tell(), len(array)
+                )
+                file_.write(array.tobytes())
+
+            encoded = json.dumps(metadata).encode()
+            offset = file_.tell()
+            file_.write(encoded)
+
+            file_.seek(0)
+            file_.write(HEADER.pack(MAGIC, VERSION, offset, len(encoded)))
+
+        # mkstemp creates the file readable by its owner only, whereas a
+        #   snapshot is meant to be shared like any other file created
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temporary, 0o666 & ~umask)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def encode_attributes(kind, attrs):
+    """Encode the attributes of nodes or edges into arrays.
+
+    Attributes whose value is None, the flags of nodes and edges, are encoded
+    as bits of a bitmask per node or edge. Attributes whose value is a number
+    are encoded as an array of values per attribute with NaN where the
+    attribute is absent.
+
+    Parameters
+    ----------
+    kind : str
+        Either 'node' or 'edge', used in error messages.
+    attrs : list
+        A list of the dictionaries of attributes of the nodes or edges.
+
+    Returns
+    -------
+    encoded : tuple
+        A four-tuple, (flags, values, masks, arrays), where flags is the list
+        of the names of the attributes encoded as bits, in the order of the
+        bits, values is a dictionary keyed by the name of each attribute
+        encoded as values with True as the value if the values of the
+        attribute are integers, masks is an array of the bitmask of each
+        node or edge, and arrays is a dictionary of the array of values of
+        each attribute encoded as values.
+
+    Raises
+    ------
+    ValueError
+        If an attribute has a value that is neither None nor a number.
+    """
+    flags = list()
+    values = dict()
+    for _attrs in attrs:
+        for (name, value) in _attrs.items():
+            if value is None:
+                if name not in flags:
+                    flags.append(name)
+            elif (isinstance(value, numbers.Real) and
+                    not isinstance(value, bool)):
+                is_integer = isinstance(value, numbers.Integral)
+                values[name] = values.get(name, True) and is_integer
+            else:
+                raise ValueError(
+                    'Unsupported value {0!r} of {1} attribute {2}.'.format(
+                        value, kind, name
+                    )
+                )
+    if set(flags) & set(values):
+        raise ValueError(
+            'Attributes of {0}s with and without values: {1}.'.format(
+                kind, ', '.join(sorted(set(flags) & set(values)))
+            )
+        )
+    if len(flags) > 64:
+        raise ValueError(
+            'More than 64 attributes of {0}s without values.'.format(kind)
+        )
+
+    bits = dict((name, 1 << bit) for (bit, name) in enumerate(flags))
+    masks = np.zeros(len(attrs), dtype=np.uint64)
+    arrays = dict(
+        (name, np.full(len(attrs), np.nan, dtype=np.float64))
+        for name in values
+    )
+    for (i, _attrs) in enumerate(attrs):
+        mask = 0
+        for (name, value) in _attrs.items():
+            if value is None:
+                mask |= bits[name]
+            else:
+                arrays[name][i] = value
+        masks[i] = mask
+
+    return (flags, values, masks, arrays)
+
+
+def decode_attributes(flags, values, masks, arrays):
+    """Decode the attributes of nodes or edges encoded by encode_attributes.
+
+    Parameters
+    ----------
+    flags : list
+        The names of the attributes encoded as bits, in the order of the
+        bits.
+    values : dict
+        A dictionary keyed by the name of each attribute encoded as values
+        with True as the value if the values of the attribute are integers.
+    masks : numpy.ndarray
+        The bitmask of each node or edge.
+    arrays : dict
+        The array of values of each attribute encoded as values.
+
+    Returns
+    -------
+    attrs : generator
+        A generator of a new dictionary of attributes for each node or edge.
+    """
+    values = [
+        (name, arrays[name].tolist(), is_integer)
+        for (name, is_integer) in values.items()
+    ]
+
+    # Names of the attributes set in each distinct bitmask
+    names = dict()
+    for (index, mask) in enumerate(masks.tolist()):
+        _flags = names.get(mask)
+        if _flags is None:
+            _flags = tuple(
+                name for (bit, name) in enumerate(flags) if mask & (1 << bit)
+            )
+            names[mask] = _flags
+
+        # A new dictionary for every node and edge since networkx stores the
+        #   dictionary itself
+        attrs = dict.fromkeys(_flags)
+        for (name, _values, is_integer) in values:
+            value = _values[index]
+            if value == value:
+                attrs[name] = int(value) if is_integer else value
+        yield attrs
+
+
+def _pad(file_):
+    """Pad a file with zeros to the alignment of the arrays in a snapshot."""
+    remainder = file_.tell() % ALIGNMENT
+    if remainder:
+        file_.write(bytes(ALIGNMENT - remainder))
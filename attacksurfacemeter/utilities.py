@@ -2,7 +2,7 @@ import copy
 import networkx as nx
 import warnings
 
-from attacksurfacemeter.call import Call
+from attacksurfacemeter.call import Call, DANGEROUS, INPUT, OUTPUT, STDLIB
 
 
 def fix(call_graph, using):
@@ -161,12 +161,13 @@ def get_node_attrs(source, caller, callee, defenses, vulnerabilities):
     if callee is not None:
         if 'gprof' in source:
             caller_attrs['tested'] = None
-        if callee.in_stdlib():
-            if callee.is_dangerous():
+        classification = callee.classification
+        if classification & STDLIB:
+            if classification & DANGEROUS:
                 caller_attrs['dangerous'] = None
-            if callee.is_input():
+            if classification & INPUT:
                 caller_attrs['entry'] = None
-            if callee.is_output():
+            if classification & OUTPUT:
                 caller_attrs['exit'] = None
         else:
             callee_attrs = dict()
@@ -184,6 +185,76 @@ def get_node_attrs(source, caller, callee, defenses, vulnerabilities):
     return attributes
 
 
+class NodeAttributeResolver():
+
+    """Derives the attributes of nodes for a loader.
+
+    The attributes that get_node_attrs derives for a caller and a callee
+    depend only on the names and signatures of the pair, so the resolver
+    derives them once per distinct pair. Since loaders add every occurrence
+    of a call to the call graph and the attributes are merged into those of
+    the node, adding the attributes of a pair again has no effect and is
+    avoided.
+
+    Pairs are distinguished by name and signature rather than by equality
+    since, at file granularity, calls to different functions are equal but
+    have different attributes.
+    """
+
+    def __init__(self, source, defenses, vulnerabilities):
+        """NodeAttributeResolver constructor.
+
+        Parameters
+        ----------
+        source : str
+            The name of the tool that generated the call graph being loaded.
+        defenses : list
+            A list of Call objects, each representing a designed defense in
+            the system.
+        vulnerabilities : list
+            A list of Call objects, each representing a vulnerable function in
+            the system.
+
+        Returns
+        -------
+        resolver : NodeAttributeResolver
+            An instance of NodeAttributeResolver.
+        """
+        self._source = source
+        self._defenses = frozenset(defenses)
+        self._vulnerabilities = frozenset(vulnerabilities)
+        self._resolved = set()
+
+    def get_node_attrs(self, caller, callee):
+        """Return node attributes for a pair not resolved before.
+
+        Parameters
+        ----------
+        caller : Call
+            An instance of Call representing the caller.
+        callee : Call
+            An instance of Call representing the callee, or None if the
+            attributes of the caller alone are required.
+
+        Returns
+        -------
+        attributes : tuple
+            The tuple returned by get_node_attrs, or None if the attributes of
+            the pair have been returned before.
+        """
+        pair = (caller.function_name, caller.function_signature)
+        if callee is not None:
+            pair += (callee.function_name, callee.function_signature)
+        if pair in self._resolved:
+            return None
+        self._resolved.add(pair)
+
+        return get_node_attrs(
+            self._source, caller, callee, self._defenses,
+            self._vulnerabilities
+        )
+
+
 def deprecation(function):
     """Mark a function as deprecated.
 
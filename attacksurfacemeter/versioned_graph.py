@@ -0,0 +1,81 @@
+import networkx as nx
+
+
+class VersionedDiGraph(nx.DiGraph):
+
+    """Represents a directed graph that counts the modifications made to it.
+
+    The version of the graph is incremented by every method that adds or
+    removes nodes or edges so that results derived from the graph can be
+    reused for as long as the version they were derived from is current.
+    Attributes modified in place, e.g. through graph.node[n] or
+    graph.edge[u][v], are not observed; touch must be called after such a
+    modification.
+    """
+
+    def __init__(self, data=None, **attr):
+        """VersionedDiGraph constructor.
+
+        Parameters
+        ----------
+        data : object, optional
+            Data to initialize the graph with. See networkx.DiGraph.
+        attr : keyword arguments, optional
+            Attributes to add to the graph as key=value pairs.
+
+        Returns
+        -------
+        graph : VersionedDiGraph
+            An instance of VersionedDiGraph.
+        """
+        self.version = 0
+        super(VersionedDiGraph, self).__init__(data, **attr)
+
+    def touch(self):
+        """Record a modification made to the graph.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.version += 1
+
+    def add_node(self, n, attr_dict=None, **attr):
+        super(VersionedDiGraph, self).add_node(n, attr_dict, **attr)
+        self.touch()
+
+    def add_nodes_from(self, nodes, **attr):
+        super(VersionedDiGraph, self).add_nodes_from(nodes, **attr)
+        self.touch()
+
+    def remove_node(self, n):
+        super(VersionedDiGraph, self).remove_node(n)
+        self.touch()
+
+    def remove_nodes_from(self, nbunch):
+        super(VersionedDiGraph, self).remove_nodes_from(nbunch)
+        self.touch()
+
+    def add_edge(self, u, v, attr_dict=None, **attr):
+        super(VersionedDiGraph, self).add_edge(u, v, attr_dict, **attr)
+        self.touch()
+
+    def add_edges_from(self, ebunch, attr_dict=None, **attr):
+        super(VersionedDiGraph, self).add_edges_from(ebunch, attr_dict, **attr)
+        self.touch()
+
+    def remove_edge(self, u, v):
+        super(VersionedDiGraph, self).remove_edge(u, v)
+        self.touch()
+
+    def remove_edges_from(self, ebunch):
+        super(VersionedDiGraph, self).remove_edges_from(ebunch)
+        self.touch()
+
+    def clear(self):
+        super(VersionedDiGraph, self).clear()
+        self.touch()
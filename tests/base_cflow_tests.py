@@ -426,6 +426,48 @@ class BaseCflowTests(object):
         # Assert
         self.assertEqual(expected, actual)
 
+    def test_get_proximities(self):
+        # Arrange
+        attributes = ['exit', 'entry', 'dangerous']
+        expected = {
+            attribute: {
+                n: self.target.get_shortest_path_length(n, attribute)
+                for (n, _) in self.target.nodes
+            }
+            for attribute in attributes
+        }
+        self.target.call_graph.touch()
+
+        # Act
+        proximities = self.target.get_proximities(attributes)
+        actual = {
+            attribute: {
+                n: proximities[attribute].get_lengths(n)
+                for (n, _) in self.target.nodes
+            }
+            for attribute in attributes
+        }
+
+        # Assert
+        self.assertCountEqual(attributes, proximities)
+        self.assertEqual(expected, actual)
+
+    def test_get_mean_lengths(self):
+        # Arrange
+        attributes = ['exit', 'entry', 'dangerous']
+        expected = {
+            attribute: self.target.get_proximity(attribute).get_mean()
+            for attribute in attributes
+        }
+        self.target.call_graph.touch()
+
+        # Act
+        actual = self.target.get_mean_lengths(attributes)
+
+        # Assert
+        self.assertEqual(expected, actual)
+        self.assertNotIn(('proximity', 'exit'), self.target._get_cache())
+
     def test_get_entry_surface_metrics(self):
         # Arrange
         points = [Call('greet_b', './src/helloworld.c', Environments.C)]
@@ -621,6 +663,28 @@ class BaseCflowTests(object):
         # Assert
         self.assertAlmostEqual(expected, actual)
 
+    def test_get_page_ranks(self):
+        # Arrange
+        configurations = [
+            {},
+            {'damping': 0.5},
+            {'entry': 1, 'exit': 100, 'other': 10},
+        ]
+        expected = [
+            self.target.get_page_rank(**configuration)
+            for configuration in configurations
+        ]
+
+        # Act
+        actual = self.target.get_page_ranks(configurations)
+
+        # Assert
+        self.assertEqual(len(expected), len(actual))
+        for (_expected, _actual) in zip(expected, actual):
+            self.assertEqual(len(_expected), len(_actual))
+            for i in _expected:
+                self.assertAlmostEqual(_expected[i], _actual[i], places=5)
+
     def test_assign_page_rank(self):
         # Arrange
         expected = {
@@ -1,9 +1,11 @@
 import os
+from unittest import mock
 
 from attacksurfacemeter.call import Call
 from attacksurfacemeter.call_graph import CallGraph
 from attacksurfacemeter.loaders.cflow_loader import CflowLoader
 from attacksurfacemeter.formatters.txt_formatter import TxtFormatter
+from attacksurfacemeter.proximity import Proximity
 
 
 class BaseFormatterTests(object):
@@ -22,6 +24,44 @@ class BaseFormatterTests(object):
         # Assert
         self.assertEqual(len(expected), len(actual))
 
+    def test_stream_output(self):
+        # Arrange
+        expected = self.formatter.write_output()
+
+        # Act
+        pieces = list(self.formatter.stream_output())
+        actual = ''.join(pieces)
+
+        # Assert
+        self.assertGreater(len(pieces), len(self.formatter.call_graph.nodes))
+        self.assertEqual(expected, actual)
+
+    def test_stream_output_without_degrees(self):
+        # Arrange
+        expected = self.formatter.write_output()
+
+        # Act
+        with mock.patch.object(
+                self.formatter.call_graph, 'get_degree',
+                side_effect=AssertionError):
+            actual = ''.join(self.formatter.stream_output())
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_stream_output_without_proximities(self):
+        # Arrange
+        expected = self.formatter.write_output()
+        self.formatter.call_graph.call_graph.touch()
+
+        # Act
+        with mock.patch.object(
+                Proximity, 'from_csr_graph', side_effect=AssertionError):
+            actual = ''.join(self.formatter.stream_output())
+
+        # Assert
+        self.assertEqual(expected, actual)
+
     def test_write_summary(self):
         # Arrange
         expected = None
@@ -229,6 +229,20 @@ class BaseGprofTests(object):
         # Assert
         self.assertEqual(expected, actual)
 
+    def test_get_fans(self):
+        # Arrange
+        expected = self.target.get_fan()
+
+        # Act
+        fans = self.target.get_fans()
+        actual = {
+            n: tuple(fans[i]) for (n, i) in self.target.csr_graph.index.items()
+        }
+
+        # Assert
+        self.assertEqual((len(expected), 2), fans.shape)
+        self.assertEqual(expected, actual)
+
     def test_get_descendants(self):
         # Arrange
         expected = [
@@ -0,0 +1,72 @@
+"""Stands in for cflow in the tests of the sharded generation of call graphs.
+
+The functions defined in, and the calls made from, the source files named on
+the command line are looked up in cflow.callgraph.txt, the call graph that
+cflow generated for all source files, and printed in the format of cflow -b.
+Every function is printed at the top level with the functions it calls (or,
+with -r, the functions that call it) beneath. A function that is not defined
+in the source files named is printed without a signature, as cflow would.
+"""
+import os
+import re
+import sys
+
+LINE = re.compile(r'^((?:    )*)(\w+)\(\)(?: <(.*? at (.*?):\d+)>)?')
+
+
+def load(path):
+    definitions = dict()
+    calls = dict()
+
+    parents = list()
+    with open(path) as file_:
+        for line in file_:
+            (indent, name, signature, source) = LINE.match(line).groups()
+            level = len(indent) // 4
+            del parents[level:]
+
+            if signature is not None:
+                definitions.setdefault(name, (signature, source))
+            calls.setdefault(name, list())
+            if parents and name not in calls[parents[-1]]:
+                calls[parents[-1]].append(name)
+            parents.append(name)
+
+    return (definitions, calls)
+
+
+def main(args):
+    is_reverse = '-r' in args
+    sources = [arg for arg in args if not arg.startswith('-')]
+
+    (definitions, calls) = load(
+        os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                     'cflow.callgraph.txt')
+    )
+
+    def is_defined(name):
+        return name in definitions and definitions[name][1] in sources
+
+    def format(name):
+        if is_defined(name):
+            return '{0}() <{1}>'.format(name, definitions[name][0])
+        return '{0}()'.format(name)
+
+    tree = dict()
+    for (caller, callees) in calls.items():
+        if is_defined(caller):
+            tree.setdefault(caller, list())
+            for callee in callees:
+                if is_reverse:
+                    tree.setdefault(callee, list()).append(caller)
+                else:
+                    tree[caller].append(callee)
+
+    for name in sorted(tree):
+        sys.stdout.write(format(name) + (':\n' if tree[name] else '\n'))
+        for child in tree[name]:
+            sys.stdout.write('    ' + format(child) + '\n')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,6 +1,9 @@
+import pickle
 import unittest
 
+from attacksurfacemeter import call
 from attacksurfacemeter.call import Call
+from attacksurfacemeter.environments import Environments as Env
 from attacksurfacemeter.granularity import Granularity
 
 
@@ -43,6 +46,24 @@ class CallTestCase(unittest.TestCase):
         # Assert
         self.assertEqual('./cyrus/lib/xmalloc.c', test_call.identity)
 
+    def test_identity_coarser_granularities(self):
+        # Arrange
+        test_calls = [
+            Call('', './cyrus/lib', Env.C, Granularity.DIRECTORY),
+            Call('', 'com.example.Greeter', Env.ANDROID, Granularity.CLASS),
+            Call('', 'com.example', Env.ANDROID, Granularity.PACKAGE),
+        ]
+
+        # Assert
+        self.assertEqual(
+            ['./cyrus/lib', 'com.example.Greeter', 'com.example'],
+            [test_call.identity for test_call in test_calls]
+        )
+        self.assertEqual(
+            ['./cyrus/lib', 'com.example.Greeter', 'com.example'],
+            [str(test_call) for test_call in test_calls]
+        )
+
     def test_function_name_only_name(self):
         # Arrange
         cflow_line = 'printf()'
@@ -157,6 +178,69 @@ class CallTestCase(unittest.TestCase):
         # Assert
         self.assertNotEqual(test_call_1, test_call_2)
 
+    def test_from_pool(self):
+        # Arrange
+        pool = dict()
+        (test_call_1, is_new_1) = Call.from_pool(
+            pool, 'getchar', '', Env.C
+        )
+
+        # Act
+        (test_call_2, is_new_2) = Call.from_pool(
+            pool, 'getchar', '', Env.C
+        )
+        (test_call_3, is_new_3) = Call.from_pool(
+            pool, 'getchar', '', Env.C, Granularity.FILE
+        )
+
+        # Assert
+        self.assertIs(test_call_1, test_call_2)
+        self.assertEqual((True, False, True), (is_new_1, is_new_2, is_new_3))
+        self.assertIsNot(test_call_1, test_call_3)
+        self.assertEqual(2, len(pool))
+
+    def test_from_cflow_level(self):
+        # Act
+        test_call_1 = Call.from_cflow('    getchar()')
+        test_call_2 = Call.from_cflow('        getchar()')
+
+        # Assert
+        self.assertIsNot(test_call_1, test_call_2)
+        self.assertEqual((1, 2), (test_call_1.level, test_call_2.level))
+
+    def test_classification(self):
+        # Arrange
+        test_call_1 = Call.from_cflow('getchar()')
+        test_call_2 = Call.from_cflow('chmod()')
+        test_call_3 = Call.from_cflow(
+            'xstrdup() <char *xstrdup (const char *str) at ./cyrus/lib/xmalloc'
+            '.c:89> (R):'
+        )
+
+        # Assert
+        self.assertEqual(call.STDLIB | call.INPUT, test_call_1.classification)
+        self.assertEqual(
+            call.STDLIB | call.DANGEROUS, test_call_2.classification
+        )
+        self.assertEqual(0, test_call_3.classification)
+
+    def test_pickle(self):
+        # Arrange
+        cflow_line = (
+            'xstrdup() <char *xstrdup (const char *str) at ./cyrus/lib/xmalloc'
+            '.c:89> (R):'
+        )
+        test_call = Call.from_cflow(cflow_line)
+
+        # Act
+        unpickled = pickle.loads(pickle.dumps(test_call))
+
+        # Assert
+        self.assertFalse(hasattr(test_call, '__dict__'))
+        self.assertEqual(test_call, unpickled)
+        self.assertEqual(hash(test_call), hash(unpickled))
+        self.assertEqual(0, unpickled.level)
+
     def test_in_stdlib(self):
         # Arrange
         cflow_line = 'printf()'
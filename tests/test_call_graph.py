@@ -212,6 +212,30 @@ class CallGraphTestCase(unittest.TestCase):
         for i in expected:
             self.assertEqual(expected[i], actual[i], msg=i)
 
+    def test_cache_w_modification(self):
+        # Arrange
+        target = CallGraph(
+            source='/tmp', graph=self._build_graph(), load_errors=list(),
+        )
+        nx.set_node_attributes(target.call_graph, 'entry', {'read': None})
+        target.call_graph.touch()
+        fan = target.get_fan('validate')
+        entry_points = target.entry_points
+        page_rank = target.get_page_rank()
+
+        # Act
+        target.call_graph.add_edge('write', 'validate', call=None)
+        target.call_graph.add_node('parse', entry=None)
+        target.assign_weights()
+
+        # Assert
+        self.assertEqual((1, 0), fan)
+        self.assertEqual((2, 0), target.get_fan('validate'))
+        self.assertEqual(['read'], entry_points)
+        self.assertCountEqual(['read', 'parse'], target.entry_points)
+        self.assertNotEqual(page_rank, target.get_page_rank())
+        self.assertIs(target.get_fan(), target.get_fan())
+
     def _build_graph(self):
         #######################################################################
         #
@@ -0,0 +1,296 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from attacksurfacemeter.call import Call
+from attacksurfacemeter.call_graph import CallGraph
+from attacksurfacemeter.call_graph_cache import CallGraphCache
+from attacksurfacemeter.environments import Environments as Env
+from attacksurfacemeter.granularity import Granularity as Gran
+from attacksurfacemeter.loaders.cflow_loader import CflowLoader
+from attacksurfacemeter.loaders.gprof_loader import GprofLoader
+from attacksurfacemeter.loaders.javacg_loader import JavaCGLoader
+
+
+class CallGraphCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = CallGraphCache(os.path.join(self.directory.name, 'cache'))
+        self.source = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'helloworld/cflow.callgraph.txt'
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _copy(self, name):
+        path = os.path.join(self.directory.name, name)
+        shutil.copyfile(self.source, path)
+        return path
+
+    def test_from_loader(self):
+        # Arrange
+        expected = CallGraph.from_loader(CflowLoader(self.source))
+        CallGraph.from_loader(CflowLoader(self.source), cache=self.cache)
+        test_loader = CflowLoader(self.source)
+
+        # Act
+        with mock.patch.object(
+                test_loader, 'load_call_graph', side_effect=AssertionError):
+            actual = CallGraph.from_loader(test_loader, cache=self.cache)
+
+        # Assert
+        self.assertEqual(1, len(os.listdir(self.cache.directory)))
+        self.assertEqual(self.source, actual.source)
+        self.assertEqual(expected.load_errors, actual.load_errors)
+        self.assertEqual(
+            sorted(expected.nodes, key=_get_node_key),
+            sorted(actual.nodes, key=_get_node_key)
+        )
+        self.assertEqual(
+            sorted(expected.edges, key=_get_edge_key),
+            sorted(actual.edges, key=_get_edge_key)
+        )
+
+    def test_from_loader_fragmentize(self):
+        # Arrange
+        source = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'helloworld/gprof.callgraph.txt'
+        )
+        expected = CallGraph.from_loader(GprofLoader(source), True)
+        CallGraph.from_loader(GprofLoader(source), cache=self.cache)
+
+        # Act
+        actual = CallGraph.from_loader(
+            GprofLoader(source), True, cache=self.cache
+        )
+
+        # Assert
+        self.assertEqual(expected.num_fragments, actual.num_fragments)
+        self.assertEqual(expected.monolithicity, actual.monolithicity)
+        self.assertEqual(
+            sorted(expected.nodes, key=_get_node_key),
+            sorted(actual.nodes, key=_get_node_key)
+        )
+
+    def test_from_loader_add_fails(self):
+        # Arrange
+        expected = CallGraph.from_loader(CflowLoader(self.source), True)
+
+        for error in (OSError, ValueError):
+            # Act
+            with mock.patch.object(self.cache, 'add', side_effect=error):
+                actual = CallGraph.from_loader(
+                    CflowLoader(self.source), True, cache=self.cache
+                )
+
+            # Assert
+            self.assertEqual(expected.num_fragments, actual.num_fragments)
+            self.assertEqual(
+                sorted(expected.nodes, key=_get_node_key),
+                sorted(actual.nodes, key=_get_node_key)
+            )
+
+    def test_from_loader_fragmentize_cached_whole(self):
+        # Arrange
+        source = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'helloworld/gprof.callgraph.txt'
+        )
+        expected = CallGraph.from_loader(GprofLoader(source))
+
+        # Act
+        CallGraph.from_loader(GprofLoader(source), True, cache=self.cache)
+        actual = CallGraph.from_snapshot(
+            self.cache.get_path(GprofLoader(source), Gran.FUNC)
+        )
+
+        # Assert
+        self.assertEqual(
+            sorted(expected.nodes, key=_get_node_key),
+            sorted(actual.nodes, key=_get_node_key)
+        )
+
+    def test_from_loader_no_app_packages(self):
+        # Arrange
+        source = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'helloworld/javacg.callgraph.txt'
+        )
+        expected = CallGraph.from_loader(JavaCGLoader(source, None))
+
+        # Act
+        CallGraph.from_loader(JavaCGLoader(source, None), cache=self.cache)
+        actual = CallGraph.from_snapshot(
+            self.cache.get_path(JavaCGLoader(source, None), Gran.FUNC)
+        )
+
+        # Assert
+        self.assertEqual(
+            self.cache.get_path(JavaCGLoader(source, None), Gran.FUNC),
+            self.cache.get_path(JavaCGLoader(source, []), Gran.FUNC)
+        )
+        self.assertEqual(
+            sorted(expected.nodes, key=_get_node_key),
+            sorted(actual.nodes, key=_get_node_key)
+        )
+
+    def test_get_path(self):
+        # Arrange
+        javacg = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'helloworld/javacg.callgraph.txt'
+        )
+        copy = self._copy('copy.txt')
+        path = self.cache.get_path(CflowLoader(self.source), Gran.FUNC)
+
+        # Act
+        paths = [
+            self.cache.get_path(CflowLoader(self.source), Gran.FILE),
+            self.cache.get_path(CflowLoader(self.source, True), Gran.FUNC),
+            self.cache.get_path(
+                CflowLoader(
+                    self.source,
+                    defenses=[Call('main', './src/helloworld.c', Env.C)]
+                ),
+                Gran.FUNC
+            ),
+            self.cache.get_path(GprofLoader(self.source), Gran.FUNC),
+            self.cache.get_path(JavaCGLoader(javacg, ['com']), Gran.FUNC),
+            self.cache.get_path(JavaCGLoader(javacg, ['org']), Gran.FUNC),
+        ]
+
+        # Assert
+        self.assertEqual(
+            path, self.cache.get_path(CflowLoader(self.source), Gran.FUNC)
+        )
+        self.assertEqual(
+            path, self.cache.get_path(CflowLoader(copy), Gran.FUNC)
+        )
+        self.assertEqual(len(paths) + 1, len(set(paths + [path])))
+
+    def test_get_path_content(self):
+        # Arrange
+        copy = self._copy('copy.txt')
+        path = self.cache.get_path(CflowLoader(copy), Gran.FUNC)
+
+        # Act
+        with open(copy, 'a') as file_:
+            file_.write('exit()\n')
+
+        # Assert
+        self.assertNotEqual(
+            path, self.cache.get_path(CflowLoader(copy), Gran.FUNC)
+        )
+
+    def test_get_path_stat(self):
+        # Arrange
+        cache = CallGraphCache(self.cache.directory, content=False)
+        copy = self._copy('copy.txt')
+        path = cache.get_path(CflowLoader(copy), Gran.FUNC)
+
+        # Act
+        stat = os.stat(copy)
+        os.utime(copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        # Assert
+        self.assertNotEqual(path, cache.get_path(CflowLoader(copy), Gran.FUNC))
+        self.assertNotEqual(
+            cache.get_path(CflowLoader(self._copy('other.txt')), Gran.FUNC),
+            cache.get_path(CflowLoader(copy), Gran.FUNC)
+        )
+
+    def test_get_path_directory(self):
+        # Arrange
+        source = os.path.join(self.directory.name, 'src')
+        os.makedirs(os.path.join(source, 'lib'))
+        for name in ('main.c', 'lib/greet.h'):
+            with open(os.path.join(source, name), 'w') as file_:
+                file_.write('int main(void);\n')
+        path = self.cache.get_path(CflowLoader(source), Gran.FUNC)
+
+        # Act
+        os.makedirs(os.path.join(source, '.git'))
+        os.makedirs(os.path.join(source, 'tests'))
+        for name in ('main.o', '.git/index', 'tests/test.c'):
+            with open(os.path.join(source, name), 'w') as file_:
+                file_.write('built\n')
+        unchanged = self.cache.get_path(CflowLoader(source), Gran.FUNC)
+        with open(os.path.join(source, 'lib/greet.h'), 'a') as file_:
+            file_.write('void greet(void);\n')
+        changed = self.cache.get_path(CflowLoader(source), Gran.FUNC)
+
+        # Assert
+        self.assertEqual(path, unchanged)
+        self.assertNotEqual(path, changed)
+
+    def test_add_evict(self):
+        # Arrange
+        (first, second, third) = [
+            self._copy('{0}.txt'.format(name))
+            for name in ('first', 'second', 'third')
+        ]
+        for (source, append) in ((first, 'a'), (second, 'b'), (third, 'c')):
+            with open(source, 'a') as file_:
+                file_.write('{0}()\n'.format(append))
+
+        CallGraph.from_loader(CflowLoader(first), cache=self.cache)
+        size = os.path.getsize(
+            self.cache.get_path(CflowLoader(first), Gran.FUNC)
+        )
+        self.cache.max_size = 2 * size
+
+        _set_mtime(self.cache.get_path(CflowLoader(first), Gran.FUNC), -20)
+        CallGraph.from_loader(CflowLoader(second), cache=self.cache)
+        _set_mtime(self.cache.get_path(CflowLoader(second), Gran.FUNC), -10)
+
+        # Using the first call graph makes the second the least recently used
+        CallGraph.from_loader(CflowLoader(first), cache=self.cache)
+
+        # Act
+        CallGraph.from_loader(CflowLoader(third), cache=self.cache)
+
+        # Assert
+        for (source, is_cached) in ((first, True), (second, False),
+                                    (third, True)):
+            path = self.cache.get_path(CflowLoader(source), Gran.FUNC)
+            self.assertEqual(is_cached, os.path.exists(path))
+
+    def test_from_loader_invalid(self):
+        # Arrange
+        path = self.cache.get_path(CflowLoader(self.source), Gran.FUNC)
+        with open(path, 'wb') as file_:
+            file_.write(b'invalid')
+
+        # Act
+        actual = CallGraph.from_loader(
+            CflowLoader(self.source), cache=self.cache
+        )
+
+        # Assert
+        self.assertEqual(11, len(actual.nodes))
+        self.assertEqual(
+            actual.nodes, CallGraph.from_snapshot(path).nodes
+        )
+
+
+def _set_mtime(path, seconds):
+    mtime = time.time() + seconds
+    os.utime(path, (mtime, mtime))
+
+
+def _get_node_key(node):
+    return node[0].identity
+
+
+def _get_edge_key(edge):
+    return (edge[0].identity, edge[1].identity)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 __author__ = 'kevin'
 
 import unittest
+from attacksurfacemeter.loaders import cflow_line_parser
 from attacksurfacemeter.loaders.cflow_line_parser import CflowLineParser
 
 
@@ -119,6 +120,30 @@ class CflowLineParserTestCase(unittest.TestCase):
         # Assert
         self.assertEqual("./libavfilter/vf_mp.c", test_function_signature)
 
+    def test_parse(self):
+        # Arrange
+        line = (
+            "        GreeterSayHi() <void GreeterSayHi () at "
+            "./src/helloworld.c:48>:"
+        )
+
+        # Act
+        parsed = cflow_line_parser.parse(line)
+
+        # Assert
+        self.assertEqual((2, "GreeterSayHi", "./src/helloworld.c"), parsed)
+
+    def test_parse_name_only(self):
+        # Act
+        parsed = cflow_line_parser.parse("            printf()")
+
+        # Assert
+        self.assertEqual((3, "printf", ""), parsed)
+
+    def test_parse_invalid(self):
+        # Assert
+        self.assertRaises(ValueError, cflow_line_parser.parse, "    ")
+
 
 if __name__ == '__main__':
     unittest.main()
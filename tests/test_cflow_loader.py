@@ -1,11 +1,16 @@
+import gzip
 import os
+import sys
+import tempfile
 import unittest
+from unittest import mock
 
 import networkx as nx
 
 from attacksurfacemeter.call import Call
 from attacksurfacemeter.environments import Environments as Env
 from attacksurfacemeter.granularity import Granularity as Gran
+from attacksurfacemeter.loaders import cflow_loader
 from attacksurfacemeter.loaders.cflow_loader import CflowLoader
 
 
@@ -26,6 +31,155 @@ class CflowLoaderTestCase(unittest.TestCase):
         # Assert
         self.assertEqual(0, len(self.test_loader.errors))
 
+    def test_load_call_graph_in_parallel(self):
+        # Arrange
+        source = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'helloworld/cflow.callgraph.r.txt'
+        )
+        expected = CflowLoader(source, True).load_call_graph()
+
+        # Act
+        with mock.patch.object(cflow_loader, 'CHUNK_SIZE', 64):
+            test_loader = CflowLoader(source, True, processes=2)
+            chunks = test_loader._get_chunks()
+            test_graph = test_loader.load_call_graph()
+
+        # Assert
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(0, chunks[0][1])
+        self.assertEqual(os.path.getsize(source), chunks[-1][2])
+        self.assertEqual(
+            list(expected.nodes(data=True)), list(test_graph.nodes(data=True))
+        )
+        self.assertEqual(
+            list(expected.edges(data=True)), list(test_graph.edges(data=True))
+        )
+
+    def test_load_call_graph_in_shards(self):
+        # Arrange
+        directory = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), 'helloworld'
+        )
+        command = [sys.executable, os.path.join(directory, 'cflow.py')]
+        expected = CflowLoader(
+            os.path.join(directory, 'cflow.callgraph.txt')
+        ).load_call_graph()
+
+        # Act
+        with mock.patch.object(cflow_loader, 'CFLOW', command):
+            test_loader = CflowLoader(directory, processes=2, shards=2)
+            shards = test_loader._get_shards()
+            test_graph = test_loader.load_call_graph()
+
+        # Assert
+        self.assertEqual(2, len(shards))
+        self.assertEqual(
+            ['./src/greetings.c', './src/greetings.h', './src/helloworld.c'],
+            sorted(f for (_, _, files, _) in shards for f in files)
+        )
+        self.assertEqual(
+            sorted(expected.nodes(data=True), key=_get_node_key),
+            sorted(test_graph.nodes(data=True), key=_get_node_key)
+        )
+        self.assertEqual(
+            sorted(expected.edges(data=True), key=_get_edge_key),
+            sorted(test_graph.edges(data=True), key=_get_edge_key)
+        )
+
+    def test_load_call_graph_in_shards_reverse(self):
+        # Arrange
+        directory = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), 'helloworld'
+        )
+        command = [sys.executable, os.path.join(directory, 'cflow.py')]
+        expected = CflowLoader(
+            os.path.join(directory, 'cflow.callgraph.r.txt'), True
+        ).load_call_graph()
+
+        # Act
+        with mock.patch.object(cflow_loader, 'CFLOW', command):
+            test_graph = CflowLoader(
+                directory, True, processes=2, shards=2
+            ).load_call_graph()
+
+        # Assert
+        self.assertEqual(
+            sorted(expected.nodes(data=True), key=_get_node_key),
+            sorted(test_graph.nodes(data=True), key=_get_node_key)
+        )
+        self.assertEqual(
+            sorted(expected.edges(data=True), key=_get_edge_key),
+            sorted(test_graph.edges(data=True), key=_get_edge_key)
+        )
+
+    def test_load_call_graph_in_shards_reachable(self):
+        # Arrange
+        directory = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), 'helloworld'
+        )
+        command = [
+            sys.executable, '-c',
+            'print("main() <int main (void) at ./src/helloworld.c:58>:\\n'
+            '    greet() <void greet (int i) at ./src/greetings.c:14>\\n'
+            'unused() <void unused (void) at ./src/greetings.c:40>:\\n'
+            '    puts()")'
+        ]
+
+        # Act
+        with mock.patch.object(cflow_loader, 'CFLOW', command):
+            test_loader = CflowLoader(directory, processes=2, shards=2)
+            test_graph = test_loader.load_call_graph()
+
+        # Assert
+        self.assertEqual(
+            ['greet', 'main'],
+            sorted(node.function_name for node in test_graph.nodes())
+        )
+        self.assertEqual(list(), test_loader.errors)
+
+    def test_load_call_graph_in_shards_errors(self):
+        # Arrange
+        directory = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), 'helloworld'
+        )
+        command = [sys.executable, '-c', 'import sys; sys.exit(2)']
+
+        # Act
+        with mock.patch.object(cflow_loader, 'CFLOW', command):
+            test_loader = CflowLoader(directory, processes=2, shards=2)
+            test_graph = test_loader.load_call_graph()
+
+        # Assert
+        self.assertEqual(0, len(test_graph))
+        self.assertEqual(2, len(test_loader.errors))
+        for error in test_loader.errors:
+            self.assertTrue(
+                error.startswith('Error: cflow exited with status 2')
+            )
+
+    def test_lines_per_second(self):
+        # Arrange
+        self.assertEqual(0.0, self.test_loader.lines_per_second)
+
+        # Act
+        test_graph = self.test_loader.load_call_graph()
+
+        # Assert
+        self.assertTrue(self.test_loader.lines_per_second > 0)
+
+    def test_load_call_graph_interned(self):
+        # Arrange
+        test_graph = self.test_loader.load_call_graph()
+
+        # Act
+        nodes = dict((n, n) for n in test_graph.nodes())
+
+        # Assert
+        for (caller, callee) in test_graph.edges():
+            self.assertIs(nodes[caller], caller)
+            self.assertIs(nodes[callee], callee)
+
     def test_load_call_graph_nodes(self):
         # Arrange
         expected = [
@@ -327,5 +481,40 @@ class CflowLoaderTestCase(unittest.TestCase):
         for (u, v) in call_edges:
             self.assertTrue('return' in test_graph[v][u])
 
+    def test_load_call_graph_compressed(self):
+        # Arrange
+        expected = self.test_loader.load_call_graph()
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'cflow.callgraph.txt.gz')
+            with open(self.test_loader.source, 'rb') as file_:
+                with gzip.open(source, 'wb') as compressed:
+                    compressed.write(file_.read())
+
+            # Act
+            test_loader = CflowLoader(source, processes=2)
+            chunks = test_loader._get_chunks()
+            test_graph = test_loader.load_call_graph()
+
+        # Assert
+        self.assertEqual([], chunks)
+        self.assertEqual(
+            sorted(expected.nodes(data=True), key=_get_node_key),
+            sorted(test_graph.nodes(data=True), key=_get_node_key)
+        )
+        self.assertEqual(
+            sorted(expected.edges(data=True), key=_get_edge_key),
+            sorted(test_graph.edges(data=True), key=_get_edge_key)
+        )
+
+
+def _get_node_key(node):
+    return node[0].identity
+
+
+def _get_edge_key(edge):
+    return (edge[0].identity, edge[1].identity)
+
+
 if __name__ == '__main__':
     unittest.main()
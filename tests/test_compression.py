@@ -0,0 +1,72 @@
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+
+from attacksurfacemeter.loaders import compression
+
+
+class CompressionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'helloworld/cflow.callgraph.txt'
+        )
+        with open(self.source, 'rb') as file_:
+            self.content = file_.read()
+
+        self.paths = list()
+        for (module, name) in ((gzip, 'a.gz'), (bz2, 'b.bz2'), (lzma, 'c')):
+            path = os.path.join(self.directory.name, name)
+            with module.open(path, 'wb') as file_:
+                file_.write(self.content)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_is_compressed(self):
+        # Act & Assert
+        self.assertFalse(compression.is_compressed(self.source))
+        for path in self.paths:
+            self.assertTrue(compression.is_compressed(path))
+
+    def test_open(self):
+        # Arrange
+        with open(self.source) as file_:
+            expected = file_.readlines()
+
+        # Act & Assert
+        for path in [self.source] + self.paths:
+            with compression.open(path) as file_:
+                self.assertEqual(expected, file_.readlines())
+
+    def test_open_binary(self):
+        # Act & Assert
+        for path in [self.source] + self.paths:
+            with compression.open(path, 'rb') as file_:
+                self.assertEqual(self.content, file_.read())
+
+    def test_open_empty(self):
+        # Arrange
+        path = os.path.join(self.directory.name, 'empty')
+        open(path, 'wb').close()
+
+        # Act
+        with compression.open(path, 'rb') as file_:
+            content = file_.read()
+
+        # Assert
+        self.assertFalse(compression.is_compressed(path))
+        self.assertEqual(b'', content)
+
+    def test_open_invalid_mode(self):
+        # Act & Assert
+        self.assertRaises(ValueError, compression.open, self.source, 'w')
+
+
+if __name__ == '__main__':
+    unittest.main()
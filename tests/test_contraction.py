@@ -0,0 +1,212 @@
+import os
+import unittest
+
+from attacksurfacemeter import contraction
+from attacksurfacemeter.call import Call
+from attacksurfacemeter.call_graph import CallGraph
+from attacksurfacemeter.environments import Environments as Env
+from attacksurfacemeter.granularity import Granularity as Gran
+from attacksurfacemeter.loaders.cflow_loader import CflowLoader
+from attacksurfacemeter.loaders.gprof_loader import GprofLoader
+from attacksurfacemeter.loaders.javacg_loader import JavaCGLoader
+from attacksurfacemeter.versioned_graph import VersionedDiGraph
+
+
+class ContractionTestCase(unittest.TestCase):
+    def _get_path(self, name):
+        return os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), 'helloworld', name
+        )
+
+    def _assert_equal(self, expected, actual):
+        self.assertEqual(
+            sorted(
+                (node.identity, sorted(attrs.items()))
+                for (node, attrs) in expected.nodes
+            ),
+            sorted(
+                (node.identity, sorted(attrs.items()))
+                for (node, attrs) in actual.nodes
+            )
+        )
+        self.assertEqual(
+            sorted(
+                (caller.identity, callee.identity, sorted(attrs.items()))
+                for (caller, callee, attrs) in expected.edges
+            ),
+            sorted(
+                (caller.identity, callee.identity, sorted(attrs.items()))
+                for (caller, callee, attrs) in actual.edges
+            )
+        )
+
+    def test_contract_file(self):
+        # Arrange
+        loaders = [
+            lambda: CflowLoader(self._get_path('cflow.callgraph.txt')),
+            lambda: CflowLoader(self._get_path('cflow.callgraph.r.txt'), True),
+            lambda: GprofLoader(self._get_path('gprof.callgraph.txt')),
+            lambda: JavaCGLoader(
+                self._get_path('javacg.callgraph.txt'),
+                ['com.example.kevin.helloandroid']
+            ),
+        ]
+
+        for get_loader in loaders:
+            expected = CallGraph.from_loader(
+                get_loader(), granularity=Gran.FILE
+            )
+            call_graph = CallGraph.from_loader(get_loader())
+
+            # Act
+            actual = call_graph.contract(Gran.FILE)
+
+            # Assert
+            self.assertEqual(Gran.FILE, actual.granularity)
+            self.assertEqual(call_graph.source, actual.source)
+            self._assert_equal(expected, actual)
+
+    def test_contract_directory(self):
+        # Arrange
+        call_graph = CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        )
+        expected = Call('', './src', Env.C, Gran.DIRECTORY)
+
+        # Act
+        actual = call_graph.contract(Gran.DIRECTORY)
+
+        # Assert
+        self.assertEqual(
+            [(expected, {'entry': None, 'exit': None, 'frequency': 1})],
+            actual.nodes
+        )
+        self.assertEqual(
+            [(expected, expected,
+              {'cflow': None, 'call': None, 'return': None})],
+            actual.edges
+        )
+
+    def test_contract_class(self):
+        # Arrange
+        call_graph = CallGraph.from_loader(
+            JavaCGLoader(
+                self._get_path('javacg.callgraph.txt'),
+                ['com.example.kevin.helloandroid']
+            )
+        )
+        expected = set(node.class_name for (node, _) in call_graph.nodes)
+
+        # Act
+        actual = call_graph.contract(Gran.CLASS)
+
+        # Assert
+        self.assertEqual(
+            expected, set(str(node) for (node, _) in actual.nodes)
+        )
+        for (node, _) in actual.nodes:
+            self.assertEqual(Gran.CLASS, node.granularity)
+            self.assertEqual(node.function_signature, node.class_name)
+            self.assertTrue(node.class_name.startswith(node.package_name))
+
+    def test_contract_package(self):
+        # Arrange
+        call_graph = CallGraph.from_loader(
+            JavaCGLoader(
+                self._get_path('javacg.callgraph.txt'),
+                ['com.example.kevin.helloandroid']
+            )
+        )
+        expected = set(
+            (caller.package_name, callee.package_name)
+            for (caller, callee, _) in call_graph.edges
+        )
+        package = Call(
+            '', 'com.example.kevin.helloandroid', Env.ANDROID, Gran.PACKAGE
+        )
+
+        # Act
+        actual = call_graph.contract(Gran.PACKAGE)
+
+        # Assert
+        self.assertEqual(
+            expected,
+            set(
+                (caller.identity, callee.identity)
+                for (caller, callee, _) in actual.edges
+            )
+        )
+        self.assertEqual(
+            set(
+                name for (node, attrs) in call_graph.nodes
+                if node.package_name == package.identity
+                for name in attrs if attrs[name] is None
+            ),
+            set(
+                name for (name, value)
+                in actual.call_graph.node[package].items() if value is None
+            )
+        )
+
+    def test_contract_values(self):
+        # Arrange
+        (a, b, c) = [
+            Call(name, './src/{0}.c'.format(signature), Env.C)
+            for (name, signature) in (('a', 'x'), ('b', 'x'), ('c', 'y'))
+        ]
+        graph = VersionedDiGraph()
+        graph.add_node(a, tested=None, frequency=2)
+        graph.add_node(b, defense=None, frequency=5)
+        graph.add_node(c)
+        graph.add_edge(a, c, call=None, weight=3)
+        graph.add_edge(b, c, **{'return': None, 'weight': 1})
+
+        # Act
+        actual = contraction.contract(graph, Gran.FILE)
+
+        # Assert
+        x = Call('', './src/x.c', Env.C, Gran.FILE)
+        y = Call('', './src/y.c', Env.C, Gran.FILE)
+        self.assertEqual(
+            {'tested': None, 'defense': None, 'frequency': 5}, actual.node[x]
+        )
+        self.assertEqual(dict(), actual.node[y])
+        self.assertEqual(
+            {'call': None, 'return': None, 'weight': 3}, actual.edge[x][y]
+        )
+        self.assertIsInstance(actual.edge[x][y]['weight'], int)
+
+    def test_contract_empty(self):
+        # Act
+        actual = contraction.contract(VersionedDiGraph(), Gran.FILE)
+
+        # Assert
+        self.assertEqual(0, len(actual))
+
+    def test_contract_unsupported(self):
+        # Arrange
+        call_graph = CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        )
+        file_call_graph = CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt')),
+            granularity=Gran.FILE
+        )
+        java_call_graph = CallGraph.from_loader(
+            JavaCGLoader(
+                self._get_path('javacg.callgraph.txt'),
+                ['com.example.kevin.helloandroid']
+            )
+        )
+
+        # Act & Assert
+        self.assertRaises(ValueError, call_graph.contract, Gran.FUNC)
+        self.assertRaises(ValueError, call_graph.contract, Gran.CLASS)
+        self.assertRaises(ValueError, file_call_graph.contract, Gran.DIRECTORY)
+        self.assertRaises(
+            ValueError, java_call_graph.contract, Gran.DIRECTORY
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+
+import networkx as nx
+
+from attacksurfacemeter import csr_graph
+from attacksurfacemeter.csr_graph import CsrGraph
+
+
+class CsrGraphTestCase(unittest.TestCase):
+    def setUp(self):
+        #   a -> b -> c    d
+        #   ^    |
+        #   +----+
+        self.graph = nx.DiGraph()
+        self.graph.add_nodes_from(['a', 'b', 'c', 'd'])
+        self.graph.add_edges_from([
+            ('a', 'b', {'cflow': None, 'call': None}),
+            ('b', 'a', {'cflow': None, 'return': None, 'weight': 25}),
+            ('b', 'c', {'gprof': None, 'call': None}),
+        ])
+
+    def test_from_graph(self):
+        # Arrange
+        expected = {
+            ('a', 'b'): (csr_graph.CFLOW | csr_graph.CALL, 1),
+            ('b', 'a'): (csr_graph.CFLOW | csr_graph.RETURN, 25),
+            ('b', 'c'): (csr_graph.GPROF | csr_graph.CALL, 1),
+        }
+
+        # Act
+        target = CsrGraph.from_graph(self.graph)
+        actual = {
+            (target.nodes[i], target.nodes[j]): (int(flag), weight)
+            for (i, j, flag, weight) in zip(
+                target.sources, target.indices, target.flags, target.weights
+            )
+        }
+
+        # Assert
+        self.assertEqual(4, len(target))
+        self.assertEqual(len(expected), len(target.indices))
+        self.assertEqual(expected, actual)
+
+    def test_transpose(self):
+        # Arrange
+        expected = [('b', 'a'), ('a', 'b'), ('c', 'b')]
+
+        # Act
+        target = CsrGraph.from_graph(self.graph).transpose()
+        actual = [
+            (target.nodes[i], target.nodes[j])
+            for (i, j) in zip(target.sources, target.indices)
+        ]
+
+        # Assert
+        self.assertCountEqual(expected, actual)
+
+    def test_get_mask(self):
+        # Arrange
+        expected = [('a', 'b'), ('b', 'c')]
+        target = CsrGraph.from_graph(self.graph)
+
+        # Act
+        mask = target.get_mask(csr_graph.CALL)
+        actual = [
+            (target.nodes[i], target.nodes[j])
+            for (i, j) in zip(target.sources[mask], target.indices[mask])
+        ]
+
+        # Assert
+        self.assertCountEqual(expected, actual)
+
+    def test_get_degrees(self):
+        # Arrange
+        expected = {
+            None: {'a': (1, 1), 'b': (1, 2), 'c': (1, 0), 'd': (0, 0)},
+            csr_graph.CALL: {
+                'a': (0, 1), 'b': (1, 1), 'c': (1, 0), 'd': (0, 0)
+            }
+        }
+        target = CsrGraph.from_graph(self.graph)
+
+        for (flag, degrees) in expected.items():
+            # Act
+            (in_degrees, out_degrees) = target.get_degrees(flag)
+            actual = {
+                n: (in_degrees[i], out_degrees[i])
+                for (n, i) in target.index.items()
+            }
+
+            # Assert
+            self.assertEqual(degrees, actual)
+
+    def test_get_distances(self):
+        # Arrange
+        expected = {'a': 1, 'b': 0, 'c': 1, 'd': csr_graph.UNREACHABLE}
+        target = CsrGraph.from_graph(self.graph)
+
+        # Act
+        distances = target.get_distances(target.index['b'])
+        actual = {n: int(distances[target.index[n]]) for n in expected}
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
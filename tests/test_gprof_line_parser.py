@@ -1,4 +1,5 @@
 import unittest
+from attacksurfacemeter.loaders import gprof_line_parser
 from attacksurfacemeter.loaders.gprof_line_parser import GprofLineParser
 
 
@@ -191,5 +192,40 @@ class GprofLineParserTestCase(unittest.TestCase):
         # Assert
         self.assertEqual(expected, actual)
 
+    def test_parse_bytes(self):
+        # Arrange
+        lines = [
+            b'[4]      0.0    0.00    0.00       2         greet '
+            b'(greetings.c:38 @ 581033) [4]\n',
+            b'                0.00    0.00 11361600/11361600     '
+            b'ff_h264_decode_mb_cabac (./libavcodec/h264_cabac.c:'
+            b'2141 @ cfeb13) [6]\n',
+            b'                0.00    0.00       1/1           _init [1]\n'
+        ]
+        expected = [
+            ('greet', 'greetings.c'),
+            ('ff_h264_decode_mb_cabac', './libavcodec/h264_cabac.c'),
+            ('_init', '')
+        ]
+
+        # Act
+        actual = [gprof_line_parser.parse_bytes(line) for line in lines]
+
+        # Assert
+        self.assertEqual(expected, actual)
+        for line in lines:
+            target = GprofLineParser.get_instance(line.decode())
+            self.assertEqual(
+                (target.get_function_name(), target.get_function_signature()),
+                gprof_line_parser.parse_bytes(line)
+            )
+
+    def test_parse_bytes_invalid(self):
+        # Assert
+        self.assertRaises(
+            ValueError, gprof_line_parser.parse_bytes,
+            b' ' * 49 + b'<spontaneous>\n'
+        )
+
 if __name__ == '__main__':
     unittest.main()
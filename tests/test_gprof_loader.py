@@ -1,4 +1,6 @@
+import lzma
 import os
+import tempfile
 import unittest
 
 import networkx as nx
@@ -290,5 +292,80 @@ class GprofLoaderTestCase(unittest.TestCase):
         for (u, v) in nx.get_edge_attributes(graph, 'call'):
             self.assertTrue('return' in graph[v][u])
 
+    def test_load_call_graph_compressed(self):
+        # Arrange
+        expected = self.target.load_call_graph()
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'gprof.callgraph.txt.xz')
+            with open(self.target.source, 'rb') as file_:
+                with lzma.open(source, 'wb') as compressed:
+                    compressed.write(file_.read())
+
+            # Act
+            test_loader = GprofLoader(source)
+            test_graph = test_loader.load_call_graph()
+
+        # Assert
+        self.assertEqual(self.target.errors, test_loader.errors)
+        self.assertEqual(
+            sorted((n.identity, a) for (n, a) in expected.nodes(data=True)),
+            sorted((n.identity, a) for (n, a) in test_graph.nodes(data=True))
+        )
+        self.assertEqual(
+            sorted(
+                (u.identity, v.identity, a)
+                for (u, v, a) in expected.edges(data=True)
+            ),
+            sorted(
+                (u.identity, v.identity, a)
+                for (u, v, a) in test_graph.edges(data=True)
+            )
+        )
+
+    def test_load_call_graph_crlf(self):
+        # Arrange
+        expected = self.target.load_call_graph()
+        with open(self.target.source, 'rb') as file_:
+            content = file_.read().replace(b'\n', b'\r\n')
+
+        with tempfile.TemporaryDirectory() as directory:
+            sources = [
+                os.path.join(directory, 'gprof.callgraph.txt'),
+                os.path.join(directory, 'gprof.callgraph.txt.xz'),
+            ]
+            with open(sources[0], 'wb') as file_:
+                file_.write(content)
+            with lzma.open(sources[1], 'wb') as compressed:
+                compressed.write(content)
+
+            for source in sources:
+                # Act
+                test_loader = GprofLoader(source)
+                test_graph = test_loader.load_call_graph()
+
+                # Assert
+                self.assertEqual(self.target.errors, test_loader.errors)
+                self.assertEqual(
+                    sorted(
+                        (n.identity, a) for (n, a) in expected.nodes(data=True)
+                    ),
+                    sorted(
+                        (n.identity, a)
+                        for (n, a) in test_graph.nodes(data=True)
+                    )
+                )
+                self.assertEqual(
+                    sorted(
+                        (u.identity, v.identity, a)
+                        for (u, v, a) in expected.edges(data=True)
+                    ),
+                    sorted(
+                        (u.identity, v.identity, a)
+                        for (u, v, a) in test_graph.edges(data=True)
+                    )
+                )
+
+
 if __name__ == '__main__':
     unittest.main()
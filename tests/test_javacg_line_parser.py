@@ -1,5 +1,6 @@
 import unittest
 
+from attacksurfacemeter.loaders import javacg_line_parser
 from attacksurfacemeter.loaders.javacg_line_parser import JavaCGLineParser
 
 
@@ -54,6 +55,36 @@ class JavaCGLineParserTestCase(unittest.TestCase):
         # Assert
         self.assertEqual('java.lang.StringBuilder', test_function_signature)
 
+    def test_parse(self):
+        # Act
+        caller = javacg_line_parser.parse(
+            'M:com.example.kevin.helloandroid.Greeter:sayHello'
+        )
+        callee = javacg_line_parser.parse(
+            '(M)java.lang.StringBuilder:append\n'
+        )
+
+        # Assert
+        self.assertEqual(
+            (
+                'sayHello', 'com.example.kevin.helloandroid.Greeter',
+                'com.example.kevin.helloandroid.Greeter',
+                'com.example.kevin.helloandroid'
+            ),
+            caller
+        )
+        self.assertEqual(
+            (
+                'append', 'java.lang.StringBuilder', 'java.lang.StringBuilder',
+                'java.lang'
+            ),
+            callee
+        )
+
+    def test_parse_invalid(self):
+        # Act & Assert
+        self.assertRaises(ValueError, javacg_line_parser.parse, 'M:Greeter')
+
 
 if __name__ == '__main__':
     unittest.main()
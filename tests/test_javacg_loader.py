@@ -1,6 +1,9 @@
+import bz2
 import os
+import tempfile
 import unittest
 
+from attacksurfacemeter.loaders import javacg_loader
 from attacksurfacemeter.loaders.javacg_loader import JavaCGLoader
 
 
@@ -76,6 +79,73 @@ class JavaCGLoaderTestCase(unittest.TestCase):
         self.assertEqual(38, len(nodes))
         self.assertTrue(all_nodes_found)
 
+    def test_load_call_graph_parsed_once(self):
+        # Arrange
+        test_loader = JavaCGLoader(
+            os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                'helloworld/javacg.callgraph.txt'
+            ),
+            ['com.example.kevin.helloandroid']
+        )
+
+        # Act
+        test_graph = test_loader.load_call_graph()
+        nodes = dict((n, n) for n in test_graph.nodes())
+
+        # Assert
+        for (caller, callee) in test_graph.edges():
+            self.assertIs(nodes[caller], caller)
+            self.assertIs(nodes[callee], callee)
+        for n in test_graph.nodes():
+            self.assertEqual(n.function_signature, n.class_name)
+            self.assertTrue(n.function_signature.startswith(n.package_name))
+
+    def test_compile_prefixes(self):
+        # Act
+        pattern = javacg_loader._compile_prefixes(
+            ['com.example', 'com.example.kevin', 'android.support']
+        )
+
+        # Assert
+        self.assertTrue(pattern.match('com.example.kevin.Greeter:sayHello'))
+        self.assertTrue(pattern.match('com.examples.Greeter:sayHello'))
+        self.assertTrue(pattern.match('android.support.v7.app.Activity'))
+        self.assertTrue(pattern.match('(M)com.example.Greeter', 3))
+        self.assertFalse(pattern.match('org.com.example.Greeter:sayHello'))
+        self.assertFalse(pattern.match('android.widget.TextView:setText'))
+        self.assertFalse(pattern.match('com.exampl'))
+
+    def test_load_call_graph_compressed(self):
+        # Arrange
+        source = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            'helloworld/javacg.callgraph.txt'
+        )
+        packages = ['com.example.kevin.helloandroid']
+        expected = JavaCGLoader(source, packages).load_call_graph()
+
+        with tempfile.TemporaryDirectory() as directory:
+            compressed_source = os.path.join(directory, 'javacg.txt.bz2')
+            with open(source, 'rb') as file_:
+                with bz2.open(compressed_source, 'wb') as compressed:
+                    compressed.write(file_.read())
+
+            # Act
+            test_graph = JavaCGLoader(
+                compressed_source, packages
+            ).load_call_graph()
+
+        # Assert
+        self.assertEqual(
+            sorted(n.identity for n in expected.nodes()),
+            sorted(n.identity for n in test_graph.nodes())
+        )
+        self.assertEqual(
+            sorted((u.identity, v.identity) for (u, v) in expected.edges()),
+            sorted((u.identity, v.identity) for (u, v) in test_graph.edges())
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
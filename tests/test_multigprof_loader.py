@@ -1,5 +1,8 @@
 import unittest
 import os
+import gzip
+import pickle
+import tempfile
 
 import networkx as nx
 
@@ -240,5 +243,183 @@ class MultigprofLoaderTestCase(unittest.TestCase):
         # Assert
         self.assertEqual(expected, actual)
 
+    def test_edge_attr_frequency(self):
+        # Arrange
+        sources = [
+            'multigprof/multigprof.one.callgraph.txt',
+            'multigprof/multigprof.two.callgraph.txt',
+            'multigprof/multigprof.one.callgraph.txt'
+        ]
+        sources = [
+            os.path.join(os.path.dirname(os.path.realpath(__file__)), source)
+            for source in sources
+        ]
+        self.test_loader = MultigprofLoader(sources, False)
+        expected = {
+            (
+                Call('main', 'multigprof.c', Env.C),
+                Call('factorial', 'multigprof.c', Env.C)
+            ): 2,
+            (
+                Call('factorial', 'multigprof.c', Env.C),
+                Call('main', 'multigprof.c', Env.C)
+            ): 2,
+            (
+                Call('factorial', 'multigprof.c', Env.C),
+                Call('factorial', 'multigprof.c', Env.C)
+            ): 2,
+            (
+                Call('main', 'multigprof.c', Env.C),
+                Call('fibonacci', 'multigprof.c', Env.C)
+            ): 1,
+            (
+                Call('fibonacci', 'multigprof.c', Env.C),
+                Call('main', 'multigprof.c', Env.C)
+            ): 1
+        }
+
+        # Act
+        test_graph = self.test_loader.load_call_graph()
+        actual = nx.get_edge_attributes(test_graph, 'frequency')
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_load_call_graph_processes(self):
+        # Arrange
+        sources = self.test_loader.sources * 3
+        expected = MultigprofLoader(sources, False).load_call_graph()
+
+        # Act
+        test_loader = MultigprofLoader(sources, False, processes=2)
+        actual = test_loader.load_call_graph()
+
+        # Assert
+        self.assertEqual(0, len(test_loader.errors))
+        self.assertEqual(
+            sorted(expected.nodes(data=True), key=str),
+            sorted(actual.nodes(data=True), key=str)
+        )
+        self.assertEqual(
+            sorted(expected.edges(data=True), key=str),
+            sorted(actual.edges(data=True), key=str)
+        )
+
+    def test_load_call_graph_cache(self):
+        # Arrange
+        expected = self.test_loader.load_call_graph()
+
+        with tempfile.TemporaryDirectory() as cache:
+            MultigprofLoader(
+                self.test_loader.sources, False, cache=cache
+            ).load_call_graph()
+            cached = sorted(os.listdir(cache))
+
+            # Act
+            test_loader = MultigprofLoader(
+                self.test_loader.sources, False, cache=cache
+            )
+            actual = test_loader.load_call_graph()
+
+            # Assert
+            self.assertEqual(2, len(cached))
+            self.assertEqual(cached, sorted(os.listdir(cache)))
+            self.assertEqual(0, len(test_loader.errors))
+            self.assertEqual(
+                sorted(expected.nodes(data=True), key=str),
+                sorted(actual.nodes(data=True), key=str)
+            )
+            self.assertEqual(
+                sorted(expected.edges(data=True), key=str),
+                sorted(actual.edges(data=True), key=str)
+            )
+
+    def test_load_call_graph_cache_invalid(self):
+        # Arrange
+        expected = self.test_loader.load_call_graph()
+        invalid = [
+            b'invalid', pickle.dumps(None), pickle.dumps((1, 2, 3)),
+            pickle.dumps(({'main': 'main'}, dict(), list())),
+            pickle.dumps((dict(), {('a', 'b'): [0, 1]}, list())),
+        ]
+
+        with tempfile.TemporaryDirectory() as cache:
+            MultigprofLoader(
+                self.test_loader.sources, False, cache=cache
+            ).load_call_graph()
+            cached = sorted(os.listdir(cache))
+
+            for content in invalid:
+                for name in cached:
+                    with open(os.path.join(cache, name), 'wb') as file_:
+                        file_.write(content)
+
+                # Act
+                actual = MultigprofLoader(
+                    self.test_loader.sources, False, cache=cache
+                ).load_call_graph()
+
+                # Assert
+                self.assertEqual(
+                    sorted(expected.nodes(data=True), key=str),
+                    sorted(actual.nodes(data=True), key=str)
+                )
+                self.assertEqual(
+                    sorted(expected.edges(data=True), key=str),
+                    sorted(actual.edges(data=True), key=str)
+                )
+
+    def test_load_call_graph_cache_granularity(self):
+        # Arrange
+        expected = self.test_loader.load_call_graph(granularity=Gran.FILE)
+
+        with tempfile.TemporaryDirectory() as cache:
+            MultigprofLoader(
+                self.test_loader.sources, False, cache=cache
+            ).load_call_graph()
+
+            # Act
+            actual = MultigprofLoader(
+                self.test_loader.sources, False, cache=cache
+            ).load_call_graph(granularity=Gran.FILE)
+
+            # Assert
+            self.assertEqual(4, len(os.listdir(cache)))
+            self.assertEqual(
+                sorted(expected.nodes(data=True), key=str),
+                sorted(actual.nodes(data=True), key=str)
+            )
+
+    def test_load_call_graph_compressed(self):
+        # Arrange
+        expected = self.test_loader.load_call_graph()
+
+        with tempfile.TemporaryDirectory() as directory:
+            sources = list(self.test_loader.sources)
+            sources[0] = os.path.join(directory, 'one.callgraph.txt.gz')
+            with open(self.test_loader.sources[0], 'rb') as file_:
+                with gzip.open(sources[0], 'wb') as compressed:
+                    compressed.write(file_.read())
+
+            # Act
+            test_graph = MultigprofLoader(sources, False).load_call_graph()
+
+        # Assert
+        self.assertEqual(
+            sorted((n.identity, a) for (n, a) in expected.nodes(data=True)),
+            sorted((n.identity, a) for (n, a) in test_graph.nodes(data=True))
+        )
+        self.assertEqual(
+            sorted(
+                (u.identity, v.identity, a)
+                for (u, v, a) in expected.edges(data=True)
+            ),
+            sorted(
+                (u.identity, v.identity, a)
+                for (u, v, a) in test_graph.edges(data=True)
+            )
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
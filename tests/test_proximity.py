@@ -0,0 +1,157 @@
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from attacksurfacemeter.csr_graph import CsrGraph
+from attacksurfacemeter.proximity import Proximity, get_mean_lengths
+
+
+class ProximityTestCase(unittest.TestCase):
+    def setUp(self):
+        #   a -> b -> c -> d
+        #        ^         |
+        #        +---------+
+        #   e -> c    f
+        self.graph = nx.DiGraph()
+        self.graph.add_nodes_from(['a', 'b', 'c', 'd', 'e', 'f'])
+        self.graph.add_edges_from([
+            ('a', 'b'), ('b', 'c'), ('c', 'd'), ('d', 'b'), ('e', 'c')
+        ])
+        self.csr_graph = CsrGraph.from_graph(self.graph)
+
+    def test_from_csr_graph(self):
+        # Arrange
+        targets = ['c', 'd']
+
+        # Act
+        actual = Proximity.from_csr_graph(self.csr_graph, targets)
+
+        # Assert
+        for target in targets:
+            for node in self.graph.nodes():
+                expected = None
+                if nx.has_path(self.graph, node, target):
+                    expected = nx.shortest_path_length(
+                        self.graph, node, target
+                    )
+                i = actual.nodes.index(node)
+                (start, end) = (actual.indptr[i], actual.indptr[i + 1])
+                lengths = dict(zip(
+                    actual.columns[start:end].tolist(),
+                    actual.lengths[start:end].tolist()
+                ))
+                self.assertEqual(
+                    expected, lengths.get(actual.targets.index(target)),
+                    msg=(node, target)
+                )
+        self.assertEqual(np.uint16, actual.lengths.dtype)
+        self.assertEqual(np.uint16, actual.columns.dtype)
+
+    def test_from_csr_graph_reached_only(self):
+        # Act
+        actual = Proximity.from_csr_graph(self.csr_graph, ['a', 'f'])
+
+        # Assert
+        self.assertEqual(2, len(actual.lengths))
+        self.assertEqual(len(self.graph) + 1, len(actual.indptr))
+
+    def test_get_lengths(self):
+        # Arrange
+        expected = {'c': 2, 'd': 3}
+        target = Proximity.from_csr_graph(self.csr_graph, ['c', 'd'])
+
+        # Act
+        actual = target.get_lengths('a')
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_get_lengths_for_target(self):
+        # Arrange
+        target = Proximity.from_csr_graph(self.csr_graph, ['c', 'd'])
+
+        # Act
+        actual = target.get_lengths('c')
+
+        # Assert
+        self.assertEqual(dict(), actual)
+
+    def test_get_lengths_unreachable(self):
+        # Arrange
+        target = Proximity.from_csr_graph(self.csr_graph, ['c', 'd'])
+
+        # Act
+        actual = target.get_lengths('f')
+
+        # Assert
+        self.assertIsNone(actual)
+
+    def test_get_lengths_wo_targets(self):
+        # Arrange
+        target = Proximity.from_csr_graph(self.csr_graph, [])
+
+        # Act
+        actual = target.get_lengths('a')
+
+        # Assert
+        self.assertIsNone(actual)
+
+
+    def test_select(self):
+        # Arrange
+        expected = {'a': {'d': 3}, 'c': {'d': 1}, 'd': dict(), 'f': None}
+        proximity = Proximity.from_csr_graph(self.csr_graph, ['c', 'd'])
+
+        # Act
+        target = proximity.select(['d'])
+        actual = {n: target.get_lengths(n) for n in expected}
+
+        # Assert
+        self.assertEqual(['d'], target.targets)
+        self.assertEqual(expected, actual)
+
+    def test_get_means(self):
+        # Arrange
+        expected = {
+            'a': 2.5, 'b': 1.5, 'c': None, 'd': None, 'e': 1.5, 'f': None
+        }
+        target = Proximity.from_csr_graph(self.csr_graph, ['c', 'd'])
+
+        # Act
+        means = target.get_means()
+        actual = {
+            n: None if np.isnan(means[i]) else means[i]
+            for (n, i) in self.csr_graph.index.items()
+        }
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_get_mean(self):
+        # Arrange
+        expected = {('c', 'd'): 11 / 6, ('d',): 2.0, ('a',): None, (): None}
+
+        for (targets, mean) in expected.items():
+            # Act
+            actual = Proximity.from_csr_graph(
+                self.csr_graph, list(targets)
+            ).get_mean()
+
+            # Assert
+            self.assertEqual(mean, actual, msg=targets)
+
+    def test_get_mean_lengths(self):
+        # Arrange
+        targets = {'cd': ['c', 'd'], 'd': ['d'], 'a': ['a'], 'none': []}
+
+        # Act
+        actual = get_mean_lengths(self.csr_graph, targets)
+
+        # Assert
+        self.assertEqual(
+            {'cd': 11 / 6, 'd': 2.0, 'a': None, 'none': None}, actual
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+import networkx as nx
+
+from attacksurfacemeter.csr_graph import CsrGraph
+from attacksurfacemeter.reachability import Reachability
+
+
+class ReachabilityTestCase(unittest.TestCase):
+    def setUp(self):
+        #   a <-> b -> c <-> d -> e    f -> f    g
+        self.graph = nx.DiGraph()
+        self.graph.add_nodes_from(['a', 'b', 'c', 'd', 'e', 'f', 'g'])
+        self.graph.add_edges_from([
+            ('a', 'b'), ('b', 'a'), ('b', 'c'), ('c', 'd'), ('d', 'c'),
+            ('d', 'e'), ('f', 'f')
+        ])
+        self.target = Reachability(CsrGraph.from_graph(self.graph))
+
+    def test_components(self):
+        # Arrange
+        index = self.target.csr_graph.index
+
+        # Act
+        actual = self.target.components
+
+        # Assert
+        self.assertEqual(5, len(set(actual)))
+        self.assertEqual(actual[index['a']], actual[index['b']])
+        self.assertEqual(actual[index['c']], actual[index['d']])
+        # Components are numbered in reverse topological order
+        self.assertLess(actual[index['e']], actual[index['c']])
+        self.assertLess(actual[index['c']], actual[index['a']])
+
+    def test_get_descendants(self):
+        for node in self.graph.nodes():
+            # Arrange
+            expected = nx.descendants(self.graph, node)
+
+            # Act
+            actual = self.target.get_descendants(node)
+
+            # Assert
+            self.assertCountEqual(expected, actual, msg=node)
+
+    def test_get_ancestors(self):
+        for node in self.graph.nodes():
+            # Arrange
+            expected = nx.ancestors(self.graph, node)
+
+            # Act
+            actual = self.target.get_ancestors(node)
+
+            # Assert
+            self.assertCountEqual(expected, actual, msg=node)
+
+    def test_count_descendants(self):
+        # Arrange
+        expected = {'a': 4, 'b': 4, 'c': 2, 'd': 2, 'e': 0, 'f': 0, 'g': 0}
+
+        # Act
+        actual = {n: self.target.count_descendants(n) for n in expected}
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_count_ancestors(self):
+        # Arrange
+        expected = {'a': 1, 'b': 1, 'c': 3, 'd': 3, 'e': 4, 'f': 0, 'g': 0}
+
+        # Act
+        actual = {n: self.target.count_ancestors(n) for n in expected}
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_get_descendants_not_in_graph(self):
+        # Assert
+        self.assertRaises(
+            nx.NetworkXError, self.target.get_descendants, 'h'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import glob
+import os
+import unittest
+
+from attacksurfacemeter.formatters import renderer
+from attacksurfacemeter.formatters.renderer import Template
+
+try:
+    import django
+except ImportError:
+    django = None
+
+
+class TemplateTestCase(unittest.TestCase):
+    def test_render_variable(self):
+        # Arrange
+        expected = '&lt;a&gt; &amp; &quot;b&quot; &#39;c&#39; 1.5 None '
+        target = Template(
+            '{{ a }} {{ b.c }} {{ b.d }} {{ e }} {{ f }} {{ g.h }}'
+        )
+
+        # Act
+        actual = target.render({
+            'a': '<a> &', 'b': {'c': '"b"', 'd': "'c'"}, 'e': 1.5,
+            'f': None
+        })
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_render_stringformat(self):
+        # Arrange
+        expected = '|a   |   b|    |&lt;  |'
+        target = Template(
+            '|{{ a|stringformat:"-4s" }}|{{ b|stringformat:"4s" }}|'
+            '{{ c|stringformat:"-4s" }}|{{ d|stringformat:"-3s" }}|'
+        )
+
+        # Act
+        actual = target.render({'a': 'a', 'b': 'b', 'd': '<'})
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_render_if(self):
+        # Arrange
+        target = Template(
+            '{% if a > 0 and not b %}1{% elif c == "x" or d in e %}2'
+            '{% else %}3{% endif %}'
+        )
+        expected = [
+            ({'a': 1}, '1'),
+            ({'a': 1, 'b': True}, '3'),
+            ({'c': 'x'}, '2'),
+            ({'a': 'x', 'd': 1, 'e': [1]}, '2'),
+            ({}, '3'),
+        ]
+
+        for (context, output) in expected:
+            # Act
+            actual = target.render(context)
+
+            # Assert
+            self.assertEqual(output, actual, msg=context)
+
+    def test_render_for(self):
+        # Arrange
+        expected = '[a.b.]{# #}[x]'
+        target = Template(
+            '[{% for i in a %}{{ i.name }}.{% endfor %}]{# comment #}'
+            '{{ "{# #}" }}[{% for i in b %}{{ i }}{% empty %}x{% endfor %}]'
+        )
+
+        # Act
+        actual = target.render({'a': [{'name': 'a'}, {'name': 'b'}]})
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_stream(self):
+        # Arrange
+        expected = ['<', '0;', '1;', '2;', '>']
+        target = Template('<{% for i in items %}{{ i }};{% endfor %}>')
+
+        # Act
+        actual = list(target.stream({'items': (i for i in range(3))}))
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_unsupported(self):
+        for source in [
+                '{% load static %}', '{{ a|upper }}', '{% if a %}',
+                '{% for i in a %}{{ forloop.counter }}{% endfor %}',
+                '{% endif %}'
+        ]:
+            # Assert
+            self.assertRaises(
+                renderer.TemplateSyntaxError, Template, source
+            )
+
+    def test_get_template(self):
+        # Arrange
+        path = os.path.join(
+            os.path.dirname(os.path.realpath(renderer.__file__)),
+            'template.txt'
+        )
+
+        # Act
+        expected = renderer.get_template(path)
+        actual = renderer.get_template(path)
+
+        # Assert
+        self.assertIsInstance(actual, Template)
+        self.assertIs(expected, actual)
+
+    @unittest.skipIf(django is None, 'Django is not installed.')
+    def test_render_as_django(self):
+        # Arrange
+        from django.conf import settings
+        from django.template import Context, Template as DjangoTemplate
+
+        if not settings.configured:
+            settings.configure()
+
+        context = {
+            'directory': '/tmp/<src>',
+            'nodes_count': 2,
+            'nodes': [
+                {'function_name': 'main', 'function_signature': 'a.c'},
+                {'function_name': 'f&g', 'function_signature': ''}
+            ],
+            'edges_count': 1,
+            'edges': [{'from': 'main', 'to': 'f&g'}],
+            'entry_points_count': 0,
+            'entry_points': [],
+            'exit_points_count': 1,
+            'exit_points': [
+                {'function_name': 'f&g', 'function_signature': ''}
+            ],
+            'dangerous_functions_count': 0,
+            'dangerous_functions': [],
+            'distance_dangerous': 0,
+            'distance_entry': 1.9333333333333333,
+            'distance_exit': 2.0,
+        }
+        templates = glob.glob(
+            os.path.join(
+                os.path.dirname(os.path.realpath(renderer.__file__)),
+                '*template.*'
+            )
+        )
+
+        for path in templates:
+            with open(path) as file_:
+                source = file_.read()
+
+            # Act
+            expected = DjangoTemplate(source).render(Context(context))
+            actual = Template(source).render(context)
+
+            # Assert
+            self.assertEqual(expected, actual, msg=path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from attacksurfacemeter.csr_graph import CsrGraph
+from attacksurfacemeter.risky_walk import RiskyWalk
+
+
+class RiskyWalkTestCase(unittest.TestCase):
+    def setUp(self):
+        #   a <-> b <-> c -> d    e <-> a
+        self.graph = nx.DiGraph()
+        self.graph.add_edges_from([
+            ('a', 'b', {'weight': 100}), ('b', 'a', {'weight': 25}),
+            ('b', 'c', {'weight': 75}), ('c', 'b', {'weight': 25}),
+            ('c', 'd', {'weight': 50}), ('e', 'a'), ('a', 'e')
+        ])
+        self.target = RiskyWalk(CsrGraph.from_graph(self.graph))
+
+    def test_get_personalization(self):
+        # Arrange
+        expected = {'a': 10, 'b': 15, 'c': 1, 'd': 5, 'e': 1}
+
+        # Act
+        personalization = self.target.get_personalization(
+            ['a', 'b'], ['b', 'd'], entry=10, exit=5, other=1
+        )
+        actual = {
+            n: personalization[i]
+            for (n, i) in self.target.csr_graph.index.items()
+        }
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_get_page_rank(self):
+        # Arrange
+        personalization = {'a': 10, 'b': 15, 'c': 1, 'd': 5, 'e': 1}
+        expected = nx.pagerank(
+            self.graph, alpha=0.85, personalization=personalization
+        )
+
+        # Act
+        page_rank = self.target.get_page_rank(
+            self.target.get_personalization(
+                ['a', 'b'], ['b', 'd'], entry=10, exit=5, other=1
+            )
+        )
+        actual = {
+            n: page_rank[i] for (n, i) in self.target.csr_graph.index.items()
+        }
+
+        # Assert
+        self.assertEqual(len(expected), len(actual))
+        for i in expected:
+            self.assertAlmostEqual(expected[i], actual[i])
+
+    def test_get_page_rank_w_nstart(self):
+        # Arrange
+        personalization = self.target.get_personalization(['a'], ['d'])
+        expected = self.target.get_page_rank(personalization, tol=1.0e-12)
+
+        # Act
+        actual = self.target.get_page_rank(
+            personalization, tol=1.0e-12, max_iter=1, nstart=expected
+        )
+
+        # Assert
+        for (e, a) in zip(expected, actual):
+            self.assertAlmostEqual(e, a)
+
+    def test_get_page_ranks(self):
+        # Arrange
+        personalizations = [
+            self.target.get_personalization(['a'], ['d'], 10, 5, 1),
+            self.target.get_personalization(['a', 'c'], ['b'], 1, 1, 10),
+            self.target.get_personalization(['e'], ['d'], 100, 1, 1)
+        ]
+        dampings = [0.85, 0.5, 0.95]
+        expected = [
+            self.target.get_page_rank(p, d)
+            for (p, d) in zip(personalizations, dampings)
+        ]
+
+        # Act
+        actual = self.target.get_page_ranks(
+            np.column_stack(personalizations), dampings
+        )
+
+        # Assert
+        self.assertEqual((5, 3), actual.shape)
+        for (i, page_rank) in enumerate(expected):
+            self.assertTrue(np.array_equal(page_rank, actual[:, i]))
+
+    def test_get_sweep(self):
+        # Arrange
+        parameters = [
+            (damping, entry, 10, other)
+            for damping in [0.5, 0.85]
+            for entry in [1, 100, 10000]
+            for other in [1, 1000]
+        ]
+        expected = [
+            self.target.get_page_rank(
+                self.target.get_personalization(
+                    ['a', 'b'], ['b', 'd'], entry, exit, other
+                ),
+                damping, tol=1.0e-12, max_iter=1000
+            )
+            for (damping, entry, exit, other) in parameters
+        ]
+
+        # Act
+        actual = self.target.get_sweep(
+            ['a', 'b'], ['b', 'd'], parameters, tol=1.0e-12, max_iter=1000
+        )
+
+        # Assert
+        self.assertEqual((5, len(parameters)), actual.shape)
+        for (i, page_rank) in enumerate(expected):
+            for (e, a) in zip(page_rank, actual[:, i]):
+                self.assertAlmostEqual(e, a)
+
+    def test_get_sweep_dampings(self):
+        # Arrange
+        parameters = [
+            (damping, 10000, 10000, 1)
+            for damping in [0.95, 0.5, 0.7, 0.6, 0.85, 0.9, 0.8]
+        ] + [(0.6, 1, 100, 10), (0.6, 100, 1, 10)]
+        expected = [
+            self.target.get_page_rank(
+                self.target.get_personalization(
+                    ['a', 'b'], ['b', 'd'], entry, exit, other
+                ),
+                damping, tol=1.0e-12, max_iter=1000
+            )
+            for (damping, entry, exit, other) in parameters
+        ]
+
+        # Act
+        actual = self.target.get_sweep(
+            ['a', 'b'], ['b', 'd'], parameters, tol=1.0e-12, max_iter=1000
+        )
+
+        # Assert
+        self.assertEqual((5, len(parameters)), actual.shape)
+        for (i, page_rank) in enumerate(expected):
+            for (e, a) in zip(page_rank, actual[:, i]):
+                self.assertAlmostEqual(e, a)
+
+    def test_get_page_rank_wo_convergence(self):
+        # Arrange
+        personalization = self.target.get_personalization(['a'], ['d'])
+
+        # Assert
+        self.assertRaises(
+            nx.NetworkXError,
+            self.target.get_page_rank,
+            personalization,
+            max_iter=1
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
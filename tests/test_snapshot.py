@@ -0,0 +1,309 @@
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from attacksurfacemeter.call import Call
+from attacksurfacemeter.call_graph import CallGraph
+from attacksurfacemeter.environments import Environments as Env
+from attacksurfacemeter.granularity import Granularity as Gran
+from attacksurfacemeter.loaders.cflow_loader import CflowLoader
+from attacksurfacemeter.loaders.gprof_loader import GprofLoader
+from attacksurfacemeter.loaders.javacg_loader import JavaCGLoader
+from attacksurfacemeter.snapshot import HEADER, Snapshot, SnapshotError
+from attacksurfacemeter.versioned_graph import VersionedDiGraph
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'call_graph.snapshot')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _get_path(self, name):
+        return os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), 'helloworld', name
+        )
+
+    def _assert_equal(self, expected, actual):
+        self.assertEqual(expected.source, actual.source)
+        self.assertEqual(expected.load_errors, actual.load_errors)
+        self.assertEqual(expected.granularity, actual.granularity)
+        self.assertEqual(expected.num_fragments, actual.num_fragments)
+        self.assertEqual(expected.monolithicity, actual.monolithicity)
+        self.assertEqual(
+            sorted(expected.nodes, key=_get_node_key),
+            sorted(actual.nodes, key=_get_node_key)
+        )
+        self.assertEqual(
+            sorted(expected.edges, key=_get_edge_key),
+            sorted(actual.edges, key=_get_edge_key)
+        )
+
+    def test_save(self):
+        # Arrange
+        expected = CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        )
+
+        # Act
+        expected.save(self.path)
+        actual = CallGraph.from_snapshot(self.path)
+
+        # Assert
+        self._assert_equal(expected, actual)
+
+    def test_save_file_granularity(self):
+        # Arrange
+        expected = CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.r.txt'), True),
+            granularity=Gran.FILE
+        )
+
+        # Act
+        expected.save(self.path)
+        actual = CallGraph.from_snapshot(self.path)
+
+        # Assert
+        self._assert_equal(expected, actual)
+        for (node, _) in actual.nodes:
+            self.assertEqual(Gran.FILE, node.granularity)
+
+    def test_save_fragmentized(self):
+        # Arrange
+        expected = CallGraph.from_loader(
+            GprofLoader(self._get_path('gprof.callgraph.txt')),
+            fragmentize=True
+        )
+
+        # Act
+        expected.save(self.path)
+        actual = CallGraph.from_snapshot(self.path)
+
+        # Assert
+        self._assert_equal(expected, actual)
+
+    def test_save_javacg(self):
+        # Arrange
+        expected = CallGraph.from_loader(
+            JavaCGLoader(
+                self._get_path('javacg.callgraph.txt'),
+                ['com.example.kevin.helloandroid']
+            )
+        )
+
+        # Act
+        expected.save(self.path)
+        actual = CallGraph.from_snapshot(self.path)
+        nodes = dict((n, n) for (n, _) in expected.nodes)
+
+        # Assert
+        self._assert_equal(expected, actual)
+        for (node, _) in actual.nodes:
+            self.assertEqual(Env.ANDROID, node.environment)
+            self.assertEqual(nodes[node].class_name, node.class_name)
+            self.assertEqual(nodes[node].package_name, node.package_name)
+
+    def test_save_values(self):
+        # Arrange
+        expected = CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        )
+        expected.assign_weights()
+        expected.assign_page_rank()
+
+        # Act
+        expected.save(self.path)
+        actual = CallGraph.from_snapshot(self.path)
+
+        # Assert
+        self._assert_equal(expected, actual)
+        for (_, _, attrs) in actual.edges:
+            self.assertIsInstance(attrs['weight'], int)
+        for (_, attrs) in actual.nodes:
+            self.assertIsInstance(attrs['page_rank'], float)
+
+    def test_save_none_strings(self):
+        # Arrange
+        (caller, callee) = (
+            Call('main', './src/helloworld.c', Env.C), Call('puts', None, Env.C)
+        )
+        graph = VersionedDiGraph()
+        graph.add_edge(caller, callee, call=None)
+        expected = CallGraph('helloworld', graph)
+
+        # Act
+        expected.save(self.path)
+        actual = CallGraph.from_snapshot(self.path)
+        nodes = dict((n, n) for (n, _) in actual.nodes)
+
+        # Assert
+        self._assert_equal(expected, actual)
+        self.assertIsNone(nodes[callee].function_signature)
+        self.assertEqual(
+            './src/helloworld.c', nodes[caller].function_signature
+        )
+
+    def test_from_snapshot_csr_graph(self):
+        # Arrange
+        call_graph = CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        )
+        call_graph.assign_weights()
+        expected = call_graph.csr_graph
+        call_graph.save(self.path)
+
+        # Act
+        actual = CallGraph.from_snapshot(self.path).csr_graph
+
+        # Assert
+        self.assertFalse(actual.indices.flags.writeable)
+        self.assertEqual(len(expected), len(actual))
+        self.assertEqual(
+            sorted(
+                (expected.nodes[i].identity, expected.nodes[j].identity,
+                 flag, weight)
+                for (i, j, flag, weight) in zip(
+                    expected.sources.tolist(), expected.indices.tolist(),
+                    expected.flags.tolist(), expected.weights.tolist()
+                )
+            ),
+            sorted(
+                (actual.nodes[i].identity, actual.nodes[j].identity,
+                 flag, weight)
+                for (i, j, flag, weight) in zip(
+                    actual.sources.tolist(), actual.indices.tolist(),
+                    actual.flags.tolist(), actual.weights.tolist()
+                )
+            )
+        )
+
+    def test_from_snapshot_lazy(self):
+        # Arrange
+        expected = CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        )
+        expected.save(self.path)
+
+        # Act
+        with mock.patch.object(
+                Snapshot, 'get_graph', side_effect=AssertionError):
+            actual = CallGraph.from_snapshot(self.path)
+            is_decoded = [
+                node is not None for node in actual.csr_graph.nodes._nodes
+            ]
+            entry_points = actual.entry_points
+            means = actual.get_mean_lengths(['entry', 'exit', 'dangerous'])
+            page_rank = actual.get_page_rank()
+
+        # Assert
+        self.assertNotIn(True, is_decoded)
+        self.assertCountEqual(expected.entry_points, entry_points)
+        self.assertEqual(
+            expected.get_mean_lengths(['entry', 'exit', 'dangerous']), means
+        )
+        self.assertEqual(expected.get_page_rank(), page_rank)
+        self._assert_equal(expected, actual)
+
+    def test_from_snapshot_modified(self):
+        # Arrange
+        CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        ).save(self.path)
+        call_graph = CallGraph.from_snapshot(self.path)
+        call = Call('main', './src/helloworld.c', Env.C)
+
+        # Act
+        call_graph.call_graph.remove_node(call)
+
+        # Assert
+        self.assertNotIn(call, call_graph.csr_graph.index)
+
+    def test_from_snapshot_invalid(self):
+        # Arrange
+        with open(self.path, 'wb') as file_:
+            file_.write(b'main() <int main (void) at ./src/helloworld.c:58>:')
+
+        # Act & Assert
+        self.assertRaises(SnapshotError, CallGraph.from_snapshot, self.path)
+
+    def test_from_snapshot_empty(self):
+        # Arrange
+        open(self.path, 'wb').close()
+
+        # Act & Assert
+        self.assertRaises(SnapshotError, CallGraph.from_snapshot, self.path)
+
+    def test_from_snapshot_truncated(self):
+        # Arrange
+        CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        ).save(self.path)
+        with open(self.path, 'rb') as file_:
+            content = file_.read()
+
+        for size in (HEADER.size - 1, HEADER.size, len(content) // 2):
+            with open(self.path, 'wb') as file_:
+                file_.write(content[:size])
+
+            # Act & Assert
+            self.assertRaises(
+                SnapshotError, CallGraph.from_snapshot, self.path
+            )
+
+    def test_close(self):
+        # Arrange
+        CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        ).save(self.path)
+
+        # Act
+        with Snapshot(self.path) as snapshot:
+            expected = snapshot['indptr'].tolist()
+
+        # Assert
+        self.assertNotEqual([], expected)
+        self.assertRaises(ValueError, snapshot.__getitem__, 'indptr')
+
+    def test_save_mode(self):
+        # Arrange
+        call_graph = CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        )
+        umask = os.umask(0o022)
+
+        # Act
+        try:
+            call_graph.save(self.path)
+        finally:
+            os.umask(umask)
+
+        # Assert
+        self.assertEqual(0o644, stat.S_IMODE(os.stat(self.path).st_mode))
+
+    def test_save_unsupported_value(self):
+        # Arrange
+        call_graph = CallGraph.from_loader(
+            CflowLoader(self._get_path('cflow.callgraph.txt'))
+        )
+        (node, attrs) = call_graph.nodes[0]
+        call_graph.call_graph.node[node]['label'] = 'main'
+
+        # Act & Assert
+        self.assertRaises(ValueError, call_graph.save, self.path)
+        self.assertEqual([], os.listdir(self.directory.name))
+
+
+def _get_node_key(node):
+    return node[0].identity
+
+
+def _get_edge_key(edge):
+    return (edge[0].identity, edge[1].identity)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -465,5 +465,31 @@ class UtilitiesTestCase(unittest.TestCase):
         # Callee Attributes
         self.assertIsNone(callee_attrs)
 
+    def test_node_attribute_resolver(self):
+        # Arrange
+        caller = Call('main', 'main.c', Environments.C)
+        callee = Call('greet', 'main.c', Environments.C)
+        resolver = utilities.NodeAttributeResolver(
+            'gprof', [caller], [callee]
+        )
+
+        # Act
+        (caller_attrs, callee_attrs) = resolver.get_node_attrs(caller, callee)
+        repeated = resolver.get_node_attrs(
+            Call('main', 'main.c', Environments.C), callee
+        )
+
+        # Assert
+        self.assertEqual(
+            utilities.get_node_attrs(
+                'gprof', caller, callee, [caller], [callee]
+            ),
+            (caller_attrs, callee_attrs)
+        )
+        self.assertIsNone(repeated)
+        self.assertIsNotNone(resolver.get_node_attrs(caller, None))
+        self.assertIsNotNone(resolver.get_node_attrs(callee, caller))
+
+
 if __name__ == '__main__':
     unittest.main()
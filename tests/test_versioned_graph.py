@@ -0,0 +1,68 @@
+import unittest
+
+import networkx as nx
+
+from attacksurfacemeter.versioned_graph import VersionedDiGraph
+
+
+class VersionedDiGraphTestCase(unittest.TestCase):
+    def setUp(self):
+        self.target = VersionedDiGraph()
+        self.target.add_edges_from([('a', 'b'), ('b', 'c')])
+
+    def test_init(self):
+        # Arrange
+        graph = nx.DiGraph()
+        graph.add_node('a', entry=None)
+        graph.add_edge('a', 'b', call=None)
+
+        # Act
+        target = VersionedDiGraph(graph)
+
+        # Assert
+        self.assertCountEqual(graph.nodes(data=True), target.nodes(data=True))
+        self.assertCountEqual(graph.edges(data=True), target.edges(data=True))
+
+    def test_version(self):
+        # Arrange
+        modifications = [
+            lambda: self.target.add_node('d'),
+            lambda: self.target.add_nodes_from(['e', 'f']),
+            lambda: self.target.remove_node('f'),
+            lambda: self.target.remove_nodes_from(['e']),
+            lambda: self.target.add_edge('c', 'd'),
+            lambda: self.target.add_edges_from([('d', 'a')]),
+            lambda: self.target.add_path(['a', 'c', 'a']),
+            lambda: self.target.remove_edge('c', 'a'),
+            lambda: self.target.remove_edges_from([('a', 'c')]),
+            lambda: self.target.touch(),
+            lambda: self.target.clear()
+        ]
+
+        for modification in modifications:
+            # Arrange
+            expected = self.target.version
+
+            # Act
+            modification()
+            actual = self.target.version
+
+            # Assert
+            self.assertLess(expected, actual)
+
+    def test_version_wo_modification(self):
+        # Arrange
+        expected = self.target.version
+
+        # Act
+        self.target.nodes(data=True)
+        self.target.edges(data=True)
+        self.target.subgraph(['a', 'b'])
+        actual = self.target.version
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()